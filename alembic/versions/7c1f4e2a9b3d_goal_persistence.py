@@ -0,0 +1,41 @@
+"""Goal persistence: paused status and lookup indexes
+
+Revision ID: 7c1f4e2a9b3d
+Revises: 290b5c867172
+Create Date: 2026-10-17 09:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7c1f4e2a9b3d'
+down_revision: Union[str, Sequence[str], None] = '290b5c867172'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # The goal engine can pause goals; the enum needs the matching value
+    if op.get_bind().dialect.name == 'postgresql':
+        with op.get_context().autocommit_block():
+            op.execute("ALTER TYPE goalstatus ADD VALUE IF NOT EXISTS 'PAUSED'")
+
+    # Warm starts and partial loads filter by status and parent
+    op.create_index(op.f('ix_goals_status'), 'goals', ['status'], unique=False)
+    op.create_index(op.f('ix_goals_parent_id'), 'goals', ['parent_id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index(op.f('ix_goals_parent_id'), table_name='goals')
+    op.drop_index(op.f('ix_goals_status'), table_name='goals')
+
+    # PostgreSQL cannot drop enum values; map paused goals back to blocked
+    op.execute(
+        sa.text("UPDATE goals SET status = 'BLOCKED' WHERE status = 'PAUSED'")
+    )
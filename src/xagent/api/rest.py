@@ -1,18 +1,20 @@
 """REST API for X-Agent."""
 
+import asyncio
 import uuid
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
 from datetime import timedelta
 from typing import Any
 
-from fastapi import Depends, FastAPI, HTTPException, Query, Request, Response
+from fastapi import Depends, FastAPI, Header, HTTPException, Query, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel, Field
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
 
 from xagent.config import settings
 from xagent.core.agent import XAgent
-from xagent.core.goal_engine import GoalMode
+from xagent.core.goal_engine import GOAL_SORT_FIELDS, GoalMode, GoalStatus
 from xagent.health import HealthCheck
 from xagent.monitoring.metrics import get_metrics_collector
 from xagent.monitoring.tracing import instrument_fastapi, setup_tracing
@@ -31,6 +33,15 @@ from xagent.utils.logging import configure_logging, get_logger
 
 logger = get_logger(__name__)
 
+# Upper bound on goals accepted by one bulk creation request
+MAX_BULK_GOALS = 10_000
+
+# Idle seconds after which the goal change stream sends a keep-alive comment
+GOAL_FEED_HEARTBEAT_SECONDS = 15.0
+
+# Goals streamed from a hierarchy before handing control back to the event loop
+GOAL_HIERARCHY_YIELD_EVERY = 100
+
 # Configure logging
 configure_logging()
 
@@ -179,6 +190,72 @@ class GoalCreate(BaseModel):
     }
 
 
+class GoalBulkItem(BaseModel):
+    """One goal of a bulk creation request.
+
+    Items are validated one by one by the endpoint, so one bad item does not
+    reject the whole batch.
+    """
+
+    description: str = Field(..., description="Description of the goal to be achieved")
+    mode: str = Field(default="goal_oriented", description="'goal_oriented' or 'continuous'")
+    priority: int = Field(
+        default=5, ge=1, le=10, description="Priority level (1=lowest, 10=highest)"
+    )
+    completion_criteria: list[str] = Field(
+        default_factory=list, description="Criteria that must be met for goal completion"
+    )
+    ref: str | None = Field(
+        None, description="Client-side reference other items can use as parent_ref"
+    )
+    parent_ref: str | None = Field(
+        None, description="ref of an earlier item in the same request to nest under"
+    )
+    parent_id: str | None = Field(None, description="ID of an existing parent goal")
+    depends_on: list[str] = Field(
+        default_factory=list, description="IDs of existing goals that must complete first"
+    )
+    depends_on_refs: list[str] = Field(
+        default_factory=list, description="refs of earlier items that must complete first"
+    )
+
+
+class GoalBulkCreate(BaseModel):
+    """Bulk goal creation request."""
+
+    # Raw items, validated as GoalBulkItem one by one by the endpoint
+    goals: list[Any] = Field(
+        ...,
+        max_length=MAX_BULK_GOALS,
+        description="Goals to create (GoalBulkItem objects), parents before children",
+    )
+
+    model_config = {
+        "json_schema_extra": {
+            "examples": [
+                {
+                    "goals": [
+                        {"description": "Ship the release", "priority": 8, "ref": "release"},
+                        {"description": "Write changelog", "parent_ref": "release"},
+                        {"description": "Tag the build", "parent_ref": "release"},
+                    ]
+                }
+            ]
+        }
+    }
+
+
+class GoalBulkResponse(BaseModel):
+    """Bulk goal creation response."""
+
+    created: int = Field(..., description="Number of goals created", examples=[3])
+    failed: int = Field(..., description="Number of rejected items", examples=[0])
+    results: list[dict[str, Any]] = Field(
+        ...,
+        description="Per-item outcome in request order: index, ref and either id or error",
+    )
+
+
 class CommandRequest(BaseModel):
     """Command request."""
 
@@ -302,6 +379,9 @@ class GoalListResponse(BaseModel):
     page_size: int = Field(..., description="Number of items per page", examples=[10])
     total_pages: int = Field(..., description="Total number of pages", examples=[3])
     goals: list[dict[str, Any]] = Field(..., description="List of goals for current page")
+    next_cursor: str | None = Field(
+        None, description="Cursor for the next page, or null on the last page"
+    )
 
     model_config = {
         "json_schema_extra": {
@@ -647,6 +727,66 @@ async def create_goal(
     )
 
 
+def _format_validation_error(error: ValidationError) -> str:
+    """Summarize a pydantic validation error as one line."""
+    return "; ".join(
+        f"{'.'.join(str(part) for part in detail['loc']) or 'item'}: {detail['msg']}"
+        for detail in error.errors()
+    )
+
+
+@app.post(
+    "/goals/bulk",
+    response_model=GoalBulkResponse,
+    dependencies=[Depends(require_scope(TokenScope.GOAL_WRITE.value))],
+    tags=["Goals"],
+    summary="Create many goals at once",
+    description=f"""
+    Create up to {MAX_BULK_GOALS} goals, including parent/child trees, in one request.
+
+    Give an item a `ref` and nest later items under it with `parent_ref`, or
+    attach items to an existing goal with `parent_id`. Items are validated one
+    by one: invalid items are reported in `results` and the rest are created.
+    Children of a rejected item are rejected as well.
+
+    **Requires**: `GOAL_WRITE` scope
+    """,
+    response_description="Per-item results in request order",
+)
+async def create_goals_bulk(
+    request: GoalBulkCreate,
+    current_user: User = Depends(verify_token),
+) -> GoalBulkResponse:
+    """Create many goals in one call. Requires GOAL_WRITE scope."""
+    if not agent:
+        raise HTTPException(status_code=503, detail="Agent not initialized")
+
+    results: list[dict[str, Any]] = [{} for _ in request.goals]
+    specs: list[dict[str, Any]] = []
+    positions: list[int] = []
+    for index, raw in enumerate(request.goals):
+        try:
+            item = GoalBulkItem.model_validate(raw)
+        except ValidationError as e:
+            ref = raw.get("ref") if isinstance(raw, dict) else None
+            results[index] = {
+                "index": index,
+                "ref": ref if isinstance(ref, str) else None,
+                "error": _format_validation_error(e),
+            }
+            continue
+        specs.append(item.model_dump(exclude_none=True))
+        positions.append(index)
+
+    for position, result in zip(positions, agent.goal_engine.create_goals_bulk(specs)):
+        results[position] = {**result, "index": position}
+
+    created = sum(1 for result in results if "id" in result)
+    logger.info(f"{created} goals bulk created by {current_user.username}")
+
+    return GoalBulkResponse(created=created, failed=len(results) - created, results=results)
+
+
 @app.get(
     "/goals",
     response_model=GoalListResponse,
@@ -657,6 +797,8 @@ async def create_goal(
     Retrieve a list of all goals the agent is currently working on or has completed.
 
     Supports pagination, filtering, and sorting for better data management.
+    Pass the `next_cursor` of a response as `cursor` to fetch the following
+    page; cursor pages cost the same no matter how deep they are.
 
     **Requires**: `GOAL_READ` scope
     """,
@@ -675,6 +817,9 @@ async def list_goals(
         "created_at", description="Sort field (created_at, updated_at, priority, status)"
     ),
     sort_order: str = Query("desc", description="Sort order (asc, desc)"),
+    cursor: str | None = Query(
+        None, description="Cursor from a previous response; takes precedence over page"
+    ),
     current_user: User = Depends(verify_token),
 ) -> GoalListResponse:
     """
@@ -685,62 +830,107 @@ async def list_goals(
     if not agent:
         raise HTTPException(status_code=503, detail="Agent not initialized")
 
-    # Get all goals
-    all_goals = agent.goal_engine.list_goals()
-
-    # Apply filters
-    filtered_goals = []
-    for goal in all_goals:
-        # Status filter
-        if status and goal.status.value != status:
-            continue
-
-        # Mode filter
-        if mode and goal.mode.value != mode:
-            continue
-
-        # Priority range filter
-        if priority_min is not None and goal.priority < priority_min:
-            continue
-        if priority_max is not None and goal.priority > priority_max:
-            continue
-
-        filtered_goals.append(goal)
-
-    # Apply sorting
-    sort_reverse = sort_order == "desc"
-
-    if sort_by == "created_at":
-        filtered_goals.sort(key=lambda g: g.created_at or "", reverse=sort_reverse)
-    elif sort_by == "updated_at":
-        filtered_goals.sort(key=lambda g: g.updated_at or "", reverse=sort_reverse)
-    elif sort_by == "priority":
-        filtered_goals.sort(key=lambda g: g.priority, reverse=sort_reverse)
-    elif sort_by == "status":
-        filtered_goals.sort(key=lambda g: g.status.value, reverse=sort_reverse)
-    else:
+    if sort_by not in GOAL_SORT_FIELDS:
         # Default to created_at
-        filtered_goals.sort(key=lambda g: g.created_at or "", reverse=sort_reverse)
+        sort_by = "created_at"
 
-    # Calculate pagination
-    total_items = len(filtered_goals)
-    total_pages = (total_items + page_size - 1) // page_size if total_items > 0 else 1
-
-    # Ensure page is within bounds
-    if page > total_pages and total_items > 0:
-        page = total_pages
+    try:
+        status_filter = GoalStatus(status) if status else None
+        mode_filter = GoalMode(mode) if mode else None
+    except ValueError:
+        # Unknown status or mode matches nothing
+        return GoalListResponse(total=0, page=page, page_size=page_size, total_pages=1, goals=[])
+
+    query: dict[str, Any] = {
+        "status": status_filter,
+        "mode": mode_filter,
+        "min_priority": priority_min,
+        "max_priority": priority_max,
+        "sort_by": sort_by,
+        "descending": sort_order == "desc",
+        "limit": page_size,
+    }
 
-    # Get page slice
-    start_idx = (page - 1) * page_size
-    end_idx = start_idx + page_size
-    page_goals = filtered_goals[start_idx:end_idx]
+    try:
+        if cursor:
+            result = agent.goal_engine.query_goals(cursor=cursor, **query)
+        else:
+            # Page numbers are served by skipping into the sorted index
+            result = agent.goal_engine.query_goals(offset=(page - 1) * page_size, **query)
+            last_page = (result.total + page_size - 1) // page_size
+
+            # Ensure page is within bounds
+            if page > last_page > 0:
+                page = last_page
+                result = agent.goal_engine.query_goals(offset=(page - 1) * page_size, **query)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    total_pages = (result.total + page_size - 1) // page_size if result.total > 0 else 1
 
     return GoalListResponse(
-        total=total_items,
+        total=result.total,
         page=page,
         page_size=page_size,
         total_pages=total_pages,
-        goals=[goal.to_dict() for goal in page_goals],
+        goals=[goal.to_dict() for goal in result.goals],
+        next_cursor=result.next_cursor,
+    )
+
+
+@app.get(
+    "/goals/changes",
+    dependencies=[Depends(require_scope(TokenScope.GOAL_READ.value))],
+    tags=["Goals"],
+    summary="Stream goal changes",
+    description="""
+    Server-sent event stream of goal changes, so clients receive deltas
+    instead of re-fetching goal lists. Each event has the change sequence
+    number as `id`, the change type (`created`, `status`, `priority`) as
+    `event`, and the change as JSON `data`. `created` carries the whole goal;
+    other events carry only the changed fields.
+
+    Reconnect with `since` (or the standard `Last-Event-ID` header) to replay
+    missed changes. If they are no longer retained a `gap` event is sent
+    first and the client should re-fetch `/goals`.
+
+    **Requires**: `GOAL_READ` scope
+    """,
+)
+async def stream_goal_changes(
+    since: int | None = Query(None, ge=0, description="Replay changes after this sequence"),
+    limit: int | None = Query(None, ge=1, description="End the stream after this many events"),
+    last_event_id: str | None = Header(None),
+    current_user: User = Depends(verify_token),
+) -> StreamingResponse:
+    """Stream goal changes as server-sent events. Requires GOAL_READ scope."""
+    if not agent:
+        raise HTTPException(status_code=503, detail="Agent not initialized")
+
+    if since is None and last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
+    subscription = agent.goal_feed.subscribe(since=since)
+
+    async def events() -> AsyncIterator[str]:
+        sent = 0
+        try:
+            while limit is None or sent < limit:
+                try:
+                    change = await asyncio.wait_for(
+                        subscription.get(), timeout=GOAL_FEED_HEARTBEAT_SECONDS
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                except StopAsyncIteration:
+                    break
+                yield f"id: {change.seq}\nevent: {change.event}\ndata: {change.to_json()}\n\n"
+                sent += 1
+        finally:
+            subscription.close()
+
+    return StreamingResponse(
+        events(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"}
     )
 
 
@@ -751,23 +941,69 @@ async def list_goals(
 )
 async def get_goal(
     goal_id: str,
+    depth: int | None = Query(
+        None, ge=0, description="Maximum hierarchy depth to include (default: whole tree)"
+    ),
     current_user: User = Depends(verify_token),
 ) -> dict[str, Any]:
     """Get a specific goal. Requires GOAL_READ scope."""
     if not agent:
         raise HTTPException(status_code=503, detail="Agent not initialized")
 
-    goal = agent.goal_engine.get_goal(goal_id)
+    goal = agent.goal_engine.get_goal(goal_id, include_archived=True)
 
     if not goal:
         raise HTTPException(status_code=404, detail="Goal not found")
 
+    if agent.goal_engine.is_archived(goal_id):
+        # Cold path: the archived record only, without live hierarchy
+        return {"goal": goal.to_dict(), "archived": True}
+
     return {
         "goal": goal.to_dict(),
-        "hierarchy": agent.goal_engine.get_goal_hierarchy(goal_id),
+        "hierarchy": agent.goal_engine.get_goal_hierarchy(goal_id, max_depth=depth),
+        "progress": agent.goal_engine.get_goal_progress(goal_id),
     }
 
 
+@app.get(
+    "/goals/{goal_id}/hierarchy",
+    dependencies=[Depends(require_scope(TokenScope.GOAL_READ.value))],
+    tags=["Goals"],
+    summary="Stream a goal hierarchy",
+    description="""
+    Stream a goal and its descendants as newline-delimited JSON, one
+    `{"depth": ..., "goal": ...}` object per line in depth-first order.
+    Large decompositions are sent without building the whole tree first.
+
+    **Requires**: `GOAL_READ` scope
+    """,
+)
+async def stream_goal_hierarchy(
+    goal_id: str,
+    depth: int | None = Query(None, ge=0, description="Maximum depth to include"),
+    current_user: User = Depends(verify_token),
+) -> StreamingResponse:
+    """Stream a goal hierarchy as NDJSON. Requires GOAL_READ scope."""
+    if not agent:
+        raise HTTPException(status_code=503, detail="Agent not initialized")
+
+    goal_engine = agent.goal_engine
+    if not goal_engine.get_goal(goal_id):
+        raise HTTPException(status_code=404, detail="Goal not found")
+
+    async def lines() -> AsyncIterator[str]:
+        # Walk on the event loop, which owns the engine's dicts, and pause
+        # between batches so large trees don't starve other requests
+        walk = goal_engine.iter_goal_hierarchy(goal_id, max_depth=depth)
+        for count, (level, goal) in enumerate(walk, start=1):
+            yield f'{{"depth":{level},"goal":{goal.to_json()}}}\n'
+            if count % GOAL_HIERARCHY_YIELD_EVERY == 0:
+                await asyncio.sleep(0)
+
+    return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+
 # Content Moderation endpoints
 
 
@@ -1,5 +1,6 @@
 """WebSocket Gateway for real-time communication."""
 
+import asyncio
 import json
 from collections.abc import AsyncIterator
 from contextlib import asynccontextmanager
@@ -10,6 +11,7 @@ from fastapi import FastAPI, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 
 from xagent.core.agent import XAgent
+from xagent.core.goal_feed import GoalFeed
 from xagent.utils.logging import configure_logging, get_logger
 
 logger = get_logger(__name__)
@@ -30,12 +32,18 @@ async def lifespan(app: FastAPI) -> AsyncIterator[None]:
     logger.info("Starting X-Agent WebSocket Gateway...")
     agent = XAgent()
     await agent.initialize()
+    feed_task = asyncio.create_task(manager.forward_goal_changes(agent.goal_feed))
     logger.info("X-Agent WebSocket Gateway started")
 
     yield
 
     # Shutdown
     logger.info("Shutting down X-Agent WebSocket Gateway...")
+    feed_task.cancel()
+    try:
+        await feed_task
+    except asyncio.CancelledError:
+        pass
     if agent:
         await agent.stop()
     logger.info("X-Agent WebSocket Gateway shutdown complete")
@@ -91,7 +99,7 @@ class ConnectionManager:
         """Broadcast message to all connected clients."""
         disconnected = set()
 
-        for connection in self.active_connections:
+        for connection in list(self.active_connections):
             try:
                 await connection.send_json(message)
             except Exception as e:
@@ -101,6 +109,22 @@ class ConnectionManager:
         # Clean up disconnected clients
         self.active_connections -= disconnected
 
+    async def forward_goal_changes(self, feed: GoalFeed) -> None:
+        """
+        Broadcast goal change deltas from the change feed until cancelled.
+
+        Clients receive ``goal_change`` messages instead of polling for goal
+        state. A ``gap`` change means changes were dropped because clients
+        were too slow, and goal state should be re-fetched.
+
+        Args:
+            feed: Goal change feed to follow
+        """
+        async with feed.subscribe() as changes:
+            async for change in changes:
+                if self.active_connections:
+                    await self.broadcast({"type": "goal_change", **change.to_dict()})
+
 
 manager = ConnectionManager()
 
@@ -126,6 +150,7 @@ async def websocket_endpoint(websocket: WebSocket) -> None:
         {
             "type": "connected",
             "message": "Connected to X-Agent",
+            "goal_seq": agent.goal_feed.last_seq if agent else 0,
             "timestamp": datetime.now(timezone.utc).isoformat(),
         },
     )
@@ -47,6 +47,40 @@ class Settings(BaseSettings):
     redis_port: int = Field(default=6379, description="Redis port")
     redis_password: str = Field(default="", description="Redis password")
     redis_db: int = Field(default=0, description="Redis database")
+    memory_cache_enabled: bool = Field(
+        default=True, description="Serve hot memory keys from an in-process L0 cache"
+    )
+    memory_cache_max_entries: int = Field(
+        default=10000, description="Maximum keys held by the L0 memory cache"
+    )
+    memory_cache_max_bytes: int = Field(
+        default=64 * 1024 * 1024, description="Maximum encoded bytes held by the L0 memory cache"
+    )
+    memory_cache_ttl_seconds: float = Field(
+        default=60.0, description="Seconds an L0 memory cache entry stays valid"
+    )
+    memory_cache_invalidation_channel: str = Field(
+        default="xagent:memory:invalidate",
+        description="Redis pub/sub channel used to invalidate L0 caches across replicas",
+    )
+    memory_negative_cache_enabled: bool = Field(
+        default=True, description="Remember keys missing from a memory tier for a short time"
+    )
+    memory_negative_cache_max_entries: int = Field(
+        default=10000, description="Maximum tombstones kept per memory tier"
+    )
+    memory_negative_cache_ttl_seconds: float = Field(
+        default=5.0, description="Seconds a memory tier miss is remembered"
+    )
+    memory_codec_format: str = Field(
+        default="json", description="Memory value encoding: 'json' or 'msgpack'"
+    )
+    memory_codec_compression: str = Field(
+        default="zlib", description="Compression of large memory values: 'none', 'zlib' or 'zstd'"
+    )
+    memory_codec_compress_threshold: int = Field(
+        default=1024, description="Encoded size in bytes from which memory values are compressed"
+    )
 
     # PostgreSQL Configuration
     postgres_host: str = Field(default="localhost", description="PostgreSQL host")
@@ -54,6 +88,44 @@ class Settings(BaseSettings):
     postgres_db: str = Field(default="xagent", description="PostgreSQL database")
     postgres_user: str = Field(default="xagent", description="PostgreSQL user")
     postgres_password: str = Field(default="", description="PostgreSQL password")
+    goal_persistence_enabled: bool = Field(
+        default=False, description="Persist goals to the goals table (write-behind)"
+    )
+    goal_persistence_batch_size: int = Field(
+        default=500, description="Maximum goals written per upsert batch"
+    )
+    goal_persistence_flush_seconds: float = Field(
+        default=1.0, description="Seconds between write-behind goal flushes"
+    )
+    goal_archive_enabled: bool = Field(
+        default=False, description="Move old completed/failed goals to a compressed archive"
+    )
+    goal_archive_path: str = Field(
+        default="./data/goal_archive.bin", description="Goal archive file"
+    )
+    goal_archive_max_age_hours: float = Field(
+        default=24.0, description="Hours a goal must be finished before it is archived"
+    )
+    goal_archive_interval_seconds: float = Field(
+        default=3600.0, description="Seconds between in-process goal archival runs"
+    )
+    goal_feed_buffer_size: int = Field(
+        default=1000, description="Goal changes buffered per change-feed subscriber"
+    )
+    goal_feed_redis_enabled: bool = Field(
+        default=False, description="Mirror the goal change feed to a Redis stream"
+    )
+    goal_feed_redis_stream: str = Field(
+        default="xagent:goal_changes", description="Redis stream key for goal changes"
+    )
+    memory_write_batch_size: int = Field(
+        default=500, description="Maximum medium-term memory rows per upsert statement"
+    )
+    memory_write_flush_seconds: float = Field(
+        default=0.05,
+        description="Seconds medium-term memory saves are coalesced before they are written "
+        "(0 = write each save immediately)",
+    )
 
     # ChromaDB Configuration
     chroma_host: str = Field(default="localhost", description="ChromaDB host")
@@ -98,6 +170,61 @@ class Settings(BaseSettings):
     )
     max_iterations: int = Field(default=100, description="Maximum iterations per task")
     loop_delay_seconds: float = Field(default=1.0, description="Delay between loop iterations")
+    loop_scheduler_mode: str = Field(
+        default="polling",
+        description="Cognitive loop scheduler: 'polling' (fixed delay) or 'event' (wake on "
+        "perceptions, goal changes and timers)",
+    )
+    loop_idle_wakeup_seconds: float = Field(
+        default=5.0, description="Timer wakeup interval for the event-driven scheduler when idle"
+    )
+    loop_pipeline_enabled: bool = Field(
+        default=False,
+        description="Persist reflections in the background while the next iteration runs",
+    )
+    loop_pipeline_depth: int = Field(
+        default=4, description="Maximum in-flight reflection writes in pipelined mode"
+    )
+    action_log_batch_size: int = Field(
+        default=20, description="Goal action records buffered before they are written"
+    )
+    action_log_flush_seconds: float = Field(
+        default=5.0, description="Maximum age in seconds of a buffered goal action record"
+    )
+    action_log_tail_size: int = Field(
+        default=50, description="Recent goal action records kept in the action log head"
+    )
+    recent_actions_window: int = Field(
+        default=10,
+        description="Recent goal actions passed to planning; older ones are summarized",
+    )
+    loop_pacing_enabled: bool = Field(
+        default=False,
+        description="Spread iterations by rate limiter fill level instead of cooling down",
+    )
+    loop_pacing_target_fill: float = Field(
+        default=0.5, description="Iteration bucket fill level below which pacing starts"
+    )
+    loop_pacing_scarce_fill: float = Field(
+        default=0.2,
+        description="Iteration bucket fill level below which lower priority goals yield",
+    )
+    loop_pacing_max_priority: int = Field(
+        default=10, description="Goal priority that always gets scarce iteration budget"
+    )
+    loop_phase_metrics_enabled: bool = Field(
+        default=True, description="Export per-phase cognitive loop durations to Prometheus"
+    )
+    loop_phase_tracing_enabled: bool = Field(
+        default=False, description="Emit an OpenTelemetry span per cognitive loop phase"
+    )
+    loop_phase_profiling_enabled: bool = Field(
+        default=False, description="Feed cognitive loop phase durations to the profiler"
+    )
+    loop_max_concurrent_goals: int = Field(
+        default=1,
+        description="Goals the cognitive loop drives concurrently (1 = single active goal)",
+    )
     max_sub_agents: int = Field(
         default=5, 
         description="Maximum number of concurrent sub-agents for subtask execution (recommended: 5-7)"
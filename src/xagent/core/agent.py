@@ -1,15 +1,19 @@
 """Main X-Agent class - Autonomous AI Agent."""
 
 import asyncio
+from datetime import timedelta
 from typing import Any, Union
 
 from xagent.config import Settings
 from xagent.core.agent_roles import AgentCoordinator
 from xagent.core.cognitive_loop import CognitiveLoop
 from xagent.core.executor import Executor
+from xagent.core.goal_archive import GoalArchive
 from xagent.core.goal_engine import GoalEngine, GoalMode, GoalStatus
+from xagent.core.goal_feed import GoalFeed
 from xagent.core.metacognition import MetaCognitionMonitor
 from xagent.core.planner import Planner
+from xagent.database.goal_store import GoalStore
 from xagent.memory.memory_layer import MemoryLayer
 from xagent.planning.langgraph_planner import LangGraphPlanner
 from xagent.utils.logging import get_logger
@@ -49,7 +53,25 @@ class XAgent:
         logger.info(f"Initialized agent coordinator with max {max_sub_agents} sub-agents")
 
         # Initialize core components
-        self.goal_engine = GoalEngine()
+        archive = None
+        if getattr(self.settings, "goal_archive_enabled", False):
+            archive = GoalArchive(
+                getattr(self.settings, "goal_archive_path", "./data/goal_archive.bin")
+            )
+        self.goal_engine = GoalEngine(archive=archive)
+        self.goal_store: GoalStore | None = None
+        # Push goal changes to WebSocket/SSE consumers (and optionally Redis)
+        self.goal_feed = GoalFeed(
+            buffer_size=getattr(self.settings, "goal_feed_buffer_size", 1000),
+            redis_url=(
+                self.settings.redis_url
+                if getattr(self.settings, "goal_feed_redis_enabled", False)
+                else None
+            ),
+            stream_key=getattr(self.settings, "goal_feed_redis_stream", "xagent:goal_changes"),
+        )
+        self.goal_feed.attach(self.goal_engine)
+        self._archive_task: asyncio.Task[None] | None = None
         self.memory = MemoryLayer()
 
         # Choose planner based on configuration
@@ -78,6 +100,20 @@ class XAgent:
         # Initialize memory layer
         await self.memory.initialize()
 
+        # Warm-start goals from the database and persist changes write-behind
+        if getattr(self.settings, "goal_persistence_enabled", False):
+            self.goal_store = GoalStore(
+                batch_size=getattr(self.settings, "goal_persistence_batch_size", 500),
+                flush_interval=getattr(self.settings, "goal_persistence_flush_seconds", 1.0),
+            )
+            await self.goal_store.load_async(self.goal_engine)
+            self.goal_store.attach(self.goal_engine)
+            await self.goal_store.start()
+
+        # Move finished goals out of memory periodically
+        if self.goal_engine.archive is not None:
+            self._archive_task = asyncio.create_task(self._archive_loop())
+
         # Initialize cognitive loop
         self.cognitive_loop = CognitiveLoop(
             goal_engine=self.goal_engine,
@@ -101,6 +137,8 @@ class XAgent:
 
         logger.info("Starting X-Agent...")
 
+        await self.goal_feed.start()
+
         # Create initial goal if provided
         if initial_goal:
             goal = self.goal_engine.create_goal(
@@ -122,11 +160,52 @@ class XAgent:
         if self.cognitive_loop:
             await self.cognitive_loop.stop()
 
+        if self._archive_task:
+            self._archive_task.cancel()
+            try:
+                await self._archive_task
+            except asyncio.CancelledError:
+                pass
+            self._archive_task = None
+
+        await self.goal_feed.stop()
+
+        # Write remaining goal changes
+        if self.goal_store:
+            await self.goal_store.stop()
+            self.goal_store = None
+
         # Close memory connections
         await self.memory.close()
 
         logger.info("X-Agent stopped")
 
+    async def archive_goals(self) -> int:
+        """
+        Archive finished goals older than ``goal_archive_max_age_hours``.
+
+        Archived goals are also removed from the goals table so a warm start
+        does not load them back into memory.
+
+        Returns:
+            Number of goals archived
+        """
+        max_age = timedelta(hours=getattr(self.settings, "goal_archive_max_age_hours", 24.0))
+        archived = await self.goal_engine.archive_completed_goals_async(max_age)
+        if archived and self.goal_store:
+            await self.goal_store.delete_async(archived)
+        return len(archived)
+
+    async def _archive_loop(self) -> None:
+        """Run goal archival every ``goal_archive_interval_seconds``."""
+        interval = getattr(self.settings, "goal_archive_interval_seconds", 3600.0)
+        while True:
+            await asyncio.sleep(interval)
+            try:
+                await self.archive_goals()
+            except Exception as e:
+                logger.error(f"Goal archival failed: {e}")
+
     async def send_command(self, command: str) -> None:
         """
         Send a command to the agent.
@@ -184,10 +263,13 @@ class XAgent:
             "planner_type": "langgraph" if self.settings.use_langgraph_planner else "legacy",
             "active_goal": None,
             "goals_summary": {
-                "total": len(self.goal_engine.goals),
-                "pending": len(self.goal_engine.list_goals(status=GoalStatus.PENDING)),
-                "in_progress": len(self.goal_engine.list_goals(status=GoalStatus.IN_PROGRESS)),
-                "completed": len(self.goal_engine.list_goals(status=GoalStatus.COMPLETED)),
+                "total": self.goal_engine.count_goals(include_archived=True),
+                "pending": self.goal_engine.count_goals(status=GoalStatus.PENDING),
+                "in_progress": self.goal_engine.count_goals(status=GoalStatus.IN_PROGRESS),
+                "completed": self.goal_engine.count_goals(
+                    status=GoalStatus.COMPLETED, include_archived=True
+                ),
+                "in_memory": self.goal_engine.count_goals(),
             },
             "performance": self.metacognition.get_performance_summary(),
             "agents": self.agent_coordinator.get_status(),
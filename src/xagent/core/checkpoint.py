@@ -0,0 +1,252 @@
+"""Checkpoint storage for the cognitive loop.
+
+Checkpoints are stored as binary frames::
+
+    magic (4s) | version (B) | kind (B) | base id (Q) | length (I) | crc32 (I) | payload
+
+The payload is zlib-compressed compact JSON. A full snapshot lives in
+``checkpoint.bin`` and is replaced atomically (temp file, fsync, rename).
+Delta frames are appended to ``checkpoint.delta`` and only apply to the
+snapshot whose base id they carry, so a crash between writing a new
+snapshot and discarding the old deltas cannot mix them up. A torn frame at
+the end of the delta log is ignored on load.
+
+All methods do blocking file I/O; callers on the event loop should run
+them with ``asyncio.to_thread``.
+"""
+
+import json
+import os
+import struct
+import zlib
+from enum import IntEnum
+from pathlib import Path
+from typing import Any
+
+from xagent.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+MAGIC = b"XCKP"
+FORMAT_VERSION = 1
+
+_HEADER = struct.Struct(">4sBBQII")
+
+
+class FrameKind(IntEnum):
+    """Checkpoint frame kinds."""
+
+    FULL = 1
+    DELTA = 2
+
+
+class CheckpointError(Exception):
+    """Raised when a checkpoint frame cannot be decoded."""
+
+
+def encode_frame(kind: FrameKind, base_id: int, data: dict[str, Any]) -> bytes:
+    """
+    Encode a checkpoint frame.
+
+    Args:
+        kind: Frame kind
+        base_id: Id of the full snapshot the frame belongs to
+        data: JSON-serializable payload
+
+    Returns:
+        Encoded frame
+    """
+    payload = zlib.compress(json.dumps(data, separators=(",", ":"), default=str).encode("utf-8"))
+    header = _HEADER.pack(MAGIC, FORMAT_VERSION, kind, base_id, len(payload), zlib.crc32(payload))
+    return header + payload
+
+
+def decode_frame(buffer: bytes, offset: int = 0) -> tuple[FrameKind, int, dict[str, Any], int]:
+    """
+    Decode the checkpoint frame starting at ``offset``.
+
+    Args:
+        buffer: Raw bytes
+        offset: Start of the frame
+
+    Returns:
+        Tuple of (kind, base id, payload, offset of the next frame)
+
+    Raises:
+        CheckpointError: If the frame is truncated or corrupted
+    """
+    end = offset + _HEADER.size
+    if end > len(buffer):
+        raise CheckpointError("Truncated frame header")
+
+    magic, version, kind, base_id, length, crc = _HEADER.unpack_from(buffer, offset)
+    if magic != MAGIC:
+        raise CheckpointError("Bad frame magic")
+    if version != FORMAT_VERSION:
+        raise CheckpointError(f"Unsupported checkpoint version: {version}")
+
+    payload = buffer[end : end + length]
+    if len(payload) != length:
+        raise CheckpointError("Truncated frame payload")
+    if zlib.crc32(payload) != crc:
+        raise CheckpointError("Frame checksum mismatch")
+
+    try:
+        data = json.loads(zlib.decompress(payload))
+    except (zlib.error, ValueError) as e:
+        raise CheckpointError(f"Undecodable frame payload: {e}") from e
+
+    return FrameKind(kind), base_id, data, end + length
+
+
+def apply_delta(state: dict[str, Any], delta: dict[str, Any]) -> dict[str, Any]:
+    """
+    Apply a delta frame to a checkpoint state (in place).
+
+    Args:
+        state: State restored so far
+        delta: Delta payload with changed loop ``state`` keys, ``goals``
+            and ``action_tails``, and the IDs of ``removed`` goals
+
+    Returns:
+        The updated state
+    """
+    state.update(delta.get("state", {}))
+    for goal_id in delta.get("removed", ()):
+        for key in ("goals", "action_tails"):
+            state.get(key, {}).pop(goal_id, None)
+    for key in ("goals", "action_tails"):
+        changes = delta.get(key)
+        if changes:
+            state.setdefault(key, {}).update(changes)
+    return state
+
+
+class CheckpointStore:
+    """Reads and writes checkpoint frames in a directory."""
+
+    FULL_FILE = "checkpoint.bin"
+    DELTA_FILE = "checkpoint.delta"
+    LEGACY_FILE = "checkpoint.json"
+
+    def __init__(self, directory: Path) -> None:
+        """
+        Initialize the store.
+
+        Args:
+            directory: Checkpoint directory
+        """
+        self.directory = Path(directory)
+
+    @property
+    def full_path(self) -> Path:
+        """Path of the full snapshot."""
+        return self.directory / self.FULL_FILE
+
+    @property
+    def delta_path(self) -> Path:
+        """Path of the delta log."""
+        return self.directory / self.DELTA_FILE
+
+    def write_full(self, base_id: int, state: dict[str, Any]) -> int:
+        """
+        Atomically replace the full snapshot and discard older deltas.
+
+        Args:
+            base_id: Id of the new snapshot
+            state: Checkpoint state
+
+        Returns:
+            Number of bytes written
+        """
+        self.directory.mkdir(parents=True, exist_ok=True)
+        frame = encode_frame(FrameKind.FULL, base_id, state)
+
+        tmp_path = self.full_path.with_suffix(".tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(frame)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.full_path)
+        self._fsync_directory()
+
+        # Deltas of the previous snapshot no longer apply
+        self.delta_path.unlink(missing_ok=True)
+        return len(frame)
+
+    def append_delta(self, base_id: int, delta: dict[str, Any]) -> int:
+        """
+        Append a delta frame for the snapshot ``base_id``.
+
+        Args:
+            base_id: Id of the snapshot the delta applies to
+            delta: Delta payload
+
+        Returns:
+            Number of bytes written
+        """
+        frame = encode_frame(FrameKind.DELTA, base_id, delta)
+        with open(self.delta_path, "ab") as f:
+            f.write(frame)
+            f.flush()
+            os.fsync(f.fileno())
+        return len(frame)
+
+    def load(self) -> tuple[int, dict[str, Any]] | None:
+        """
+        Load the latest snapshot with its deltas applied.
+
+        Falls back to the legacy JSON checkpoint when no snapshot exists.
+
+        Returns:
+            Tuple of (base id, state), or None if there is no checkpoint
+
+        Raises:
+            CheckpointError: If the full snapshot is corrupted
+        """
+        if not self.full_path.exists():
+            return self._load_legacy()
+
+        kind, base_id, state, _ = decode_frame(self.full_path.read_bytes())
+        if kind != FrameKind.FULL:
+            raise CheckpointError("Snapshot file does not hold a full frame")
+
+        if self.delta_path.exists():
+            buffer = self.delta_path.read_bytes()
+            offset = 0
+            applied = 0
+            while offset < len(buffer):
+                try:
+                    kind, delta_base, delta, offset = decode_frame(buffer, offset)
+                except CheckpointError as e:
+                    logger.warning(f"Ignoring checkpoint deltas after offset {offset}: {e}")
+                    break
+                if kind == FrameKind.DELTA and delta_base == base_id:
+                    apply_delta(state, delta)
+                    applied += 1
+            logger.debug(f"Applied {applied} checkpoint deltas")
+
+        return base_id, state
+
+    def _load_legacy(self) -> tuple[int, dict[str, Any]] | None:
+        """Load a checkpoint written in the previous JSON format."""
+        legacy_path = self.directory / self.LEGACY_FILE
+        if not legacy_path.exists():
+            return None
+        with open(legacy_path) as f:
+            state = json.load(f)
+        logger.info("Loaded legacy JSON checkpoint")
+        return 0, state
+
+    def _fsync_directory(self) -> None:
+        """Persist the rename of the snapshot file."""
+        try:
+            fd = os.open(self.directory, os.O_RDONLY)
+        except OSError:
+            return
+        try:
+            os.fsync(fd)
+        except OSError:
+            pass
+        finally:
+            os.close(fd)
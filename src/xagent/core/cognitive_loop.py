@@ -1,23 +1,31 @@
 """Cognitive Loop - The continuous thinking process of X-Agent."""
 
 import asyncio
-import json
-import pickle
 import time
+from collections.abc import Coroutine, Iterator
+from contextlib import AbstractContextManager, contextmanager, nullcontext
 from datetime import datetime, timezone
 from enum import Enum
 from pathlib import Path
 from typing import Any, cast
 
 from xagent.config import settings
+from xagent.core.checkpoint import CheckpointStore
 from xagent.core.goal_engine import GoalEngine, GoalStatus
 from xagent.core.internal_rate_limiting import get_internal_rate_limiter
+from xagent.core.pacing import IterationPacer
+from xagent.memory.action_log import GoalActionLog
 from xagent.memory.memory_layer import MemoryLayer
 from xagent.monitoring.metrics import MetricsCollector
+from xagent.monitoring.performance import get_profiler
+from xagent.monitoring.tracing import trace_operation
 from xagent.utils.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Shared no-op context used when phase instrumentation is off
+_NO_INSTRUMENTATION = nullcontext()
+
 
 class LoopPhase(str, Enum):
     """Cognitive loop phases."""
@@ -39,6 +47,13 @@ class CognitiveState(str, Enum):
     STOPPED = "stopped"
 
 
+class SchedulerMode(str, Enum):
+    """Cognitive loop scheduling strategies."""
+
+    POLLING = "polling"  # Fixed delay between iterations
+    EVENT = "event"  # Park until a perception, goal change or timer fires
+
+
 class CognitiveLoop:
     """
     Cognitive Loop - Permanent thinking cycle.
@@ -77,8 +92,44 @@ class CognitiveLoop:
         # Perception queue for inputs
         self.perception_queue: asyncio.Queue = asyncio.Queue()
 
+        # Scheduler configuration
+        self.scheduler_mode = SchedulerMode(getattr(settings, "loop_scheduler_mode", "polling"))
+        self.idle_wakeup_interval = getattr(settings, "loop_idle_wakeup_seconds", 5.0)
+        self._wakeup = asyncio.Event()
+        self.goal_engine.add_listener(self._on_goal_change)
+
+        # Pipelined reflection: persistence overlaps the next iteration
+        self.pipeline_enabled = getattr(settings, "loop_pipeline_enabled", False)
+        self.pipeline_depth = max(1, getattr(settings, "loop_pipeline_depth", 4))
+        self._pipeline_slots = asyncio.Semaphore(self.pipeline_depth)
+        self._inflight_reflections: set[asyncio.Task] = set()
+        self._reflection_tails: dict[str | None, asyncio.Task] = {}
+
+        # Goal action history: append-only with batched writes
+        self.action_log = GoalActionLog(
+            memory,
+            batch_size=getattr(settings, "action_log_batch_size", 20),
+            flush_interval=getattr(settings, "action_log_flush_seconds", 5.0),
+            tail_size=getattr(settings, "action_log_tail_size", 50),
+        )
+        self.recent_actions_window = getattr(settings, "recent_actions_window", 10)
+        # Finished goals whose action log state is dropped at the next flush point
+        self._finished_goal_ids: set[str] = set()
+
+        # Multi-goal mode: up to N goals run as separate tasks
+        self.max_concurrent_goals = max(1, getattr(settings, "loop_max_concurrent_goals", 1))
+        self._goal_workers: dict[str, asyncio.Task] = {}
+        self._goal_inboxes: dict[str, list[Any]] = {}
+        self._goal_wakeups: dict[str, asyncio.Event] = {}
+
         # Metrics tracking
         self.metrics = MetricsCollector()
+
+        # Per-phase instrumentation (histograms, spans, profiler)
+        self.phase_metrics_enabled = getattr(settings, "loop_phase_metrics_enabled", True)
+        self.phase_tracing_enabled = getattr(settings, "loop_phase_tracing_enabled", False)
+        self.phase_profiling_enabled = getattr(settings, "loop_phase_profiling_enabled", False)
+        self.profiler = get_profiler() if self.phase_profiling_enabled else None
         self.start_time: float | None = None
         self.task_results: list[bool] = []  # Track last 100 task results
 
@@ -88,10 +139,29 @@ class CognitiveLoop:
         self.checkpoint_dir = Path(getattr(settings, "checkpoint_dir", "/tmp/xagent_checkpoints"))
         self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
         self.last_checkpoint_iteration = 0
+        # Checkpoints between full snapshots; the ones in between are deltas
+        self.checkpoint_full_interval = getattr(settings, "checkpoint_full_interval", 10)
+        self._checkpoint_lock = asyncio.Lock()
+        self._checkpoint_base_id: int | None = None
+        self._checkpoint_last_state: dict[str, Any] = {}
+        self._deltas_since_full = 0
+        self._dirty_goal_ids: set[str] = set()
+        # Goals in the state the last checkpoint frame describes
+        self._checkpoint_goal_ids: set[str] = set()
 
         # Internal rate limiter
         self.rate_limiter = get_internal_rate_limiter()
 
+        # Adaptive pacing spreads iterations instead of hitting cooldowns
+        self.pacer: IterationPacer | None = None
+        if getattr(settings, "loop_pacing_enabled", False):
+            self.pacer = IterationPacer(
+                self.rate_limiter,
+                target_fill=getattr(settings, "loop_pacing_target_fill", 0.5),
+                scarce_fill=getattr(settings, "loop_pacing_scarce_fill", 0.2),
+                max_priority=getattr(settings, "loop_pacing_max_priority", 10),
+            )
+
     async def start(self, resume_from_checkpoint: bool = True) -> None:
         """
         Start the cognitive loop.
@@ -126,8 +196,32 @@ class CognitiveLoop:
         """Stop the cognitive loop."""
         self.running = False
         self.state = CognitiveState.STOPPED
+        self.wake()
+        for event in self._goal_wakeups.values():
+            event.set()
         logger.info("Cognitive loop stopped")
 
+    def wake(self) -> None:
+        """Wake the loop if it is parked by the event-driven scheduler."""
+        self._wakeup.set()
+
+    def _wake_goal(self, goal_id: str | None) -> None:
+        """Wake the worker of a goal if it is parked without a plan."""
+        if goal_id is not None and goal_id in self._goal_wakeups:
+            self._goal_wakeups[goal_id].set()
+
+    def _on_goal_change(self, event: str, goal: Any) -> None:
+        """Goal engine listener: new or changed goals may mean new work."""
+        self._dirty_goal_ids.add(goal.id)
+        if goal.status in (GoalStatus.COMPLETED, GoalStatus.FAILED):
+            self._finished_goal_ids.add(goal.id)
+        else:
+            self._finished_goal_ids.discard(goal.id)
+        # A sub-goal change may unblock its parent's next plan
+        self._wake_goal(goal.id)
+        self._wake_goal(goal.parent_id)
+        self.wake()
+
     async def add_perception(self, data: dict[str, Any]) -> None:
         """
         Add perception data to the queue.
@@ -136,20 +230,33 @@ class CognitiveLoop:
             data: Perception data (commands, messages, events, etc.)
         """
         await self.perception_queue.put(data)
+        self.wake()
         logger.debug(f"Added perception to queue: {data.get('type', 'unknown')}")
 
     async def _loop(self) -> None:
         """Main cognitive loop."""
+        if self.max_concurrent_goals > 1:
+            await self._supervise_goals()
+            return
+
         while self.running and self.iteration_count < self.max_iterations:
+            # Idle fast path: nothing queued and no goal to work on, so skip
+            # context building, metrics and checkpointing entirely
+            if self._is_idle():
+                if self.scheduler_mode == SchedulerMode.EVENT:
+                    await self._wait_for_wakeup()
+                else:
+                    await asyncio.sleep(0.1)
+                continue
+
             # Check internal rate limit before starting iteration
-            if not await self.rate_limiter.check_iteration_limit():
-                # Rate limit exceeded, cooldown was applied
-                logger.info("Rate limit applied, continuing after cooldown")
+            if not await self._acquire_iteration(self._current_priority()):
                 continue
 
             loop_start = time.time()
             iteration_success = True
             decision_start = time.time()
+            plan = None
 
             try:
                 self.iteration_count += 1
@@ -161,15 +268,18 @@ class CognitiveLoop:
 
                 # Phase 1: Perception
                 self.current_phase = LoopPhase.PERCEPTION
-                perception_data = await self._perceive()
+                with self._phase(LoopPhase.PERCEPTION):
+                    perception_data = await self._perceive()
 
                 # Phase 2: Interpretation
                 self.current_phase = LoopPhase.INTERPRETATION
-                context = await self._interpret(perception_data)
+                with self._phase(LoopPhase.INTERPRETATION):
+                    context = await self._interpret(perception_data)
 
                 # Phase 3: Planning
                 self.current_phase = LoopPhase.PLANNING
-                plan = await self._plan(context)
+                with self._phase(LoopPhase.PLANNING):
+                    plan = await self._plan(context)
 
                 # Phase 4: Execution
                 if plan:
@@ -180,7 +290,8 @@ class CognitiveLoop:
                     decision_latency = time.time() - decision_start
                     self.metrics.record_decision_latency(decision_latency)
                     
-                    result = await self._execute(plan)
+                    with self._phase(LoopPhase.EXECUTION):
+                        result = await self._execute(plan)
 
                     # Track task success
                     task_success = result.get("success", False)
@@ -190,14 +301,15 @@ class CognitiveLoop:
                     # Phase 5: Reflection
                     self.current_phase = LoopPhase.REFLECTION
                     self.state = CognitiveState.REFLECTING
-                    await self._reflect(result)
+                    with self._phase(LoopPhase.REFLECTION):
+                        await self._reflect(result)
 
                 # Save checkpoint if needed
-                if self.should_checkpoint():
-                    await self.save_checkpoint()
+                await self._checkpoint_if_due()
 
                 # Small delay between iterations
-                await asyncio.sleep(0.1)
+                if self.scheduler_mode == SchedulerMode.POLLING:
+                    await asyncio.sleep(0.1)
 
             except Exception as e:
                 logger.error(f"Error in cognitive loop: {e}", exc_info=True)
@@ -210,8 +322,298 @@ class CognitiveLoop:
                 status = "success" if iteration_success else "error"
                 self.metrics.record_cognitive_loop(loop_duration, status)
 
+            if self.scheduler_mode == SchedulerMode.EVENT and self.running:
+                if plan:
+                    # More work is likely pending; yield to other tasks and continue
+                    await asyncio.sleep(0)
+                else:
+                    await self._wait_for_wakeup()
+
+        await self.drain_reflections()
+        await self.action_log.flush()
         logger.info(f"Cognitive loop ended after {self.iteration_count} iterations")
 
+    async def _supervise_goals(self) -> None:
+        """
+        Multi-goal loop: keep up to ``max_concurrent_goals`` goal workers busy.
+
+        The supervisor owns the perception queue. Commands are executed here,
+        other inputs are forwarded to every running goal worker. Each worker
+        runs its own interpretation, planning, execution and reflection, so
+        goals waiting on tools no longer block each other. All workers share
+        the iteration budget and the internal rate limiter.
+        """
+        while self.running and self.iteration_count < self.max_iterations:
+            try:
+                if self.start_time:
+                    self.metrics.update_agent_uptime(time.time() - self.start_time)
+
+                with self._phase(LoopPhase.PERCEPTION):
+                    perception = await self._perceive()
+                for input_data in perception["inputs"]:
+                    if input_data.get("type") == "command":
+                        result = await self._execute(
+                            {"type": "create_goal", "content": input_data.get("content")}
+                        )
+                        self.metrics.record_task_result(result.get("success", False))
+                        self._update_task_success_rate(result.get("success", False))
+                    else:
+                        for goal_id, inbox in self._goal_inboxes.items():
+                            inbox.append(input_data)
+                            self._wake_goal(goal_id)
+
+                self._dispatch_goals()
+
+                await self._checkpoint_if_due()
+
+            except Exception as e:
+                logger.error(f"Error in goal supervisor: {e}", exc_info=True)
+                await asyncio.sleep(1)  # Prevent tight error loop
+
+            if self.running:
+                await self._wait_for_wakeup()
+
+        if self._goal_workers:
+            await asyncio.gather(*self._goal_workers.values(), return_exceptions=True)
+        await self.drain_reflections()
+        await self.action_log.flush()
+        logger.info(f"Cognitive loop ended after {self.iteration_count} iterations")
+
+    def _dispatch_goals(self) -> None:
+        """Start workers for the active goal and the next pending goals."""
+        active_goal = self.goal_engine.get_active_goal()
+        if (
+            active_goal is not None
+            and active_goal.id not in self._goal_workers
+            and active_goal.status in (GoalStatus.PENDING, GoalStatus.IN_PROGRESS)
+        ):
+            if active_goal.status == GoalStatus.PENDING:
+                self.goal_engine.update_goal_status(active_goal.id, GoalStatus.IN_PROGRESS)
+            self._start_goal_worker(active_goal.id)
+
+        while len(self._goal_workers) < self.max_concurrent_goals:
+            next_goal = self.goal_engine.get_next_goal()
+            if next_goal is None:
+                break
+            self.goal_engine.update_goal_status(next_goal.id, GoalStatus.IN_PROGRESS)
+            self._start_goal_worker(next_goal.id)
+
+    def _start_goal_worker(self, goal_id: str) -> None:
+        """Run a goal in its own task and wake the supervisor when it ends."""
+        self._goal_inboxes[goal_id] = []
+        self._goal_wakeups[goal_id] = asyncio.Event()
+        task = asyncio.create_task(self._run_goal(goal_id))
+        self._goal_workers[goal_id] = task
+
+        def _done(finished: asyncio.Task) -> None:
+            if self._goal_workers.get(goal_id) is finished:
+                del self._goal_workers[goal_id]
+                self._goal_inboxes.pop(goal_id, None)
+                self._goal_wakeups.pop(goal_id, None)
+            self.wake()
+
+        task.add_done_callback(_done)
+        logger.info(f"Started worker for goal {goal_id}")
+
+    async def _run_goal(self, goal_id: str) -> None:
+        """
+        Drive a single goal until it leaves the in-progress state.
+
+        Args:
+            goal_id: Goal to work on
+        """
+        while self.running and self.iteration_count < self.max_iterations:
+            goal = self.goal_engine.get_goal(goal_id)
+            if goal is None or goal.status != GoalStatus.IN_PROGRESS:
+                break
+
+            if not await self._acquire_iteration(goal.priority):
+                continue
+
+            loop_start = time.time()
+            iteration_success = True
+            plan = None
+
+            try:
+                self.iteration_count += 1
+                iteration = self.iteration_count
+
+                inbox = self._goal_inboxes.get(goal_id, [])
+                inputs = inbox[:]
+                inbox.clear()
+                with self._phase(LoopPhase.INTERPRETATION, goal_id):
+                    context = await self._interpret(
+                        {
+                            "timestamp": datetime.now(timezone.utc).isoformat(),
+                            "inputs": inputs,
+                            "active_goal": goal.to_dict(),
+                        }
+                    )
+
+                with self._phase(LoopPhase.PLANNING, goal_id):
+                    plan = cast(dict[str, Any] | None, await self.planner.create_plan(context))
+                    if plan:
+                        self._materialize_sub_goals(goal_id, plan)
+                if plan:
+                    self.metrics.record_decision_latency(time.time() - loop_start)
+                    with self._phase(LoopPhase.EXECUTION, goal_id):
+                        result = await self._execute(plan)
+
+                    task_success = result.get("success", False)
+                    self.metrics.record_task_result(task_success)
+                    self._update_task_success_rate(task_success)
+
+                    with self._phase(LoopPhase.REFLECTION, goal_id):
+                        await self._reflect(result, goal_id=goal_id, iteration=iteration)
+
+            except Exception as e:
+                logger.error(f"Error in goal worker {goal_id}: {e}", exc_info=True)
+                iteration_success = False
+                await asyncio.sleep(1)  # Prevent tight error loop
+
+            finally:
+                loop_duration = time.time() - loop_start
+                status = "success" if iteration_success else "error"
+                self.metrics.record_cognitive_loop(loop_duration, status)
+
+            if plan and self.scheduler_mode == SchedulerMode.EVENT:
+                await asyncio.sleep(0)
+            elif plan:
+                await asyncio.sleep(0.1)
+            elif self.scheduler_mode == SchedulerMode.EVENT:
+                # Nothing to do for this goal right now; park until it changes
+                await self._wait_for_goal_wakeup(goal_id)
+            else:
+                await asyncio.sleep(0.1)
+
+    async def _wait_for_goal_wakeup(self, goal_id: str) -> None:
+        """
+        Park a goal worker until its goal changes or new inputs arrive.
+
+        Returns early if the inbox already holds inputs, and at the latest
+        after the idle wakeup interval.
+
+        Args:
+            goal_id: Goal the worker drives
+        """
+        if self._goal_inboxes.get(goal_id):
+            return
+        event = self._goal_wakeups.get(goal_id)
+        if event is None:
+            await asyncio.sleep(self.idle_wakeup_interval)
+            return
+
+        try:
+            await asyncio.wait_for(event.wait(), timeout=self.idle_wakeup_interval)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            event.clear()
+
+    async def _acquire_iteration(self, priority: int | None = None) -> bool:
+        """
+        Wait for the rate limiter to allow an iteration.
+
+        Without a pacer this is the limiter's own check, which sleeps through
+        a cooldown when the budget is exhausted. With a pacer a goal whose
+        priority is too low for the remaining budget gives way without taking
+        a token; otherwise the loop waits for the paced delay and then takes
+        a token without blocking.
+
+        Args:
+            priority: Priority of the goal the iteration is for, if any
+
+        Returns:
+            True if the iteration may run, False to re-check
+        """
+        if self.pacer is None:
+            if not await self.rate_limiter.check_iteration_limit():
+                # Rate limit exceeded, cooldown was applied
+                logger.info("Rate limit applied, continuing after cooldown")
+                return False
+            return True
+
+        yield_delay = self.pacer.yield_delay(priority)
+        if yield_delay > 0:
+            # Leave the scarce budget to higher priority goals, then re-check
+            await asyncio.sleep(yield_delay)
+            return False
+
+        delay = self.pacer.delay()
+        if delay > 0:
+            await asyncio.sleep(delay)
+            if not self.running:
+                return False
+        return self.rate_limiter.try_consume_iteration()
+
+    def _current_priority(self) -> int | None:
+        """Priority of the goal the next single-goal iteration works on, if any."""
+        goal = self.goal_engine.get_active_goal() or self.goal_engine.get_next_goal()
+        return goal.priority if goal is not None else None
+
+    def _phase(
+        self, phase: LoopPhase | str, goal_id: str | None = None
+    ) -> AbstractContextManager[Any]:
+        """
+        Instrument one loop phase.
+
+        Returns a shared no-op context when all instrumentation is disabled,
+        so the uninstrumented path costs a few attribute lookups.
+
+        Args:
+            phase: Phase being timed
+            goal_id: Goal the phase works on, if known
+        """
+        if not (self.phase_metrics_enabled or self.phase_tracing_enabled or self.profiler):
+            return _NO_INSTRUMENTATION
+        name = phase.value if isinstance(phase, LoopPhase) else phase
+        return self._timed_phase(name, goal_id)
+
+    @contextmanager
+    def _timed_phase(self, name: str, goal_id: str | None) -> Iterator[None]:
+        """Time a phase and report it to metrics, tracing and the profiler."""
+        span: AbstractContextManager[Any] = _NO_INSTRUMENTATION
+        if self.phase_tracing_enabled:
+            span = trace_operation(
+                f"cognitive_loop.{name}",
+                {"goal.id": goal_id} if goal_id else None,
+            )
+
+        start = time.perf_counter()
+        with span:
+            try:
+                yield
+            finally:
+                duration = time.perf_counter() - start
+                if self.phase_metrics_enabled:
+                    self.metrics.record_loop_phase(name, duration)
+                if self.profiler is not None:
+                    self.profiler.record_timing(f"cognitive_loop.{name}", duration)
+
+    async def _checkpoint_if_due(self) -> None:
+        """Save a checkpoint when one is due, otherwise flush aged action records."""
+        if self.should_checkpoint():
+            with self._phase("checkpoint"):
+                await self.drain_reflections()
+                await self.action_log.flush()
+                await self._evict_finished_goals()
+                await self.save_checkpoint()
+        else:
+            await self.action_log.flush_due()
+            await self._evict_finished_goals()
+
+    async def _evict_finished_goals(self) -> None:
+        """Flush and drop the action log state of goals that finished."""
+        if not self._finished_goal_ids:
+            return
+        finished, self._finished_goal_ids = self._finished_goal_ids, set()
+        for goal_id in finished:
+            # Skip goals whose reflection writes are still in flight
+            if goal_id in self._reflection_tails or goal_id in self._goal_workers:
+                self._finished_goal_ids.add(goal_id)
+                continue
+            await self.action_log.evict(goal_id)
+
     async def _perceive(self) -> dict[str, Any]:
         """
         Perception phase: Gather inputs.
@@ -228,13 +630,16 @@ class CognitiveLoop:
         }
 
         # Collect all available perceptions (non-blocking)
-        while not self.perception_queue.empty():
+        while True:
             try:
-                data = await asyncio.wait_for(self.perception_queue.get(), timeout=0.1)
-                inputs.append(data)
-            except asyncio.TimeoutError:
+                inputs.append(self.perception_queue.get_nowait())
+            except asyncio.QueueEmpty:
                 break
 
+        # In multi-goal mode each worker perceives its own goal
+        if self.max_concurrent_goals > 1:
+            return perception
+
         # Get current active goal
         active_goal_obj = self.goal_engine.get_active_goal()
         if active_goal_obj:
@@ -243,6 +648,36 @@ class CognitiveLoop:
 
         return perception
 
+    def _is_idle(self) -> bool:
+        """
+        Check whether a single-goal iteration would have nothing to do.
+
+        Returns:
+            True if there are no perceptions, no active goal and no pending goals
+        """
+        return (
+            self.perception_queue.empty()
+            and self.goal_engine.get_active_goal() is None
+            and not self.goal_engine.has_pending_goals()
+        )
+
+    async def _wait_for_wakeup(self) -> None:
+        """
+        Park the loop until there is something to do.
+
+        Returns when a perception arrives, the goal engine reports a change,
+        the loop is stopped, or the idle wakeup timer expires.
+        """
+        if not self.perception_queue.empty():
+            return
+
+        try:
+            await asyncio.wait_for(self._wakeup.wait(), timeout=self.idle_wakeup_interval)
+        except asyncio.TimeoutError:
+            pass
+        finally:
+            self._wakeup.clear()
+
     async def _interpret(self, perception: dict[str, Any]) -> dict[str, Any]:
         """
         Interpretation phase: Understand what the perception means.
@@ -263,10 +698,16 @@ class CognitiveLoop:
         # Load relevant memory context
         active_goal = perception.get("active_goal")
         if active_goal:
-            # Get recent actions for this goal
-            recent_actions = await self.memory.get(f"goal:{active_goal['id']}:actions")
+            # Only the last few actions go into the context; older ones are
+            # represented by the log's rolling summary
+            recent_actions = await self.action_log.tail(
+                active_goal["id"], limit=self.recent_actions_window
+            )
             if recent_actions:
                 context["memory_context"]["recent_actions"] = recent_actions
+                summary = await self.action_log.summary(active_goal["id"])
+                if summary["total"] > len(recent_actions):
+                    context["memory_context"]["actions_summary"] = summary
 
         # Process inputs
         for input_data in perception.get("inputs", []):
@@ -320,8 +761,30 @@ class CognitiveLoop:
 
         # Use planner to generate action plan
         plan = await self.planner.create_plan(context)
+        if plan and active_goal.get("id"):
+            self._materialize_sub_goals(active_goal["id"], plan)
         return cast(dict[str, Any] | None, plan)
 
+    def _materialize_sub_goals(self, goal_id: str, plan: dict[str, Any]) -> None:
+        """
+        Create the sub-goals of a plan that decomposed the goal.
+
+        Sub-goals are created once, with the plan's dependencies, so that
+        independent ones become ready for other goal workers right away.
+
+        Args:
+            goal_id: Goal the plan was made for
+            plan: Plan, possibly carrying ``sub_goal_specs`` and ``dependencies``
+        """
+        specs = plan.get("sub_goal_specs")
+        goal = self.goal_engine.get_goal(goal_id)
+        if not specs or goal is None or goal.sub_goals:
+            return
+
+        results = self.goal_engine.create_sub_goals(goal_id, specs, plan.get("dependencies", []))
+        created = sum(1 for item in results if "id" in item)
+        logger.info(f"Created {created} sub-goals for goal {goal_id}")
+
     async def _execute(self, plan: dict[str, Any]) -> dict[str, Any]:
         """
         Execution phase: Execute the plan.
@@ -352,47 +815,134 @@ class CognitiveLoop:
 
         return result
 
-    async def _reflect(self, result: dict[str, Any]) -> None:
+    async def _reflect(
+        self,
+        result: dict[str, Any],
+        goal_id: str | None = None,
+        iteration: int | None = None,
+    ) -> None:
         """
         Reflection phase: Evaluate results and update memory.
 
+        Goal completion is evaluated synchronously so the next planning phase
+        sees the updated goal state. The action record is buffered in the
+        goal's action log right away; in pipelined mode the memory writes run
+        in the background, ordered per goal and bounded by ``pipeline_depth``.
+
         Args:
             result: Execution result
+            goal_id: Goal the result belongs to (defaults to the active goal)
+            iteration: Iteration the result belongs to (defaults to the current one)
         """
         # Evaluate result
         success = result.get("success", False)
+        if iteration is None:
+            iteration = self.iteration_count
+
+        if goal_id:
+            active_goal = self.goal_engine.get_goal(goal_id)
+        else:
+            active_goal = self.goal_engine.get_active_goal()
+            goal_id = active_goal.id if active_goal else None
+
+        if goal_id:
+            self.action_log.append(
+                goal_id,
+                {
+                    "iteration": iteration,
+                    "result": result,
+                    "timestamp": datetime.now(timezone.utc).isoformat(),
+                },
+            )
+
+        if self.pipeline_enabled:
+            await self._submit_reflection(iteration, result, goal_id)
+        else:
+            await self._persist_reflection(iteration, result, goal_id)
+
+        # Check if goal is completed
+        if active_goal and success and self.goal_engine.check_goal_completion(active_goal.id):
+            self.goal_engine.update_goal_status(active_goal.id, GoalStatus.COMPLETED)
+            logger.info(f"Goal completed: {active_goal.id}")
+
+        # Log reflection
+        logger.debug(f"Reflection - Success: {success}, Iteration: {iteration}")
 
-        # Update memory
+    async def _persist_reflection(
+        self,
+        iteration: int,
+        result: dict[str, Any],
+        goal_id: str | None,
+    ) -> None:
+        """
+        Write the reflection of one iteration to memory.
+
+        Args:
+            iteration: Iteration the result belongs to
+            result: Execution result
+            goal_id: Goal the result belongs to, if any
+        """
         await self.memory.save_short_term(
-            f"last_action:{self.iteration_count}",
+            f"last_action:{iteration}",
             result,
             ttl=3600,
         )
 
-        # Check goal progress
-        active_goal = self.goal_engine.get_active_goal()
-        if active_goal:
-            # Store action in goal history
-            goal_actions = await self.memory.get(f"goal:{active_goal.id}:actions") or []
-            goal_actions.append(
-                {
-                    "iteration": self.iteration_count,
-                    "result": result,
-                    "timestamp": datetime.now(timezone.utc).isoformat(),
-                }
-            )
-            await self.memory.save_medium_term(
-                f"goal:{active_goal.id}:actions",
-                goal_actions,
-            )
+        if goal_id:
+            # Write the goal history once a batch is full or old enough
+            await self.action_log.flush_due(goal_id)
+
+    async def _submit_reflection(
+        self,
+        iteration: int,
+        result: dict[str, Any],
+        goal_id: str | None,
+    ) -> None:
+        """
+        Schedule reflection persistence in the background.
 
-            # Check if goal is completed
-            if success and self.goal_engine.check_goal_completion(active_goal.id):
-                self.goal_engine.update_goal_status(active_goal.id, GoalStatus.COMPLETED)
-                logger.info(f"Goal completed: {active_goal.id}")
+        Blocks while ``pipeline_depth`` writes are already in flight. Writes
+        for the same goal are chained so they land in iteration order. The
+        persistence coroutine is only created once a slot is held, so a
+        cancelled wait leaves nothing behind.
 
-        # Log reflection
-        logger.debug(f"Reflection - Success: {success}, Iteration: {self.iteration_count}")
+        Args:
+            iteration: Iteration the result belongs to
+            result: Execution result
+            goal_id: Goal the write belongs to
+        """
+        await self._pipeline_slots.acquire()
+
+        previous = self._reflection_tails.get(goal_id)
+        persist = self._persist_reflection(iteration, result, goal_id)
+        task = asyncio.create_task(self._run_reflection(previous, persist))
+        self._reflection_tails[goal_id] = task
+        self._inflight_reflections.add(task)
+
+        def _done(finished: asyncio.Task) -> None:
+            self._inflight_reflections.discard(finished)
+            if self._reflection_tails.get(goal_id) is finished:
+                del self._reflection_tails[goal_id]
+
+        task.add_done_callback(_done)
+
+    async def _run_reflection(
+        self, previous: asyncio.Task | None, persist: Coroutine[Any, Any, None]
+    ) -> None:
+        """Run one background reflection write after its predecessor."""
+        try:
+            if previous is not None:
+                await asyncio.wait({previous})
+            await persist
+        except Exception as e:
+            logger.error(f"Reflection persistence failed: {e}", exc_info=True)
+        finally:
+            self._pipeline_slots.release()
+
+    async def drain_reflections(self) -> None:
+        """Wait for all in-flight reflection writes to finish."""
+        if self._inflight_reflections:
+            await asyncio.wait(set(self._inflight_reflections))
 
     def _update_task_success_rate(self, success: bool) -> None:
         """
@@ -427,47 +977,133 @@ class CognitiveLoop:
             "state": self.state.value,
             "current_phase": self.current_phase.value,
             "start_time": self.start_time,
-            "task_results": self.task_results,
+            "task_results": list(self.task_results),
             "last_checkpoint_iteration": self.last_checkpoint_iteration,
             "active_goal_id": self.goal_engine.active_goal_id if hasattr(self.goal_engine, "active_goal_id") else None,
+            "perception_backlog": self._peek_perceptions(),
             "timestamp": datetime.now(timezone.utc).isoformat(),
         }
 
-    async def save_checkpoint(self) -> None:
+    def _collect_goal_changes(self, full: bool) -> tuple[dict[str, Any], list[str]]:
         """
-        Save current state to checkpoint file.
-        
-        Saves both JSON (metadata) and pickle (full state) formats.
+        Serialize goals for a checkpoint frame.
+
+        Goals that left the engine since the previous frame (archived goals
+        emit no change events) are reported as removed.
+
+        Args:
+            full: Include the whole goal graph instead of only changed goals
+
+        Returns:
+            Tuple of (goal dictionaries keyed by goal ID, removed goal IDs)
+        """
+        dirty, self._dirty_goal_ids = self._dirty_goal_ids, set()
+        all_goals = self.goal_engine.get_all_goals()
+        previous_ids = self._checkpoint_goal_ids
+        self._checkpoint_goal_ids = {goal.id for goal in all_goals}
+        if full:
+            return {goal.id: goal.to_dict() for goal in all_goals}, []
+
+        goals: dict[str, Any] = {}
+        for goal_id in dirty:
+            goal = self.goal_engine.get_goal(goal_id)
+            if goal is not None:
+                goals[goal_id] = goal.to_dict()
+        return goals, sorted(previous_ids - self._checkpoint_goal_ids)
+
+    def _peek_perceptions(self) -> list[Any]:
+        """Copy the perception backlog without consuming it."""
+        backlog: list[Any] = []
+        while True:
+            try:
+                backlog.append(self.perception_queue.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        for item in backlog:
+            self.perception_queue.put_nowait(item)
+        return backlog
+
+    async def save_checkpoint(self, full: bool = False) -> None:
+        """
+        Save current state to the checkpoint store.
+
+        A snapshot holds the loop state (including the perception backlog),
+        the whole goal graph and the recent action tail of every unfinished
+        goal the action log holds. The first checkpoint, every
+        ``checkpoint_full_interval``-th one and any checkpoint with ``full``
+        set write a full snapshot. Others append a delta with the loop state
+        keys, goals and action tails that changed since the previous
+        checkpoint, and the goals that were removed or archived since then.
+        Encoding and file I/O run in a worker thread so the event loop keeps
+        iterating.
+
+        Args:
+            full: Force a full snapshot
         """
         if not self.checkpoint_enabled:
             return
 
-        try:
-            # Ensure checkpoint directory exists
-            self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
-            
-            checkpoint_state = self._get_checkpoint_state()
-            
-            # Save as JSON for readability
-            json_path = self.checkpoint_dir / "checkpoint.json"
-            with open(json_path, "w") as f:
-                json.dump(checkpoint_state, f, indent=2)
-            
-            # Save full state with pickle for complete restoration
-            pickle_path = self.checkpoint_dir / "checkpoint.pkl"
-            with open(pickle_path, "wb") as f:
-                pickle.dump(checkpoint_state, f)
-            
-            self.last_checkpoint_iteration = self.iteration_count
-            logger.info(f"Checkpoint saved at iteration {self.iteration_count}")
-            
-        except Exception as e:
-            logger.error(f"Failed to save checkpoint: {e}", exc_info=True)
+        async with self._checkpoint_lock:
+            try:
+                store = CheckpointStore(self.checkpoint_dir)
+                state = self._get_checkpoint_state()
+                write_full = (
+                    full
+                    or self._checkpoint_base_id is None
+                    or self._deltas_since_full >= self.checkpoint_full_interval
+                )
+                goals, removed = self._collect_goal_changes(write_full)
+                touched = self.action_log.take_touched()
+                if write_full:
+                    # Only goals that can still run need their recent actions
+                    touched = self.action_log.goal_ids() & {
+                        goal.id
+                        for goal in self.goal_engine.get_all_goals()
+                        if goal.status not in (GoalStatus.COMPLETED, GoalStatus.FAILED)
+                    }
+                tails = await self.action_log.export_tails(touched)
+
+                if write_full:
+                    base_id = time.time_ns()
+                    await asyncio.to_thread(
+                        store.write_full,
+                        base_id,
+                        {**state, "goals": goals, "action_tails": tails},
+                    )
+                    self._checkpoint_base_id = base_id
+                    self._deltas_since_full = 0
+                else:
+                    changed = {
+                        key: value
+                        for key, value in state.items()
+                        if self._checkpoint_last_state.get(key) != value
+                    }
+                    await asyncio.to_thread(
+                        store.append_delta,
+                        cast(int, self._checkpoint_base_id),
+                        {
+                            "state": changed,
+                            "goals": goals,
+                            "removed": removed,
+                            "action_tails": tails,
+                        },
+                    )
+                    self._deltas_since_full += 1
+
+                self._checkpoint_last_state = state
+                self.last_checkpoint_iteration = self.iteration_count
+                kind = "full" if write_full else "delta"
+                logger.info(f"Checkpoint ({kind}) saved at iteration {self.iteration_count}")
+
+            except Exception as e:
+                # Force a full snapshot next time so no delta is lost
+                self._checkpoint_base_id = None
+                logger.error(f"Failed to save checkpoint: {e}", exc_info=True)
 
     async def load_checkpoint(self) -> bool:
         """
-        Load state from checkpoint file.
-        
+        Load state from the checkpoint store.
+
         Returns:
             True if checkpoint was loaded successfully, False otherwise
         """
@@ -475,31 +1111,41 @@ class CognitiveLoop:
             return False
 
         try:
-            # Try to load from pickle first (more complete)
-            pickle_path = self.checkpoint_dir / "checkpoint.pkl"
-            if pickle_path.exists():
-                with open(pickle_path, "rb") as f:
-                    checkpoint_state = pickle.load(f)
-                
-                # Restore state
-                self.iteration_count = checkpoint_state.get("iteration_count", 0)
-                self.state = CognitiveState(checkpoint_state.get("state", "idle"))
-                self.current_phase = LoopPhase(checkpoint_state.get("current_phase", "perception"))
-                self.start_time = checkpoint_state.get("start_time")
-                self.task_results = checkpoint_state.get("task_results", [])
-                self.last_checkpoint_iteration = checkpoint_state.get("last_checkpoint_iteration", 0)
-                
-                # Restore active goal if available
-                active_goal_id = checkpoint_state.get("active_goal_id")
-                if active_goal_id and hasattr(self.goal_engine, "set_active_goal"):
-                    self.goal_engine.set_active_goal(active_goal_id)
-                
-                logger.info(f"Checkpoint loaded from iteration {self.iteration_count}")
-                return True
-                
+            loaded = await asyncio.to_thread(CheckpointStore(self.checkpoint_dir).load)
+            if loaded is None:
+                return False
+            _, checkpoint_state = loaded
+
+            # Restore state
+            self.iteration_count = checkpoint_state.get("iteration_count", 0)
+            self.state = CognitiveState(checkpoint_state.get("state", "idle"))
+            self.current_phase = LoopPhase(checkpoint_state.get("current_phase", "perception"))
+            self.start_time = checkpoint_state.get("start_time")
+            self.task_results = checkpoint_state.get("task_results", [])
+            self.last_checkpoint_iteration = checkpoint_state.get("last_checkpoint_iteration", 0)
+
+            # Restore the goal graph, then the active goal
+            goals = checkpoint_state.get("goals")
+            active_goal_id = checkpoint_state.get("active_goal_id")
+            if goals:
+                restored = self.goal_engine.restore_goals(goals.values(), active_goal_id)
+                logger.info(f"Restored {restored} goals from checkpoint")
+            elif active_goal_id and hasattr(self.goal_engine, "set_active_goal"):
+                self.goal_engine.set_active_goal(active_goal_id)
+
+            # Perceptions that were queued but not yet processed
+            for item in checkpoint_state.get("perception_backlog", []):
+                self.perception_queue.put_nowait(item)
+
+            # Recent actions, so interpretation does not have to hit memory
+            self.action_log.restore_tails(checkpoint_state.get("action_tails", {}))
+
+            logger.info(f"Checkpoint loaded from iteration {self.iteration_count}")
+            return True
+
         except Exception as e:
             logger.error(f"Failed to load checkpoint: {e}", exc_info=True)
-        
+
         return False
 
     def should_checkpoint(self) -> bool:
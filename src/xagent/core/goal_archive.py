@@ -0,0 +1,352 @@
+"""Compressed cold storage for finished goals.
+
+Long-running agents accumulate completed and failed goals. The goal engine
+moves old ones into a :class:`GoalArchive`, an append-only file of
+individually zlib-compressed records, and keeps only a goal id -> file
+offset map in memory. Archived goals stay available through a cold lookup
+by id, and each record header carries the goal's status, mode and parent
+so the engine's aggregate counters can be rebuilt without decompressing
+anything.
+
+Record layout (little endian)::
+
+    status:u8 mode:u8 id_len:u16 parent_len:u16 payload_len:u32
+    id  parent  zlib(goal JSON)
+
+A record with status 0xff and no parent or payload releases the goal: it
+went back to the engine and no longer counts as archived.
+"""
+
+import asyncio
+import json
+import os
+import struct
+import threading
+import zlib
+from collections.abc import Iterable, Iterator
+from dataclasses import dataclass, field
+from pathlib import Path
+
+from xagent.core.goal_engine import Goal, GoalMode, GoalStatus
+from xagent.utils.logging import get_logger
+
+try:
+    import fcntl
+except ImportError:  # pragma: no cover - not available on Windows
+    fcntl = None  # type: ignore[assignment]
+
+logger = get_logger(__name__)
+
+_HEADER = struct.Struct("<BBHHI")
+
+# Stable on-disk codes; never reorder
+_STATUS_CODES = {
+    GoalStatus.PENDING: 0,
+    GoalStatus.IN_PROGRESS: 1,
+    GoalStatus.COMPLETED: 2,
+    GoalStatus.FAILED: 3,
+    GoalStatus.PAUSED: 4,
+}
+_STATUS_FROM_CODE = {code: status for status, code in _STATUS_CODES.items()}
+_MODE_CODES = {GoalMode.GOAL_ORIENTED: 0, GoalMode.CONTINUOUS: 1}
+_MODE_FROM_CODE = {code: mode for mode, code in _MODE_CODES.items()}
+_RELEASED = 0xFF
+
+# (goal id, parent id, status, mode, goal JSON) captured for one record
+_Snapshot = tuple[str, str | None, GoalStatus, GoalMode, str]
+
+
+@dataclass
+class ArchiveSummary:
+    """Aggregate counts of an archive, read from record headers only."""
+
+    # (status, mode) -> number of archived goals
+    counts: dict[tuple[GoalStatus, GoalMode], int] = field(default_factory=dict)
+    # Live parent id -> [archived children, of which completed]
+    children: dict[str, list[int]] = field(default_factory=dict)
+    # Live parent id -> [completed, total] archived descendants
+    descendants: dict[str, list[int]] = field(default_factory=dict)
+
+
+class GoalArchive:
+    """
+    Append-only, compressed archive of goals with lookup by id.
+
+    The agent process that owns the goal engine is the only writer. Appends
+    still take an exclusive file lock (where available) so that a second
+    process cannot interleave records by mistake. Read-only handles pick up
+    new records on a lookup miss.
+    """
+
+    def __init__(self, path: str | Path, compression_level: int = 6) -> None:
+        """
+        Open or create an archive.
+
+        Args:
+            path: Archive file path; parent directories are created
+            compression_level: zlib level used for new records (1-9)
+        """
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.touch(exist_ok=True)
+        self.compression_level = compression_level
+        self._offsets: dict[str, int] = {}
+        self._end = 0
+        self._lock = threading.Lock()
+        with self._lock:
+            self._scan()
+
+    def __len__(self) -> int:
+        return len(self._offsets)
+
+    def __contains__(self, goal_id: object) -> bool:
+        return goal_id in self._offsets
+
+    def _iter_headers(
+        self, start: int = 0
+    ) -> Iterator[tuple[int, int, str, GoalStatus | None, GoalMode, str | None]]:
+        """
+        Read record headers from ``start`` up to the last complete record.
+
+        Yields:
+            (offset, next_offset, goal id, status, mode, parent id) tuples;
+            status is None for a release record
+        """
+        size = self.path.stat().st_size
+        with open(self.path, "rb") as f:
+            offset = start
+            f.seek(offset)
+            while offset + _HEADER.size <= size:
+                status, mode, id_len, parent_len, payload_len = _HEADER.unpack(
+                    f.read(_HEADER.size)
+                )
+                end = offset + _HEADER.size + id_len + parent_len + payload_len
+                if end > size:
+                    break
+                goal_id = f.read(id_len).decode("utf-8")
+                parent_id = f.read(parent_len).decode("utf-8") if parent_len else None
+                f.seek(payload_len, os.SEEK_CUR)
+                yield (
+                    offset,
+                    end,
+                    goal_id,
+                    None if status == _RELEASED else _STATUS_FROM_CODE[status],
+                    _MODE_FROM_CODE[mode],
+                    parent_id,
+                )
+                offset = end
+
+    def _scan(self) -> None:
+        """Index records appended since the last scan (caller holds the lock)."""
+        for offset, end, goal_id, status, *_ in self._iter_headers(self._end):
+            if status is None:
+                self._offsets.pop(goal_id, None)
+            else:
+                self._offsets[goal_id] = offset
+            self._end = end
+
+    def refresh(self) -> None:
+        """Index records appended by other processes."""
+        with self._lock:
+            self._scan()
+
+    @staticmethod
+    def _snapshot(goal: Goal) -> _Snapshot:
+        """Capture the fields a record is built from."""
+        return goal.id, goal.parent_id, goal.status, goal.mode, goal.to_json()
+
+    def _encode(self, snapshot: _Snapshot) -> bytes:
+        """Encode one goal snapshot as a record."""
+        goal_id, parent_id, status, mode, payload_json = snapshot
+        id_bytes = goal_id.encode("utf-8")
+        parent_bytes = parent_id.encode("utf-8") if parent_id else b""
+        payload = zlib.compress(payload_json.encode("utf-8"), self.compression_level)
+        header = _HEADER.pack(
+            _STATUS_CODES[status],
+            _MODE_CODES[mode],
+            len(id_bytes),
+            len(parent_bytes),
+            len(payload),
+        )
+        return b"".join((header, id_bytes, parent_bytes, payload))
+
+    def append(self, goals: Iterable[Goal]) -> int:
+        """
+        Write goals to the archive and make them durable.
+
+        Args:
+            goals: Goals to archive
+
+        Returns:
+            Number of goals written
+        """
+        return self._write([self._snapshot(goal) for goal in goals])
+
+    async def append_async(self, goals: Iterable[Goal]) -> int:
+        """
+        Like :meth:`append`, but compress and write in a worker thread.
+
+        Goals are snapshotted on the calling thread first, so later changes
+        to them do not reach the archive.
+
+        Args:
+            goals: Goals to archive
+
+        Returns:
+            Number of goals written
+        """
+        snapshots = [self._snapshot(goal) for goal in goals]
+        return await asyncio.to_thread(self._write, snapshots)
+
+    def release(self, goal_ids: Iterable[str]) -> int:
+        """
+        Mark archived goals as live again and make that durable.
+
+        Used for goals that changed while they were being archived, so the
+        engine keeps them. Lookups and summaries stop seeing their records.
+
+        Args:
+            goal_ids: IDs of goals to release
+
+        Returns:
+            Number of release records written
+        """
+        records = []
+        for goal_id in goal_ids:
+            id_bytes = goal_id.encode("utf-8")
+            header = _HEADER.pack(_RELEASED, 0, len(id_bytes), 0, 0)
+            records.append((goal_id, header + id_bytes))
+        return self._append(records, release=True)
+
+    async def release_async(self, goal_ids: Iterable[str]) -> int:
+        """Like :meth:`release`, but write in a worker thread."""
+        return await asyncio.to_thread(self.release, list(goal_ids))
+
+    def _write(self, snapshots: list[_Snapshot]) -> int:
+        """Encode snapshots and append them durably (blocking)."""
+        return self._append([(snapshot[0], self._encode(snapshot)) for snapshot in snapshots])
+
+    def _append(self, records: list[tuple[str, bytes]], release: bool = False) -> int:
+        """
+        Append encoded records durably and index them (blocking).
+
+        Args:
+            records: (goal id, record) pairs
+            release: Whether the records release their goals
+
+        Returns:
+            Number of records written
+        """
+        if not records:
+            return 0
+
+        with self._lock, open(self.path, "r+b") as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                self._scan()
+                # Drop a torn record left behind by an interrupted writer
+                f.truncate(self._end)
+                f.seek(self._end)
+                offset = self._end
+                offsets: dict[str, int] = {}
+                for goal_id, record in records:
+                    f.write(record)
+                    offsets[goal_id] = offset
+                    offset += len(record)
+                f.flush()
+                os.fsync(f.fileno())
+                # Publish offsets only once the records are readable
+                if release:
+                    for goal_id in offsets:
+                        self._offsets.pop(goal_id, None)
+                else:
+                    self._offsets.update(offsets)
+                self._end = offset
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(f, fcntl.LOCK_UN)
+
+        return len(records)
+
+    def get(self, goal_id: str) -> Goal | None:
+        """
+        Look up an archived goal.
+
+        Args:
+            goal_id: Goal ID
+
+        Returns:
+            The goal as it was when archived, or None if it is not archived
+        """
+        offset = self._offsets.get(goal_id)
+        if offset is None:
+            self.refresh()
+            offset = self._offsets.get(goal_id)
+            if offset is None:
+                return None
+
+        with open(self.path, "rb") as f:
+            f.seek(offset)
+            _, _, id_len, parent_len, payload_len = _HEADER.unpack(f.read(_HEADER.size))
+            f.seek(id_len + parent_len, os.SEEK_CUR)
+            payload = f.read(payload_len)
+        return Goal.from_dict(json.loads(zlib.decompress(payload)))
+
+    def iter_goals(self) -> Iterator[Goal]:
+        """Iterate over all archived goals in archive order."""
+        for goal_id in list(self._offsets):
+            goal = self.get(goal_id)
+            if goal is not None:
+                yield goal
+
+    def summarize(self) -> ArchiveSummary:
+        """
+        Aggregate the archive for the goal engine's counters.
+
+        Children and descendants are attributed to the nearest ancestor
+        that is not archived itself.
+
+        Returns:
+            Counts by status and mode, plus per live parent child and
+            descendant counts
+        """
+        summary = ArchiveSummary()
+        parents: dict[str, str | None] = {}
+        completed: dict[str, bool] = {}
+        keys: dict[str, tuple[GoalStatus, GoalMode]] = {}
+        for _, _, goal_id, status, mode, parent_id in self._iter_headers():
+            if status is None:
+                keys.pop(goal_id, None)
+                parents.pop(goal_id, None)
+                completed.pop(goal_id, None)
+                continue
+            # A goal archived again after a release counts once
+            keys[goal_id] = (status, mode)
+            parents[goal_id] = parent_id
+            completed[goal_id] = status == GoalStatus.COMPLETED
+        for key in keys.values():
+            summary.counts[key] = summary.counts.get(key, 0) + 1
+
+        for goal_id, parent_id in parents.items():
+            if parent_id is None:
+                continue
+            done = int(completed[goal_id])
+            if parent_id not in parents:
+                children = summary.children.setdefault(parent_id, [0, 0])
+                children[0] += 1
+                children[1] += done
+
+            # Count the goal for every ancestor up to the first live one
+            ancestor: str | None = parent_id
+            steps = 0
+            while ancestor is not None and steps <= len(parents):
+                if ancestor not in parents:
+                    descendants = summary.descendants.setdefault(ancestor, [0, 0])
+                    descendants[0] += done
+                    descendants[1] += 1
+                    break
+                ancestor = parents[ancestor]
+                steps += 1
+
+        return summary
@@ -1,10 +1,25 @@
 """Goal Engine - Purpose Core for X-Agent."""
 
+import base64
+import heapq
+import itertools
+import json
+import sys
 import uuid
-from dataclasses import dataclass, field
-from datetime import datetime, timezone
+from collections.abc import Callable, Collection, Iterable, Iterator
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from enum import Enum
-from typing import Any
+from typing import TYPE_CHECKING, Any
+
+from sortedcontainers import SortedList
+
+from xagent.utils.logging import get_logger
+
+if TYPE_CHECKING:
+    from xagent.core.goal_archive import GoalArchive
+
+logger = get_logger(__name__)
 
 
 class GoalMode(str, Enum):
@@ -33,46 +48,351 @@ class Priority(int, Enum):
     CRITICAL = 3
 
 
-@dataclass
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _to_epoch_us(value: datetime) -> int:
+    """Convert a datetime to integer microseconds since the epoch (naive means UTC)."""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def _from_epoch_us(value: int) -> datetime:
+    """Convert integer microseconds since the epoch to an aware UTC datetime."""
+    return _EPOCH + timedelta(microseconds=value)
+
+
+def _now_us() -> int:
+    """Current time in microseconds since the epoch."""
+    return _to_epoch_us(datetime.now(timezone.utc))
+
+
+# Public goal fields, in constructor and serialization order
+_GOAL_FIELD_ORDER = (
+    "id",
+    "description",
+    "mode",
+    "status",
+    "priority",
+    "parent_id",
+    "sub_goals",
+    "completion_criteria",
+    "created_at",
+    "updated_at",
+    "completed_at",
+    "metadata",
+    "depends_on",
+)
+_GOAL_FIELDS = frozenset(_GOAL_FIELD_ORDER)
+
+
 class Goal:
-    """Represents a goal or task."""
-
-    id: str = field(default_factory=lambda: f"goal_{str(uuid.uuid4())}")
-    description: str = ""
-    mode: GoalMode = GoalMode.GOAL_ORIENTED
-    status: GoalStatus = GoalStatus.PENDING
-    priority: int | Priority = 0
-    parent_id: str | None = None
-    sub_goals: list[str] = field(default_factory=list)
-    completion_criteria: list[str] = field(default_factory=list)
-    created_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
-    updated_at: datetime = field(default_factory=lambda: datetime.now(timezone.utc))
-    completed_at: datetime | None = None
-    metadata: dict[str, Any] = field(default_factory=dict)
-    
-    def __post_init__(self) -> None:
-        """Convert Priority enum to int if needed."""
-        if isinstance(self.priority, Priority):
-            self.priority = self.priority.value
+    """
+    Represents a goal or task.
+
+    Goals are kept resident in large numbers, so the representation is
+    compact: attributes live in ``__slots__``, timestamps are stored as
+    integer epoch microseconds (exposed as aware datetimes), ids are
+    interned, and mode/status are the shared enum members.
+
+    Assigning an attribute bumps ``version``, which invalidates the cached
+    timestamp strings used by :meth:`to_dict` and the cached :meth:`to_json`
+    form. In-place changes to ``sub_goals``, ``completion_criteria``,
+    ``metadata`` or ``depends_on`` must be followed by :meth:`touch`.
+    ``depends_on`` lists goals that must be completed before this one may
+    start; change it through :meth:`GoalEngine.add_dependency`.
+    """
+
+    __slots__ = (
+        "id",
+        "description",
+        "mode",
+        "status",
+        "priority",
+        "parent_id",
+        "sub_goals",
+        "completion_criteria",
+        "metadata",
+        "depends_on",
+        "_created_us",
+        "_updated_us",
+        "_completed_us",
+        "_version",
+        "_cache_version",
+        "_cache_times",
+        "_cache_json",
+    )
+
+    id: str
+    description: str
+    mode: GoalMode
+    status: GoalStatus
+    priority: int
+    parent_id: str | None
+    sub_goals: list[str]
+    completion_criteria: list[str]
+    metadata: dict[str, Any]
+    depends_on: list[str]
+
+    def __init__(
+        self,
+        id: str | None = None,
+        description: str = "",
+        mode: GoalMode = GoalMode.GOAL_ORIENTED,
+        status: GoalStatus = GoalStatus.PENDING,
+        priority: int | Priority = 0,
+        parent_id: str | None = None,
+        sub_goals: list[str] | None = None,
+        completion_criteria: list[str] | None = None,
+        created_at: datetime | None = None,
+        updated_at: datetime | None = None,
+        completed_at: datetime | None = None,
+        metadata: dict[str, Any] | None = None,
+        depends_on: list[str] | None = None,
+    ) -> None:
+        """Initialize a goal; omitted timestamps default to now."""
+        now = None if created_at and updated_at else _now_us()
+        init = object.__setattr__
+        init(self, "id", sys.intern(id) if id else f"goal_{str(uuid.uuid4())}")
+        init(self, "description", description)
+        init(self, "mode", GoalMode(mode))
+        init(self, "status", GoalStatus(status))
+        init(self, "priority", priority.value if isinstance(priority, Priority) else priority)
+        init(self, "parent_id", sys.intern(parent_id) if parent_id else parent_id)
+        init(self, "sub_goals", sub_goals if sub_goals is not None else [])
+        init(
+            self,
+            "completion_criteria",
+            completion_criteria if completion_criteria is not None else [],
+        )
+        init(self, "metadata", metadata if metadata is not None else {})
+        init(self, "depends_on", [sys.intern(d) for d in depends_on] if depends_on else [])
+        init(self, "_created_us", _to_epoch_us(created_at) if created_at else now)
+        init(self, "_updated_us", _to_epoch_us(updated_at) if updated_at else now)
+        init(self, "_completed_us", _to_epoch_us(completed_at) if completed_at else None)
+        init(self, "_version", 0)
+        init(self, "_cache_version", -1)
+        init(self, "_cache_times", None)
+        init(self, "_cache_json", None)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Set an attribute and invalidate cached serializations."""
+        if name == "priority" and isinstance(value, Priority):
+            value = value.value
+        object.__setattr__(self, name, value)
+        if name in _GOAL_FIELDS:
+            object.__setattr__(self, "_version", self._version + 1)
+
+    @property
+    def created_at(self) -> datetime:
+        """Creation time."""
+        return _from_epoch_us(self._created_us)
+
+    @created_at.setter
+    def created_at(self, value: datetime) -> None:
+        object.__setattr__(self, "_created_us", _to_epoch_us(value))
+        self.touch()
+
+    @property
+    def updated_at(self) -> datetime:
+        """Time of the last change."""
+        return _from_epoch_us(self._updated_us)
+
+    @updated_at.setter
+    def updated_at(self, value: datetime) -> None:
+        object.__setattr__(self, "_updated_us", _to_epoch_us(value))
+        self.touch()
+
+    @property
+    def completed_at(self) -> datetime | None:
+        """Completion time, if completed."""
+        return None if self._completed_us is None else _from_epoch_us(self._completed_us)
+
+    @completed_at.setter
+    def completed_at(self, value: datetime | None) -> None:
+        object.__setattr__(self, "_completed_us", None if value is None else _to_epoch_us(value))
+        self.touch()
+
+    @property
+    def created_us(self) -> int:
+        """Creation time in microseconds since the epoch."""
+        return self._created_us
+
+    @property
+    def updated_us(self) -> int:
+        """Time of the last change in microseconds since the epoch."""
+        return self._updated_us
+
+    @property
+    def version(self) -> int:
+        """Counter bumped on every change."""
+        return self._version
+
+    def touch(self) -> None:
+        """Record an in-place change so cached serializations are rebuilt."""
+        object.__setattr__(self, "_version", self._version + 1)
+
+    def _times(self) -> tuple[str, str, str | None]:
+        """Return the ISO timestamp strings, cached per version."""
+        if self._cache_version != self._version or self._cache_times is None:
+            completed = self.completed_at
+            object.__setattr__(
+                self,
+                "_cache_times",
+                (
+                    self.created_at.isoformat(),
+                    self.updated_at.isoformat(),
+                    completed.isoformat() if completed else None,
+                ),
+            )
+            object.__setattr__(self, "_cache_json", None)
+            object.__setattr__(self, "_cache_version", self._version)
+        return self._cache_times  # type: ignore[return-value]
 
     def to_dict(self) -> dict[str, Any]:
         """Convert goal to dictionary."""
-        priority_value = self.priority.value if isinstance(self.priority, Priority) else self.priority
+        created_at, updated_at, completed_at = self._times()
         return {
             "id": self.id,
             "description": self.description,
             "mode": self.mode.value,
             "status": self.status.value,
-            "priority": priority_value,
+            "priority": self.priority,
             "parent_id": self.parent_id,
-            "sub_goals": self.sub_goals,
-            "completion_criteria": self.completion_criteria,
-            "created_at": self.created_at.isoformat(),
-            "updated_at": self.updated_at.isoformat(),
-            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
-            "metadata": self.metadata,
+            "sub_goals": list(self.sub_goals),
+            "completion_criteria": list(self.completion_criteria),
+            "created_at": created_at,
+            "updated_at": updated_at,
+            "completed_at": completed_at,
+            "metadata": dict(self.metadata),
+            "depends_on": list(self.depends_on),
         }
 
+    def to_json(self) -> str:
+        """
+        Serialize the goal to compact JSON, cached until the next change.
+
+        Returns:
+            JSON string of :meth:`to_dict`
+        """
+        self._times()
+        if self._cache_json is None:
+            object.__setattr__(
+                self,
+                "_cache_json",
+                json.dumps(self.to_dict(), separators=(",", ":"), default=str),
+            )
+        return self._cache_json  # type: ignore[return-value]
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._astuple() == other._astuple()  # type: ignore[attr-defined]
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in _GOAL_FIELD_ORDER)
+        return f"Goal({fields})"
+
+    def _astuple(self) -> tuple[Any, ...]:
+        """Field values used for equality."""
+        return (
+            self.id,
+            self.description,
+            self.mode,
+            self.status,
+            self.priority,
+            self.parent_id,
+            self.sub_goals,
+            self.completion_criteria,
+            self._created_us,
+            self._updated_us,
+            self._completed_us,
+            self.metadata,
+            self.depends_on,
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "Goal":
+        """
+        Create a goal from the output of :meth:`to_dict`.
+
+        Args:
+            data: Goal dictionary
+
+        Returns:
+            Goal instance
+        """
+        completed_at = data.get("completed_at")
+        return cls(
+            id=data["id"],
+            description=data.get("description", ""),
+            mode=GoalMode(data.get("mode", GoalMode.GOAL_ORIENTED.value)),
+            status=GoalStatus(data.get("status", GoalStatus.PENDING.value)),
+            priority=data.get("priority", 0),
+            parent_id=data.get("parent_id"),
+            sub_goals=list(data.get("sub_goals", [])),
+            completion_criteria=list(data.get("completion_criteria", [])),
+            created_at=datetime.fromisoformat(data["created_at"]),
+            updated_at=datetime.fromisoformat(data["updated_at"]),
+            completed_at=datetime.fromisoformat(completed_at) if completed_at else None,
+            metadata=dict(data.get("metadata") or {}),
+            depends_on=list(data.get("depends_on") or []),
+        )
+
+
+# Listener signature: (event, goal) where event is "created", "status",
+# "priority" or "dependencies"
+GoalChangeListener = Callable[[str, Goal], None]
+
+# Fields goals can be sorted by in query_goals
+GOAL_SORT_FIELDS = ("created_at", "updated_at", "priority", "status")
+
+
+def _goal_sort_keys(goal: Goal) -> dict[str, tuple[Any, ...]]:
+    """Build the keys a goal is filed under in each sorted index."""
+    created = goal.created_us
+    return {
+        "created_at": (created, goal.id),
+        "updated_at": (goal.updated_us, goal.id),
+        "priority": (int(goal.priority), created, goal.id),
+        "status": (goal.status.value, created, goal.id),
+    }
+
+
+def _encode_cursor(sort_by: str, descending: bool, key: tuple[Any, ...]) -> str:
+    """Encode a keyset position as an opaque cursor."""
+    raw = json.dumps([sort_by, descending, list(key)], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+
+def _decode_cursor(cursor: str, sort_by: str, descending: bool) -> tuple[Any, ...]:
+    """
+    Decode a cursor produced by :func:`_encode_cursor`.
+
+    Raises:
+        ValueError: If the cursor is malformed or belongs to another ordering
+    """
+    try:
+        cursor_sort, cursor_desc, key = json.loads(base64.urlsafe_b64decode(cursor.encode("ascii")))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Invalid cursor") from e
+    if cursor_sort != sort_by or cursor_desc != descending or not isinstance(key, list):
+        raise ValueError("Cursor does not match the requested ordering")
+    return tuple(key)
+
+
+@dataclass
+class GoalPage:
+    """One page of a goal query."""
+
+    goals: list[Goal]
+    total: int
+    next_cursor: str | None = None
+
 
 class GoalEngine:
     """
@@ -83,10 +403,257 @@ class GoalEngine:
     - Continuous: Works indefinitely, reacting to events
     """
 
-    def __init__(self) -> None:
-        """Initialize goal engine."""
+    def __init__(self, archive: "GoalArchive | None" = None) -> None:
+        """
+        Initialize goal engine.
+
+        Args:
+            archive: Cold storage for finished goals; enables
+                :meth:`archive_completed_goals` and archived lookups
+        """
         self.goals: dict[str, Goal] = {}
         self.active_goal_id: str | None = None
+        self._listeners: list[GoalChangeListener] = []
+        # Pending goals: a heap of (-priority, created, seq, goal id) entries
+        # with lazy invalidation. _pending_ids maps each pending goal to the
+        # seq of its live heap entry; any other entry for it is stale.
+        self._pending_heap: list[tuple[int, int, int, str]] = []
+        self._pending_ids: dict[str, int] = {}
+        self._pending_seq = itertools.count()
+        # Secondary indexes: attribute value -> ordered set of goal ids. The
+        # keys each goal is filed under are remembered so a goal can be moved
+        # even after its attributes were changed.
+        self._by_status: dict[GoalStatus, dict[str, None]] = {}
+        self._by_mode: dict[GoalMode, dict[str, None]] = {}
+        self._by_priority: dict[int, dict[str, None]] = {}
+        self._by_parent: dict[str, dict[str, None]] = {}
+        self._index_keys: dict[str, tuple[GoalStatus, GoalMode, int, str | None]] = {}
+        # Sorted indexes for keyset pagination: field -> sorted keys, where
+        # the last element of each key is the goal id. SortedList keeps
+        # inserts and removals logarithmic on the goal-update hot path.
+        self._sorted: dict[str, SortedList] = {name: SortedList() for name in GOAL_SORT_FIELDS}
+        # Keys of bulk-indexed goals, added by _finish_bulk_index
+        self._bulk_sorted: dict[str, list[tuple[Any, ...]]] = {
+            name: [] for name in GOAL_SORT_FIELDS
+        }
+        self._sort_keys: dict[str, dict[str, tuple[Any, ...]]] = {}
+        # Completion counters: completed direct children per parent, and
+        # [completed, total] descendants per goal, kept up to date on every
+        # status or parent change
+        self._completed_children: dict[str, int] = {}
+        self._subtree_counts: dict[str, list[int]] = {}
+        # Dependencies: goal -> goals waiting for it, and the number of
+        # prerequisites not yet completed per blocked goal. Blocked goals are
+        # kept out of the pending heap, so the heap is exactly the ready set.
+        self._dependents: dict[str, dict[str, None]] = {}
+        self._unmet: dict[str, int] = {}
+        # Archived goals: counts by (status, mode) and archived direct
+        # children per live parent. Archived goals stay in the completion
+        # counters of their live ancestors.
+        self.archive = archive
+        self._archived_counts: dict[tuple[GoalStatus, GoalMode], int] = {}
+        self._archived_children: dict[str, int] = {}
+        if archive is not None:
+            summary = archive.summarize()
+            self._archived_counts.update(summary.counts)
+            for parent_id, (children, completed) in summary.children.items():
+                self._archived_children[parent_id] = children
+                if completed:
+                    self._completed_children[parent_id] = completed
+            for parent_id, counts in summary.descendants.items():
+                self._subtree_counts[parent_id] = list(counts)
+
+    def add_listener(self, listener: GoalChangeListener) -> None:
+        """
+        Register a callback invoked whenever a goal is created or changes status,
+        priority or dependencies.
+
+        Args:
+            listener: Callable receiving the event name and the affected goal
+        """
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+
+    def remove_listener(self, listener: GoalChangeListener) -> None:
+        """Unregister a previously added change listener."""
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+
+    def _index_goal(self, goal: Goal, bulk: bool = False) -> None:
+        """
+        Keep the secondary indexes and the pending heap in sync with a goal.
+
+        Args:
+            goal: Goal to (re)index
+            bulk: Append new goals to the sorted indexes and the heap without
+                restoring their order; :meth:`_finish_bulk_index` must run
+                before the engine is queried again
+        """
+        keys = (goal.status, goal.mode, int(goal.priority), goal.parent_id)
+        old_keys = self._index_keys.get(goal.id)
+        if old_keys is None:
+            self._link_dependencies(goal)
+        if old_keys != keys:
+            if old_keys is not None:
+                self._unfile(goal.id, old_keys)
+                self._propagate_completion(goal.id, old_keys[3], old_keys[0], -1)
+            self._propagate_completion(goal.id, keys[3], keys[0], 1)
+            self._index_keys[goal.id] = keys
+            self._by_status.setdefault(keys[0], {})[goal.id] = None
+            self._by_mode.setdefault(keys[1], {})[goal.id] = None
+            self._by_priority.setdefault(keys[2], {})[goal.id] = None
+            if keys[3] is not None:
+                self._by_parent.setdefault(keys[3], {})[goal.id] = None
+
+        sort_keys = _goal_sort_keys(goal)
+        old_sort_keys = self._sort_keys.get(goal.id, {})
+        for name, key in sort_keys.items():
+            old_key = old_sort_keys.get(name)
+            if old_key == key:
+                continue
+            if bulk and old_key is None:
+                self._bulk_sorted[name].append(key)
+                continue
+            ordered = self._sorted[name]
+            if old_key is not None:
+                ordered.discard(old_key)
+            ordered.add(key)
+        self._sort_keys[goal.id] = sort_keys
+
+        was_done = old_keys is not None and old_keys[0] == GoalStatus.COMPLETED
+        is_done = keys[0] == GoalStatus.COMPLETED
+        if was_done != is_done and goal.id in self._dependents:
+            self._settle_dependents(goal.id, -1 if is_done else 1, bulk)
+
+        if goal.status == GoalStatus.PENDING:
+            if goal.id not in self._pending_ids and not self._unmet.get(goal.id):
+                self._push_pending(goal, bulk)
+        else:
+            # The heap entry is left behind and skipped when it surfaces
+            self._pending_ids.pop(goal.id, None)
+
+    def _link_dependencies(self, goal: Goal) -> None:
+        """Register a newly indexed goal's prerequisites."""
+        for prerequisite in goal.depends_on:
+            self._dependents.setdefault(prerequisite, {})[goal.id] = None
+            prerequisite_keys = self._index_keys.get(prerequisite)
+            # Unknown prerequisites count as unmet until they are indexed
+            if prerequisite_keys is None or prerequisite_keys[0] != GoalStatus.COMPLETED:
+                self._unmet[goal.id] = self._unmet.get(goal.id, 0) + 1
+
+    def _settle_dependents(self, goal_id: str, delta: int, bulk: bool = False) -> None:
+        """
+        Adjust the unmet counts of a goal's dependents after it was completed
+        (``delta=-1``) or left the completed state (``delta=1``).
+        """
+        for dependent_id in self._dependents.get(goal_id, ()):
+            unmet = self._unmet.get(dependent_id, 0) + delta
+            if unmet > 0:
+                self._unmet[dependent_id] = unmet
+            else:
+                self._unmet.pop(dependent_id, None)
+
+            dependent = self.goals.get(dependent_id)
+            if (
+                dependent is None
+                or dependent.status != GoalStatus.PENDING
+                or dependent_id not in self._index_keys
+            ):
+                continue
+            if unmet > 0:
+                # Blocked again; its heap entry becomes stale
+                self._pending_ids.pop(dependent_id, None)
+            elif dependent_id not in self._pending_ids:
+                self._push_pending(dependent, bulk)
+
+    def _propagate_completion(
+        self, goal_id: str, parent_id: str | None, status: GoalStatus, sign: int
+    ) -> None:
+        """
+        Add (``sign=1``) or remove (``sign=-1``) a goal's completion counts.
+
+        The goal and its descendants are counted towards its parent's
+        children and towards the descendant counters of every ancestor,
+        following the parents the ancestors are indexed under.
+        """
+        if parent_id is None:
+            return
+
+        done = int(status == GoalStatus.COMPLETED)
+        if done:
+            remaining = self._completed_children.get(parent_id, 0) + sign
+            if remaining:
+                self._completed_children[parent_id] = remaining
+            else:
+                self._completed_children.pop(parent_id, None)
+
+        sub_completed, sub_total = self._subtree_counts.get(goal_id, (0, 0))
+        completed = sign * (done + sub_completed)
+        total = sign * (1 + sub_total)
+
+        ancestor: str | None = parent_id
+        steps = 0
+        while ancestor is not None and steps <= len(self.goals):
+            counts = self._subtree_counts.setdefault(ancestor, [0, 0])
+            counts[0] += completed
+            counts[1] += total
+            if counts[1] == 0:
+                del self._subtree_counts[ancestor]
+            ancestor_keys = self._index_keys.get(ancestor)
+            ancestor = ancestor_keys[3] if ancestor_keys else None
+            steps += 1
+
+    def _unfile(self, goal_id: str, keys: tuple[GoalStatus, GoalMode, int, str | None]) -> None:
+        """Remove a goal id from the secondary index entries given by ``keys``."""
+        indexes: tuple[dict[Any, dict[str, None]], ...] = (
+            self._by_status,
+            self._by_mode,
+            self._by_priority,
+            self._by_parent,
+        )
+        for index, key in zip(indexes, keys):
+            bucket = index.get(key)
+            if bucket is not None:
+                bucket.pop(goal_id, None)
+                if not bucket:
+                    del index[key]
+
+    def _push_pending(self, goal: Goal, bulk: bool = False) -> None:
+        """Add a live heap entry for a pending goal."""
+        seq = next(self._pending_seq)
+        self._pending_ids[goal.id] = seq
+        entry = (-int(goal.priority), goal.created_us, seq, goal.id)
+        if bulk:
+            self._pending_heap.append(entry)
+            return
+        heapq.heappush(self._pending_heap, entry)
+
+        # Rebuild once stale entries dominate the heap
+        if len(self._pending_heap) > 2 * len(self._pending_ids) + 64:
+            self._pending_heap = [
+                entry for entry in self._pending_heap if self._pending_ids.get(entry[3]) == entry[2]
+            ]
+            heapq.heapify(self._pending_heap)
+
+    def _finish_bulk_index(self) -> None:
+        """Restore index order after goals were indexed with ``bulk=True``."""
+        for name, keys in self._bulk_sorted.items():
+            if keys:
+                # One bulk update sorts the new keys once
+                self._sorted[name].update(keys)
+                keys.clear()
+        self._pending_heap = [
+            entry for entry in self._pending_heap if self._pending_ids.get(entry[3]) == entry[2]
+        ]
+        heapq.heapify(self._pending_heap)
+
+    def _notify(self, event: str, goal: Goal) -> None:
+        """Dispatch a goal change to all listeners."""
+        for listener in list(self._listeners):
+            try:
+                listener(event, goal)
+            except Exception as e:
+                logger.error(f"Goal change listener failed: {e}")
 
     def create_goal(
         self,
@@ -96,6 +663,7 @@ class GoalEngine:
         parent_id: str | None = None,
         completion_criteria: list[str] | None = None,
         metadata: dict[str, Any] | None = None,
+        depends_on: list[str] | None = None,
     ) -> Goal:
         """
         Create a new goal.
@@ -107,10 +675,19 @@ class GoalEngine:
             parent_id: Parent goal ID for sub-goals
             completion_criteria: List of criteria for goal completion
             metadata: Additional metadata
+            depends_on: IDs of goals that must be completed before this one
+                is handed out by :meth:`get_next_goal`
 
         Returns:
             Created goal
+
+        Raises:
+            ValueError: If a goal in ``depends_on`` does not exist
         """
+        for prerequisite in depends_on or ():
+            if prerequisite not in self.goals:
+                raise ValueError(f"Unknown goal: {prerequisite}")
+
         goal = Goal(
             description=description,
             mode=mode,
@@ -118,14 +695,18 @@ class GoalEngine:
             parent_id=parent_id,
             completion_criteria=completion_criteria or [],
             metadata=metadata or {},
+            depends_on=list(dict.fromkeys(depends_on or ())),
         )
 
         self.goals[goal.id] = goal
+        self._index_goal(goal)
 
         # Add to parent's sub-goals if parent exists
         if parent_id and parent_id in self.goals:
             self.goals[parent_id].sub_goals.append(goal.id)
+            self.goals[parent_id].touch()
 
+        self._notify("created", goal)
         return goal
 
     def add_goal(self, goal: Goal) -> Goal:
@@ -139,14 +720,169 @@ class GoalEngine:
             The added goal
         """
         self.goals[goal.id] = goal
+        self._index_goal(goal)
         
         # Add to parent's sub-goals if parent exists
         if goal.parent_id and goal.parent_id in self.goals:
             if goal.id not in self.goals[goal.parent_id].sub_goals:
                 self.goals[goal.parent_id].sub_goals.append(goal.id)
-        
+                self.goals[goal.parent_id].touch()
+
+        self._notify("created", goal)
         return goal
     
+    def create_goals_bulk(self, specs: Iterable[dict[str, Any]]) -> list[dict[str, Any]]:
+        """
+        Create many goals, including parent/child trees, in one call.
+
+        Each spec takes the :meth:`create_goal` arguments as keys
+        (``description`` is required). Trees are built with client-side
+        references: a spec may carry a ``ref`` and later specs point at it
+        with ``parent_ref`` instead of ``parent_id``, and with
+        ``depends_on_refs`` in addition to ``depends_on``. The sorted indexes and
+        the pending heap are rebuilt once for the whole batch instead of
+        once per goal. An invalid spec is reported in its result and does
+        not affect the other specs; children of a failed spec fail as well.
+
+        Args:
+            specs: Goal specifications
+
+        Returns:
+            One result per spec, in order: ``{"index", "ref", "id"}`` for a
+            created goal or ``{"index", "ref", "error"}`` for a rejected one
+        """
+        results: list[dict[str, Any]] = []
+        created: list[Goal] = []
+        refs: dict[str, str] = {}
+
+        try:
+            for index, spec in enumerate(specs):
+                ref = spec.get("ref")
+                result: dict[str, Any] = {"index": index, "ref": ref}
+                try:
+                    goal = self._goal_from_spec(spec, refs)
+                except (KeyError, TypeError, ValueError) as e:
+                    result["error"] = str(e.args[0]) if e.args else type(e).__name__
+                    results.append(result)
+                    continue
+
+                self.goals[goal.id] = goal
+                self._index_goal(goal, bulk=True)
+                parent = self.goals.get(goal.parent_id) if goal.parent_id else None
+                if parent is not None:
+                    parent.sub_goals.append(goal.id)
+                    parent.touch()
+                if ref is not None:
+                    refs[ref] = goal.id
+
+                created.append(goal)
+                result["id"] = goal.id
+                results.append(result)
+        finally:
+            if created:
+                self._finish_bulk_index()
+
+        for goal in created:
+            self._notify("created", goal)
+
+        logger.info(f"Bulk created {len(created)} of {len(results)} goals")
+        return results
+
+    def _goal_from_spec(self, spec: dict[str, Any], refs: dict[str, str]) -> Goal:
+        """Validate a bulk goal spec and build the goal (not yet indexed)."""
+        description = spec.get("description")
+        if not isinstance(description, str) or not description.strip():
+            raise ValueError("description is required")
+
+        ref = spec.get("ref")
+        if ref is not None and ref in refs:
+            raise ValueError(f"duplicate ref: {ref}")
+
+        parent_id = spec.get("parent_id")
+        parent_ref = spec.get("parent_ref")
+        if parent_ref is not None:
+            if parent_id is not None:
+                raise ValueError("parent_id and parent_ref are mutually exclusive")
+            if parent_ref not in refs:
+                raise ValueError(f"unknown parent_ref: {parent_ref}")
+            parent_id = refs[parent_ref]
+        elif parent_id is not None and parent_id not in self.goals:
+            raise ValueError(f"unknown parent_id: {parent_id}")
+
+        priority = spec.get("priority", 0)
+        if isinstance(priority, bool) or not isinstance(priority, int):
+            raise ValueError("priority must be an integer")
+
+        depends_on = list(spec.get("depends_on") or [])
+        for prerequisite in depends_on:
+            if prerequisite not in self.goals:
+                raise ValueError(f"unknown depends_on: {prerequisite}")
+        for prerequisite_ref in spec.get("depends_on_refs") or []:
+            if prerequisite_ref not in refs:
+                raise ValueError(f"unknown depends_on_ref: {prerequisite_ref}")
+            depends_on.append(refs[prerequisite_ref])
+
+        return Goal(
+            description=description,
+            mode=GoalMode(spec.get("mode", GoalMode.GOAL_ORIENTED)),
+            priority=priority,
+            parent_id=parent_id,
+            completion_criteria=list(spec.get("completion_criteria") or []),
+            metadata=dict(spec.get("metadata") or {}),
+            depends_on=list(dict.fromkeys(depends_on)),
+        )
+
+    def create_sub_goals(
+        self,
+        parent_id: str,
+        sub_goals: Iterable[dict[str, Any]],
+        dependencies: Iterable[dict[str, Any]] = (),
+    ) -> list[dict[str, Any]]:
+        """
+        Create a planner's decomposition of a goal, including its dependencies.
+
+        Sub-goals without unmet prerequisites become ready at once, so
+        independent branches can be worked on in parallel.
+
+        Args:
+            parent_id: Goal that was decomposed
+            sub_goals: Planner sub-goals with a planner-local ``id``, a
+                ``description`` and optionally ``mode`` and
+                ``completion_criteria``; prerequisites must come first.
+                Sub-goals inherit the parent's priority.
+            dependencies: ``{"from": id, "to": id}`` edges between planner
+                ids, meaning ``to`` waits for ``from``
+
+        Returns:
+            Results of :meth:`create_goals_bulk`, with the planner id as ``ref``
+
+        Raises:
+            ValueError: If the parent goal does not exist
+        """
+        parent = self.goals.get(parent_id)
+        if parent is None:
+            raise ValueError(f"Unknown goal: {parent_id}")
+
+        prerequisites: dict[str, list[str]] = {}
+        for edge in dependencies:
+            prerequisites.setdefault(edge["to"], []).append(edge["from"])
+
+        specs = []
+        for sub_goal in sub_goals:
+            spec = {
+                key: sub_goal[key]
+                for key in ("description", "mode", "completion_criteria")
+                if key in sub_goal
+            }
+            spec.update(
+                ref=sub_goal["id"],
+                parent_id=parent_id,
+                priority=parent.priority,
+                depends_on_refs=prerequisites.get(sub_goal["id"], []),
+            )
+            specs.append(spec)
+        return self.create_goals_bulk(specs)
+
     def get_all_goals(self) -> list[Goal]:
         """
         Get all goals.
@@ -156,9 +892,222 @@ class GoalEngine:
         """
         return list(self.goals.values())
 
-    def get_goal(self, goal_id: str) -> Goal | None:
-        """Get goal by ID."""
-        return self.goals.get(goal_id)
+    def restore_goals(
+        self, goals: Iterable[dict[str, Any]], active_goal_id: str | None = None
+    ) -> int:
+        """
+        Restore goals from serialized dictionaries (e.g. a checkpoint).
+
+        Goals are consumed one at a time, so ``goals`` can be a generator.
+        Goals that already exist in the engine are kept as they are.
+        No change events are emitted.
+
+        Args:
+            goals: Goal dictionaries as produced by :meth:`Goal.to_dict`
+            active_goal_id: Active goal to restore, if it exists
+
+        Returns:
+            Number of goals restored
+        """
+        restored = 0
+        try:
+            for data in goals:
+                if data["id"] in self.goals or (
+                    self.archive is not None and data["id"] in self.archive
+                ):
+                    continue
+                goal = Goal.from_dict(data)
+                self.goals[goal.id] = goal
+                self._index_goal(goal, bulk=True)
+                restored += 1
+        finally:
+            if restored:
+                self._finish_bulk_index()
+
+        if active_goal_id and active_goal_id in self.goals:
+            self.active_goal_id = active_goal_id
+
+        return restored
+
+    def get_goal(self, goal_id: str, include_archived: bool = False) -> Goal | None:
+        """
+        Get goal by ID.
+
+        Args:
+            goal_id: Goal ID
+            include_archived: Fall back to the archive (a disk read) for
+                goals that are no longer in memory
+
+        Returns:
+            The goal, or None if it is unknown
+        """
+        goal = self.goals.get(goal_id)
+        if goal is None and include_archived and self.archive is not None:
+            return self.archive.get(goal_id)
+        return goal
+
+    def is_archived(self, goal_id: str) -> bool:
+        """Check whether a goal was moved to the archive."""
+        return goal_id not in self.goals and self.archive is not None and goal_id in self.archive
+
+    def archive_completed_goals(self, max_age: timedelta = timedelta(hours=24)) -> list[str]:
+        """
+        Move old completed and failed goals from memory to the archive.
+
+        A goal is archived once it has been in a terminal state for at least
+        ``max_age`` and its whole subtree is archivable too, so live goals
+        never have archived parents. The active goal is never archived.
+        Archived goals keep counting in :meth:`count_goals` (with
+        ``include_archived``) and in the progress of their ancestors, and
+        stay readable through ``get_goal(..., include_archived=True)``.
+        No change events are emitted.
+
+        Args:
+            max_age: Minimum time since the goal's last change
+
+        Returns:
+            IDs of the archived goals
+
+        Raises:
+            RuntimeError: If the engine has no archive
+        """
+        if self.archive is None:
+            raise RuntimeError("Goal archive is not configured")
+
+        goals = self._archivable(max_age)
+        if not goals:
+            return []
+        # Durable first: a failed write leaves the engine untouched
+        self.archive.append(goals)
+        return self._evict_archived(goals)
+
+    async def archive_completed_goals_async(
+        self, max_age: timedelta = timedelta(hours=24)
+    ) -> list[str]:
+        """
+        Like :meth:`archive_completed_goals`, but write the archive in a worker
+        thread so the event loop keeps running.
+
+        Goals that change, or gain a live child or dependent, while the write
+        is in flight stay in memory, and their records are released again.
+
+        Args:
+            max_age: Minimum time since the goal's last change
+
+        Returns:
+            IDs of the archived goals
+
+        Raises:
+            RuntimeError: If the engine has no archive
+        """
+        if self.archive is None:
+            raise RuntimeError("Goal archive is not configured")
+
+        goals = self._archivable(max_age)
+        if not goals:
+            return []
+        versions = {goal.id: goal.version for goal in goals}
+        await self.archive.append_async(goals)
+
+        unchanged = {
+            goal_id
+            for goal_id, version in versions.items()
+            if goal_id in self.goals and self.goals[goal_id].version == version
+        }
+        evicted = self._evict_archived(self._archivable(max_age, within=unchanged))
+        if len(evicted) < len(versions):
+            kept = set(versions).difference(evicted)
+            await self.archive.release_async(kept)
+        return evicted
+
+    def _archivable(self, max_age: timedelta, within: set[str] | None = None) -> list[Goal]:
+        """
+        Select the goals :meth:`archive_completed_goals` may archive.
+
+        Args:
+            max_age: Minimum time since the goal's last change
+            within: Only consider these goal IDs, or None for all goals
+
+        Returns:
+            Archivable goals in creation order
+        """
+        cutoff = _to_epoch_us(datetime.now(timezone.utc) - max_age)
+        candidates = {
+            goal_id
+            for status in (GoalStatus.COMPLETED, GoalStatus.FAILED)
+            for goal_id in self._by_status.get(status, ())
+            if self.goals[goal_id].updated_us <= cutoff
+            and goal_id != self.active_goal_id
+            and (within is None or goal_id in within)
+        }
+        if not candidates:
+            return []
+
+        # Any live goal that stays keeps all of its ancestors in memory
+        blocked: set[str] = set()
+        for goal_id, keys in self._index_keys.items():
+            if goal_id in candidates:
+                continue
+            parent_id = keys[3]
+            while parent_id is not None and parent_id not in blocked:
+                blocked.add(parent_id)
+                parent_keys = self._index_keys.get(parent_id)
+                parent_id = parent_keys[3] if parent_keys else None
+
+        archived = candidates - blocked
+        # Prerequisites of goals that stay are kept too, with their ancestors
+        while True:
+            kept = [
+                goal_id
+                for goal_id in archived
+                if any(
+                    dependent not in archived and dependent in self.goals
+                    for dependent in self._dependents.get(goal_id, ())
+                )
+            ]
+            if not kept:
+                break
+            for goal_id in kept:
+                ancestor: str | None = goal_id
+                while ancestor is not None and ancestor in archived:
+                    archived.discard(ancestor)
+                    ancestor_keys = self._index_keys.get(ancestor)
+                    ancestor = ancestor_keys[3] if ancestor_keys else None
+        return sorted((self.goals[goal_id] for goal_id in archived), key=lambda g: g.created_us)
+
+    def _evict_archived(self, goals: list[Goal]) -> list[str]:
+        """
+        Drop goals that were written to the archive from memory.
+
+        Args:
+            goals: Goals from :meth:`_archivable`
+
+        Returns:
+            IDs of the evicted goals
+        """
+        if not goals:
+            return []
+        archived = {goal.id for goal in goals}
+        for goal in goals:
+            keys = self._index_keys.pop(goal.id)
+            self._unfile(goal.id, keys)
+            for name, sort_key in self._sort_keys.pop(goal.id, {}).items():
+                self._sorted[name].discard(sort_key)
+            self._pending_ids.pop(goal.id, None)
+            self._completed_children.pop(goal.id, None)
+            self._subtree_counts.pop(goal.id, None)
+            self._archived_children.pop(goal.id, None)
+            self._dependents.pop(goal.id, None)
+            self._unmet.pop(goal.id, None)
+            del self.goals[goal.id]
+
+            count_key = (keys[0], keys[1])
+            self._archived_counts[count_key] = self._archived_counts.get(count_key, 0) + 1
+            if keys[3] is not None and keys[3] not in archived:
+                self._archived_children[keys[3]] = self._archived_children.get(keys[3], 0) + 1
+
+        logger.info(f"Archived {len(goals)} goals, {len(self.goals)} remain in memory")
+        return [goal.id for goal in goals]
 
     def update_goal_status(self, goal_id: str, status: GoalStatus) -> None:
         """Update goal status."""
@@ -169,6 +1118,126 @@ class GoalEngine:
             if status == GoalStatus.COMPLETED:
                 self.goals[goal_id].completed_at = datetime.now(timezone.utc)
 
+            self._index_goal(self.goals[goal_id])
+            self._notify("status", self.goals[goal_id])
+
+    def add_dependency(self, goal_id: str, depends_on: str) -> None:
+        """
+        Make a goal wait until another goal is completed.
+
+        Args:
+            goal_id: Dependent goal
+            depends_on: Prerequisite goal
+
+        Raises:
+            ValueError: If a goal is unknown or the dependency would create a
+                cycle
+        """
+        goal = self.goals.get(goal_id)
+        if goal is None or depends_on not in self.goals:
+            raise ValueError(f"Unknown goal: {depends_on if goal else goal_id}")
+        if depends_on in goal.depends_on:
+            return
+        if depends_on == goal_id or self._reaches(depends_on, goal_id):
+            raise ValueError(f"Dependency of {goal_id} on {depends_on} would create a cycle")
+
+        goal.depends_on.append(sys.intern(depends_on))
+        goal.touch()
+        self._dependents.setdefault(depends_on, {})[goal_id] = None
+        if self.goals[depends_on].status != GoalStatus.COMPLETED:
+            self._unmet[goal_id] = self._unmet.get(goal_id, 0) + 1
+            self._pending_ids.pop(goal_id, None)
+        self._notify("dependencies", goal)
+
+    def remove_dependency(self, goal_id: str, depends_on: str) -> None:
+        """
+        Remove a dependency added with :meth:`add_dependency`.
+
+        Args:
+            goal_id: Dependent goal
+            depends_on: Prerequisite goal
+        """
+        goal = self.goals.get(goal_id)
+        if goal is None or depends_on not in goal.depends_on:
+            return
+
+        goal.depends_on.remove(depends_on)
+        goal.touch()
+        dependents = self._dependents.get(depends_on)
+        if dependents is not None:
+            dependents.pop(goal_id, None)
+            if not dependents:
+                del self._dependents[depends_on]
+        prerequisite_keys = self._index_keys.get(depends_on)
+        if prerequisite_keys is None or prerequisite_keys[0] != GoalStatus.COMPLETED:
+            unmet = self._unmet.get(goal_id, 0) - 1
+            if unmet > 0:
+                self._unmet[goal_id] = unmet
+            else:
+                self._unmet.pop(goal_id, None)
+                if goal.status == GoalStatus.PENDING and goal_id not in self._pending_ids:
+                    self._push_pending(goal)
+        self._notify("dependencies", goal)
+
+    def _reaches(self, start: str, target: str) -> bool:
+        """Check whether ``start`` depends on ``target``, directly or not."""
+        stack = [start]
+        seen = {start}
+        while stack:
+            goal = self.goals.get(stack.pop())
+            if goal is None:
+                continue
+            for prerequisite in goal.depends_on:
+                if prerequisite == target:
+                    return True
+                if prerequisite not in seen:
+                    seen.add(prerequisite)
+                    stack.append(prerequisite)
+        return False
+
+    def get_dependents(self, goal_id: str) -> list[str]:
+        """Get the IDs of goals waiting for a goal."""
+        return list(self._dependents.get(goal_id, ()))
+
+    def is_blocked(self, goal_id: str) -> bool:
+        """Check whether a goal still waits for uncompleted prerequisites."""
+        return bool(self._unmet.get(goal_id))
+
+    def get_ready_goals(self) -> list[Goal]:
+        """
+        Get all pending goals whose prerequisites are completed.
+
+        Returns:
+            Ready goals in the order :meth:`get_next_goal` hands them out
+        """
+        entries = sorted(
+            entry for entry in self._pending_heap if self._pending_ids.get(entry[3]) == entry[2]
+        )
+        return [
+            self.goals[entry[3]]
+            for entry in entries
+            if entry[3] in self.goals and self.goals[entry[3]].status == GoalStatus.PENDING
+        ]
+
+    def update_goal_priority(self, goal_id: str, priority: int) -> None:
+        """
+        Update goal priority.
+
+        Args:
+            goal_id: Goal ID
+            priority: New priority level
+        """
+        goal = self.goals.get(goal_id)
+        if goal is None or goal.priority == priority:
+            return
+
+        goal.priority = priority
+        goal.updated_at = datetime.now(timezone.utc)
+        # Queue a fresh heap entry at the new priority
+        self._pending_ids.pop(goal_id, None)
+        self._index_goal(goal)
+        self._notify("priority", goal)
+
     def set_active_goal(self, goal_id: str) -> None:
         """Set the active goal."""
         if goal_id in self.goals:
@@ -181,21 +1250,50 @@ class GoalEngine:
             return self.goals.get(self.active_goal_id)
         return None
 
+    def has_pending_goals(self) -> bool:
+        """
+        Check whether any goal is waiting to be worked on.
+
+        Answered from the pending index without scanning goals.
+
+        Returns:
+            True if at least one goal is pending
+        """
+        return bool(self._pending_ids)
+
     def get_next_goal(self) -> Goal | None:
         """
         Get the next goal to work on based on priority.
 
+        Goals are ordered by priority (highest first), then by creation time.
+        Goals waiting for prerequisites are not in the pending heap, which
+        is consulted, so this is O(log n) amortized.
+
         Returns:
             Next goal to work on, or None
         """
-        pending_goals = [goal for goal in self.goals.values() if goal.status == GoalStatus.PENDING]
+        heap = self._pending_heap
+        while heap:
+            neg_priority, _, seq, goal_id = heap[0]
+            if self._pending_ids.get(goal_id) != seq:
+                heapq.heappop(heap)
+                continue
 
-        if not pending_goals:
-            return None
+            goal = self.goals.get(goal_id)
+            if goal is None or goal.status != GoalStatus.PENDING:
+                # Removed or changed without going through the engine
+                heapq.heappop(heap)
+                self._pending_ids.pop(goal_id, None)
+                continue
+            if -neg_priority != goal.priority:
+                # Priority was changed in place; requeue at the new position
+                heapq.heappop(heap)
+                self._push_pending(goal)
+                continue
 
-        # Sort by priority (highest first)
-        pending_goals.sort(key=lambda g: g.priority, reverse=True)
-        return pending_goals[0]
+            return goal
+
+        return None
 
     def check_goal_completion(self, goal_id: str) -> bool:
         """
@@ -215,61 +1313,325 @@ class GoalEngine:
         if goal.mode == GoalMode.CONTINUOUS:
             return False
 
-        # Check if all sub-goals are completed
+        # Check if all sub-goals are completed (O(1) from the counters)
         if goal.sub_goals:
-            all_sub_goals_completed = all(
-                self.goals[sub_id].status == GoalStatus.COMPLETED
-                for sub_id in goal.sub_goals
-                if sub_id in self.goals
-            )
-            return all_sub_goals_completed
+            return self._completed_children.get(goal_id, 0) == len(
+                self._by_parent.get(goal_id, ())
+            ) + self._archived_children.get(goal_id, 0)
 
         # Check completion criteria
         # (In practice, this would be evaluated by the cognitive loop)
         return goal.status == GoalStatus.COMPLETED
 
-    def get_goal_hierarchy(self, goal_id: str) -> dict[str, Any]:
+    def get_goal_progress(self, goal_id: str) -> dict[str, int]:
+        """
+        Get completion counts for a goal's sub-goals and descendants.
+
+        Args:
+            goal_id: Goal ID
+
+        Returns:
+            Completed and total counts for direct sub-goals and for all
+            descendants
+        """
+        completed, total = self._subtree_counts.get(goal_id, (0, 0))
+        return {
+            "completed_sub_goals": self._completed_children.get(goal_id, 0),
+            "total_sub_goals": len(self._by_parent.get(goal_id, ()))
+            + self._archived_children.get(goal_id, 0),
+            "completed_descendants": completed,
+            "total_descendants": total,
+        }
+
+    def iter_goal_hierarchy(
+        self, goal_id: str, max_depth: int | None = None
+    ) -> Iterator[tuple[int, Goal]]:
+        """
+        Walk a goal and its descendants depth-first without recursion.
+
+        Args:
+            goal_id: Root goal ID
+            max_depth: Deepest level to visit (the root is depth 0), or None
+                for the whole tree
+
+        Yields:
+            (depth, goal) pairs in pre-order
+        """
+        root = self.get_goal(goal_id)
+        if root is None:
+            return
+
+        stack: list[tuple[int, Goal]] = [(0, root)]
+        seen = {root.id}
+        while stack:
+            depth, goal = stack.pop()
+            yield depth, goal
+            if max_depth is not None and depth >= max_depth:
+                continue
+            children = [
+                self.goals[sub_id]
+                for sub_id in goal.sub_goals
+                if sub_id in self.goals and sub_id not in seen
+            ]
+            seen.update(child.id for child in children)
+            stack.extend((depth + 1, child) for child in reversed(children))
+
+    def get_goal_hierarchy(self, goal_id: str, max_depth: int | None = None) -> dict[str, Any]:
         """
         Get goal hierarchy including parent and children.
 
         Args:
             goal_id: Goal ID
+            max_depth: Deepest level to include (the root is depth 0), or None
+                for the whole tree. Nodes whose children were cut off carry
+                ``omitted_sub_goals``.
 
         Returns:
             Goal hierarchy
         """
-        goal = self.get_goal(goal_id)
-        if not goal:
-            return {}
-
-        hierarchy = {
-            "goal": goal.to_dict(),
-            "sub_goals": [
-                self.get_goal_hierarchy(sub_id) for sub_id in goal.sub_goals if sub_id in self.goals
-            ],
-        }
+        nodes: list[dict[str, Any]] = []
+        for depth, goal in self.iter_goal_hierarchy(goal_id, max_depth):
+            node: dict[str, Any] = {"goal": goal.to_dict(), "sub_goals": []}
+            if max_depth is not None and depth == max_depth:
+                omitted = sum(1 for sub_id in goal.sub_goals if sub_id in self.goals)
+                if omitted:
+                    node["omitted_sub_goals"] = omitted
+            # Pre-order: the parent of this node is the last node one level up
+            del nodes[depth:]
+            if nodes:
+                nodes[-1]["sub_goals"].append(node)
+            nodes.append(node)
 
-        return hierarchy
+        return nodes[0] if nodes else {}
 
     def list_goals(
-        self, status: GoalStatus | None = None, mode: GoalMode | None = None
+        self,
+        status: GoalStatus | None = None,
+        mode: GoalMode | None = None,
+        parent_id: str | None = None,
+        min_priority: int | None = None,
+        max_priority: int | None = None,
     ) -> list[Goal]:
         """
         List goals with optional filters.
 
+        Filtered listings are served from the secondary indexes, so their
+        cost depends on the size of the result rather than on the number of
+        goals. Changes must go through the engine to be reflected.
+
         Args:
             status: Filter by status
             mode: Filter by mode
+            parent_id: Filter by parent goal
+            min_priority: Minimum priority (inclusive)
+            max_priority: Maximum priority (inclusive)
 
         Returns:
             List of goals
         """
-        goals = list(self.goals.values())
+        candidates = self._candidate_ids(status, mode, parent_id, min_priority, max_priority)
+        if candidates is None:
+            return list(self.goals.values())
+
+        filters = (status, mode, parent_id, min_priority, max_priority)
+        return [
+            self.goals[goal_id] for goal_id in candidates if self._matches(goal_id, *filters)
+        ]
+
+    def query_goals(
+        self,
+        status: GoalStatus | None = None,
+        mode: GoalMode | None = None,
+        min_priority: int | None = None,
+        max_priority: int | None = None,
+        sort_by: str = "created_at",
+        descending: bool = True,
+        limit: int = 10,
+        cursor: str | None = None,
+        offset: int = 0,
+    ) -> GoalPage:
+        """
+        Query one page of goals.
+
+        Pages are read from sorted indexes. ``cursor`` continues after the
+        last goal of a previous page (keyset pagination), so a page costs
+        O(limit + log n) regardless of its position; ``offset`` skips
+        matching goals for page-number access.
+
+        Args:
+            status: Filter by status
+            mode: Filter by mode
+            min_priority: Minimum priority (inclusive)
+            max_priority: Maximum priority (inclusive)
+            sort_by: One of ``GOAL_SORT_FIELDS``
+            descending: Sort order
+            limit: Maximum number of goals to return
+            cursor: ``next_cursor`` of the previous page
+            offset: Number of matching goals to skip
+
+        Returns:
+            The page, the total number of matching goals and the cursor of
+            the next page (None on the last page)
+
+        Raises:
+            ValueError: If ``sort_by`` or ``cursor`` is invalid
+        """
+        if sort_by not in self._sorted:
+            raise ValueError(f"Unsupported sort field: {sort_by}")
+        after = _decode_cursor(cursor, sort_by, descending) if cursor else None
+
+        filters = (status, mode, None, min_priority, max_priority)
+        candidates = self._candidate_ids(*filters)
+        total = self._count_matching(candidates, filters)
+
+        ordered: SortedList
+        if candidates is not None and len(candidates) * 4 < len(self.goals):
+            # Selective filter: sorting the matches beats walking the index
+            ordered = SortedList(
+                self._sort_keys[goal_id][sort_by]
+                for goal_id in candidates
+                if self._matches(goal_id, *filters)
+            )
+            check = False
+        else:
+            ordered = self._sorted[sort_by]
+            check = candidates is not None
+
+        try:
+            if descending:
+                stop = ordered.bisect_left(after) if after else len(ordered)
+                keys: Iterable[tuple[Any, ...]] = ordered.islice(0, stop, reverse=True)
+            else:
+                start = ordered.bisect_right(after) if after else 0
+                keys = ordered.islice(start)
+        except TypeError as e:
+            raise ValueError("Cursor does not match the requested ordering") from e
 
-        if status:
-            goals = [g for g in goals if g.status == status]
+        page: list[tuple[Any, ...]] = []
+        has_more = False
+        for key in keys:
+            if key[-1] not in self.goals or (check and not self._matches(key[-1], *filters)):
+                continue
+            if offset:
+                offset -= 1
+                continue
+            if len(page) == limit:
+                has_more = True
+                break
+            page.append(key)
 
-        if mode:
-            goals = [g for g in goals if g.mode == mode]
+        return GoalPage(
+            goals=[self.goals[key[-1]] for key in page],
+            total=total,
+            next_cursor=(
+                _encode_cursor(sort_by, descending, page[-1]) if has_more and page else None
+            ),
+        )
+
+    def _matches(
+        self,
+        goal_id: str,
+        status: GoalStatus | None,
+        mode: GoalMode | None,
+        parent_id: str | None,
+        min_priority: int | None,
+        max_priority: int | None,
+    ) -> bool:
+        """Check an indexed goal against list filters."""
+        keys = self._index_keys.get(goal_id)
+        if keys is None or goal_id not in self.goals:
+            return False
+        if status is not None and keys[0] != status:
+            return False
+        if mode is not None and keys[1] != mode:
+            return False
+        if min_priority is not None and keys[2] < min_priority:
+            return False
+        if max_priority is not None and keys[2] > max_priority:
+            return False
+        return parent_id is None or keys[3] == parent_id
+
+    def _count_matching(
+        self,
+        candidates: Collection[str] | None,
+        filters: tuple[Any, ...],
+    ) -> int:
+        """Count goals matching ``filters`` given their candidate ids."""
+        if candidates is None:
+            return len(self.goals)
+        if sum(value is not None for value in filters) == 1 and (
+            filters[0] is not None or filters[1] is not None or filters[2] is not None
+        ):
+            # A single status, mode or parent filter is exactly one index entry
+            return len(candidates)
+        return sum(1 for goal_id in candidates if self._matches(goal_id, *filters))
 
-        return goals
+    def count_goals(
+        self,
+        status: GoalStatus | None = None,
+        mode: GoalMode | None = None,
+        include_archived: bool = False,
+    ) -> int:
+        """
+        Count goals with optional filters.
+
+        Args:
+            status: Filter by status
+            mode: Filter by mode
+            include_archived: Also count goals moved to the archive
+
+        Returns:
+            Number of matching goals
+        """
+        archived = 0
+        if include_archived:
+            archived = sum(
+                count
+                for (archived_status, archived_mode), count in self._archived_counts.items()
+                if (status is None or archived_status == status)
+                and (mode is None or archived_mode == mode)
+            )
+
+        if status is None and mode is None:
+            return len(self.goals) + archived
+        if mode is None:
+            return len(self._by_status.get(status, {})) + archived  # type: ignore[arg-type]
+        if status is None:
+            return len(self._by_mode.get(mode, {})) + archived
+        return len(self.list_goals(status=status, mode=mode)) + archived
+
+    def _candidate_ids(
+        self,
+        status: GoalStatus | None,
+        mode: GoalMode | None,
+        parent_id: str | None,
+        min_priority: int | None,
+        max_priority: int | None,
+    ) -> Collection[str] | None:
+        """
+        Pick the smallest index entry matching the filters.
+
+        Returns:
+            Candidate goal ids, or None when no filter is given
+        """
+        options: list[Collection[str]] = []
+        if status is not None:
+            options.append(self._by_status.get(status, {}))
+        if mode is not None:
+            options.append(self._by_mode.get(mode, {}))
+        if parent_id is not None:
+            options.append(self._by_parent.get(parent_id, {}))
+        if min_priority is not None or max_priority is not None:
+            options.append(
+                [
+                    goal_id
+                    for priority, bucket in self._by_priority.items()
+                    if (min_priority is None or priority >= min_priority)
+                    and (max_priority is None or priority <= max_priority)
+                    for goal_id in bucket
+                ]
+            )
+
+        if not options:
+            return None
+        return min(options, key=len)
@@ -0,0 +1,327 @@
+"""Push-based change feed of goal events.
+
+:class:`GoalFeed` listens to a :class:`GoalEngine` and turns every create,
+status and priority change into a numbered :class:`GoalChange` delta.
+Consumers such as the WebSocket gateway or the REST event stream subscribe
+instead of re-fetching goal lists. Each subscriber has a bounded buffer: a
+subscriber that falls behind loses its oldest changes and receives a
+``gap`` change telling it to re-sync. Changes can additionally be mirrored
+to a Redis stream for consumers in other processes.
+"""
+
+import asyncio
+import json
+from collections import deque
+from collections.abc import AsyncIterator
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any
+
+from xagent.core.goal_engine import Goal, GoalEngine
+from xagent.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Goal fields sent with each event; "created" sends the whole goal
+_DELTA_FIELDS = {
+    "status": ("status", "updated_at", "completed_at"),
+    "priority": ("priority", "updated_at"),
+}
+
+
+@dataclass
+class GoalChange:
+    """One goal change."""
+
+    seq: int
+    event: str
+    goal_id: str | None
+    data: dict[str, Any] = field(default_factory=dict)
+    timestamp: str = field(default_factory=lambda: datetime.now(timezone.utc).isoformat())
+
+    @classmethod
+    def from_goal(cls, seq: int, event: str, goal: Goal) -> "GoalChange":
+        """
+        Build the delta for a goal event.
+
+        Args:
+            seq: Feed sequence number
+            event: Engine event name
+            goal: Changed goal
+
+        Returns:
+            Change carrying only the fields the event touched
+        """
+        goal_dict = goal.to_dict()
+        fields = _DELTA_FIELDS.get(event)
+        data = goal_dict if fields is None else {name: goal_dict[name] for name in fields}
+        return cls(seq=seq, event=event, goal_id=goal.id, data=data)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert change to dictionary."""
+        return {
+            "seq": self.seq,
+            "event": self.event,
+            "goal_id": self.goal_id,
+            "data": self.data,
+            "timestamp": self.timestamp,
+        }
+
+    def to_json(self) -> str:
+        """Serialize change to compact JSON."""
+        return json.dumps(self.to_dict(), separators=(",", ":"), default=str)
+
+
+class GoalFeedSubscription:
+    """
+    A subscriber's bounded view of the feed.
+
+    Iterate with ``async for``; use as an async context manager (or call
+    :meth:`close`) to unsubscribe.
+    """
+
+    def __init__(self, feed: "GoalFeed", buffer_size: int) -> None:
+        """
+        Initialize the subscription.
+
+        Args:
+            feed: Feed the subscription belongs to
+            buffer_size: Maximum undelivered changes kept
+        """
+        self.feed = feed
+        self.buffer_size = buffer_size
+        self.dropped = 0
+        self._buffer: deque[GoalChange] = deque()
+        self._ready = asyncio.Event()
+        self._closed = False
+
+    def _put(self, change: GoalChange) -> None:
+        """Queue a change, dropping the oldest one when the buffer is full."""
+        if len(self._buffer) >= self.buffer_size:
+            self._buffer.popleft()
+            self.dropped += 1
+        self._buffer.append(change)
+        self._ready.set()
+
+    async def get(self) -> GoalChange:
+        """
+        Wait for the next change.
+
+        Returns:
+            The next change, or a ``gap`` change with the number of dropped
+            changes if the subscriber fell behind
+
+        Raises:
+            StopAsyncIteration: If the subscription was closed
+        """
+        while not self._buffer and not self.dropped:
+            if self._closed:
+                raise StopAsyncIteration
+            self._ready.clear()
+            await self._ready.wait()
+
+        if self.dropped:
+            dropped, self.dropped = self.dropped, 0
+            seq = self._buffer[0].seq - 1 if self._buffer else self.feed.last_seq
+            return GoalChange(seq=seq, event="gap", goal_id=None, data={"dropped": dropped})
+        return self._buffer.popleft()
+
+    def close(self) -> None:
+        """Unsubscribe; pending :meth:`get` calls finish."""
+        self._closed = True
+        self._ready.set()
+        self.feed._subscribers.discard(self)
+
+    def __aiter__(self) -> AsyncIterator[GoalChange]:
+        return self
+
+    async def __anext__(self) -> GoalChange:
+        return await self.get()
+
+    async def __aenter__(self) -> "GoalFeedSubscription":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        self.close()
+
+
+class GoalFeed:
+    """
+    In-process pub/sub of goal changes with optional Redis stream mirroring.
+
+    Typical use::
+
+        feed = GoalFeed()
+        feed.attach(goal_engine)
+        async with feed.subscribe(since=last_seq) as changes:
+            async for change in changes:
+                ...
+    """
+
+    def __init__(
+        self,
+        buffer_size: int = 1000,
+        redis_url: str | None = None,
+        stream_key: str = "xagent:goal_changes",
+        stream_maxlen: int = 10000,
+    ) -> None:
+        """
+        Initialize the feed.
+
+        Args:
+            buffer_size: Per-subscriber buffer size, also the number of
+                recent changes kept for replay
+            redis_url: Mirror changes to a Redis stream at this URL
+            stream_key: Redis stream key
+            stream_maxlen: Approximate maximum Redis stream length
+        """
+        self.buffer_size = max(1, buffer_size)
+        self.redis_url = redis_url
+        self.stream_key = stream_key
+        self.stream_maxlen = stream_maxlen
+        self.goal_engine: GoalEngine | None = None
+
+        self._seq = 0
+        self._recent: deque[GoalChange] = deque(maxlen=self.buffer_size)
+        self._subscribers: set[GoalFeedSubscription] = set()
+
+        # Changes waiting to be written to Redis
+        self._outbox: deque[GoalChange] = deque(maxlen=stream_maxlen)
+        self._outbox_ready = asyncio.Event()
+        self._forward_task: asyncio.Task[None] | None = None
+        self._stopping = False
+        self._redis: Any = None
+
+    @property
+    def last_seq(self) -> int:
+        """Sequence number of the latest change (0 before the first one)."""
+        return self._seq
+
+    @property
+    def subscriber_count(self) -> int:
+        """Number of active subscriptions."""
+        return len(self._subscribers)
+
+    def attach(self, goal_engine: GoalEngine) -> None:
+        """
+        Start publishing the changes of a goal engine.
+
+        Args:
+            goal_engine: Engine to follow
+        """
+        self.detach()
+        self.goal_engine = goal_engine
+        goal_engine.add_listener(self._on_goal_change)
+
+    def detach(self) -> None:
+        """Stop following the attached goal engine."""
+        if self.goal_engine is not None:
+            self.goal_engine.remove_listener(self._on_goal_change)
+            self.goal_engine = None
+
+    def _on_goal_change(self, event: str, goal: Goal) -> None:
+        """Goal engine listener: publish the change."""
+        self._seq += 1
+        self.publish(GoalChange.from_goal(self._seq, event, goal))
+
+    def publish(self, change: GoalChange) -> None:
+        """
+        Deliver a change to all subscribers without waiting for them.
+
+        Args:
+            change: Change to deliver
+        """
+        self._recent.append(change)
+        for subscription in list(self._subscribers):
+            subscription._put(change)
+        if self._forward_task is not None:
+            self._outbox.append(change)
+            self._outbox_ready.set()
+
+    def subscribe(self, since: int | None = None) -> GoalFeedSubscription:
+        """
+        Subscribe to future changes.
+
+        Args:
+            since: Replay retained changes after this sequence number first;
+                a ``gap`` change is delivered if some were already discarded
+
+        Returns:
+            New subscription
+        """
+        subscription = GoalFeedSubscription(self, self.buffer_size)
+        if since is not None and since < self._seq:
+            replay = [change for change in self._recent if change.seq > since]
+            first = replay[0].seq if replay else self._seq + 1
+            subscription.dropped = first - since - 1
+            for change in replay:
+                subscription._put(change)
+        self._subscribers.add(subscription)
+        return subscription
+
+    async def start(self) -> None:
+        """Start mirroring changes to the Redis stream, if configured."""
+        if self.redis_url is None or self._forward_task is not None:
+            return
+        import redis.asyncio as redis
+
+        self._redis = redis.from_url(self.redis_url, decode_responses=True)
+        self._forward_task = asyncio.create_task(self._forward_loop())
+
+    async def stop(self) -> None:
+        """Stop mirroring to Redis after writing the queued changes."""
+        if self._forward_task is not None:
+            # Let an in-flight batch finish instead of cancelling it mid-write
+            self._stopping = True
+            self._outbox_ready.set()
+            await self._forward_task
+            self._forward_task = None
+            self._stopping = False
+            try:
+                # Changes queued while the last batch was being written
+                await self._forward_batch()
+            except Exception as e:
+                logger.error(f"Failed to forward goal changes on shutdown: {e}")
+            await self._redis.aclose()
+            self._redis = None
+
+    def close(self) -> None:
+        """End all subscriptions and stop following the goal engine."""
+        for subscription in list(self._subscribers):
+            subscription.close()
+        self.detach()
+
+    async def _forward_batch(self) -> int:
+        """Write queued changes to the Redis stream in one pipeline."""
+        if not self._outbox:
+            return 0
+        changes = list(self._outbox)
+        self._outbox.clear()
+        pipe = self._redis.pipeline(transaction=False)
+        for change in changes:
+            pipe.xadd(
+                self.stream_key,
+                {"seq": change.seq, "event": change.event, "json": change.to_json()},
+                maxlen=self.stream_maxlen,
+                approximate=True,
+            )
+        try:
+            await pipe.execute()
+        except Exception:
+            # Keep the changes for the next attempt
+            self._outbox.extendleft(reversed(changes))
+            raise
+        return len(changes)
+
+    async def _forward_loop(self) -> None:
+        """Forward queued changes to Redis as they arrive, until stopped."""
+        while not self._stopping:
+            await self._outbox_ready.wait()
+            self._outbox_ready.clear()
+            try:
+                await self._forward_batch()
+            except Exception as e:
+                logger.error(f"Failed to forward goal changes to Redis: {e}")
+                if not self._stopping:
+                    await asyncio.sleep(1.0)
+                    self._outbox_ready.set()
@@ -181,6 +181,50 @@ class InternalRateLimiter:
 
         return True
 
+    def try_consume_iteration(self) -> bool:
+        """
+        Consume an iteration token without waiting.
+
+        Tokens are only taken when both the minute and hour buckets have one,
+        so a refusal never needs a refund.
+
+        Returns:
+            True if the iteration is allowed, False otherwise
+        """
+        self._stats["total_requests"] += 1
+        minute = self._buckets["iteration_per_minute"]
+        hour = self._buckets["iteration_per_hour"]
+
+        if minute.available_tokens() >= 1 and hour.available_tokens() >= 1:
+            minute.consume()
+            hour.consume()
+            return True
+
+        self._stats["blocked_requests"] += 1
+        return False
+
+    def get_iteration_budget(self) -> list[dict[str, float]]:
+        """
+        Get the fill level of the iteration buckets.
+
+        Returns:
+            One entry per iteration bucket with its fill fraction (0.0-1.0),
+            refill rate in tokens per second, and seconds until a token is
+            available
+        """
+        budget = []
+        for name in ("iteration_per_minute", "iteration_per_hour"):
+            bucket = self._buckets[name]
+            wait = bucket.time_until_available()
+            budget.append(
+                {
+                    "fill": bucket.tokens / bucket.capacity if bucket.capacity else 0.0,
+                    "refill_rate": bucket.refill_rate,
+                    "wait": wait,
+                }
+            )
+        return budget
+
     async def check_tool_call_limit(self) -> bool:
         """
         Check if tool call is allowed.
@@ -0,0 +1,108 @@
+"""Adaptive iteration pacing for the cognitive loop."""
+
+from xagent.core.internal_rate_limiting import InternalRateLimiter
+from xagent.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class IterationPacer:
+    """
+    Spreads cognitive loop iterations across the rate limit window.
+
+    Instead of running until a bucket is empty and then sleeping through a
+    cooldown, the pacer reads the fill level of the iteration buckets. While
+    a bucket is above ``target_fill`` iterations run back to back; below it
+    the delay between iterations grows smoothly towards the bucket's refill
+    interval. Sustained throughput then settles at the configured ceiling
+    without stop-start bursts.
+
+    When the budget is scarce (fill below ``scarce_fill``), goals must earn
+    their iteration by priority: goals at ``max_priority`` always run, lower
+    priorities need proportionally more budget left. A goal that is not
+    admitted yields without taking a token, so high priority goals get the
+    remaining tokens first.
+    """
+
+    def __init__(
+        self,
+        rate_limiter: InternalRateLimiter,
+        target_fill: float = 0.5,
+        scarce_fill: float = 0.2,
+        max_priority: int = 10,
+    ) -> None:
+        """
+        Initialize the pacer.
+
+        Args:
+            rate_limiter: Limiter whose iteration buckets are paced
+            target_fill: Fill level below which iterations are spread out
+            scarce_fill: Fill level below which low priority goals yield
+            max_priority: Top of the goal priority scale (goals created
+                through the API use 1-10)
+        """
+        self.rate_limiter = rate_limiter
+        self.target_fill = min(max(target_fill, 0.01), 1.0)
+        self.scarce_fill = min(max(scarce_fill, 0.0), 1.0)
+        self.max_priority = max(1, max_priority)
+
+    def admits(self, priority: int, fill: float) -> bool:
+        """
+        Check whether a goal of the given priority may use scarce budget.
+
+        Args:
+            priority: Goal priority
+            fill: Current fill level of the tightest iteration bucket
+
+        Returns:
+            True if the goal may run now
+        """
+        if fill >= self.scarce_fill:
+            return True
+        share = min(max(int(priority), 0), self.max_priority) / self.max_priority
+        return fill >= self.scarce_fill * (1.0 - share)
+
+    def delay(self) -> float:
+        """
+        Compute how long to wait before the next iteration.
+
+        Returns:
+            Delay in seconds (0.0 means run now)
+        """
+        delay = 0.0
+        for bucket in self.rate_limiter.get_iteration_budget():
+            refill_interval = 1.0 / bucket["refill_rate"] if bucket["refill_rate"] else 0.0
+
+            # Hard floor: no token yet
+            delay = max(delay, bucket["wait"])
+            # Soft pacing: approach the refill interval as the bucket drains
+            if bucket["fill"] < self.target_fill:
+                delay = max(delay, refill_interval * (1.0 - bucket["fill"] / self.target_fill))
+
+        return delay
+
+    def yield_delay(self, priority: int | None) -> float:
+        """
+        Compute how long a goal should give way to higher priority goals.
+
+        Args:
+            priority: Priority of the goal the iteration is for, if any
+
+        Returns:
+            0.0 if the goal may take a token now, otherwise the refill
+            interval of the slowest bucket to wait before re-checking
+        """
+        if priority is None:
+            return 0.0
+
+        fill = 1.0
+        interval = 0.0
+        for bucket in self.rate_limiter.get_iteration_budget():
+            fill = min(fill, bucket["fill"])
+            if bucket["refill_rate"]:
+                interval = max(interval, 1.0 / bucket["refill_rate"])
+
+        if self.admits(priority, fill):
+            return 0.0
+        # Never zero, so a yielding goal cannot spin
+        return max(interval, 0.01)
@@ -54,6 +54,19 @@ class Planner:
     def _build_planning_prompt(self, context: dict[str, Any]) -> str:
         """Build planning prompt for LLM."""
         active_goal = context.get("active_goal", {})
+        memory_context = context.get("memory_context")
+        if not isinstance(memory_context, dict):
+            memory_context = {}
+        actions_summary = memory_context.get("actions_summary")
+        if actions_summary:
+            earlier_actions = (
+                f"{actions_summary['total']} total, {actions_summary['succeeded']} succeeded, "
+                f"{actions_summary['failed']} failed; by type: "
+                f"{json.dumps(actions_summary.get('action_types', {}))}; "
+                f"last error: {actions_summary.get('last_error') or 'None'}"
+            )
+        else:
+            earlier_actions = "None"
 
         prompt = f"""You are an autonomous agent planning the next action.
 
@@ -62,7 +75,8 @@ Goal Mode: {active_goal.get('mode', 'unknown')}
 Goal Status: {active_goal.get('status', 'unknown')}
 
 Context:
-- Recent Actions: {json.dumps(context.get('memory_context', {}).get('recent_actions', []))}
+- Recent Actions: {json.dumps(memory_context.get('recent_actions', []))}
+- Action History: {earlier_actions}
 - User Feedback: {context.get('feedback', 'None')}
 - Events: {context.get('event', 'None')}
 
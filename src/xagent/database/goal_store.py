@@ -0,0 +1,451 @@
+"""Write-behind persistence of GoalEngine state in the ``goals`` table.
+
+The goal engine stays the in-memory source of truth. :class:`GoalStore`
+listens to its change events, collects the ids of changed goals and writes
+them in batches with a single upsert statement per batch, so mutations
+never wait for a database round trip. On start-up :meth:`GoalStore.load`
+hydrates an engine (and with it all of its indexes) from one streaming
+query.
+
+Database access uses a synchronous SQLAlchemy engine; the async helpers
+run it in a worker thread so the event loop is never blocked.
+"""
+
+import asyncio
+import threading
+from collections.abc import Iterable, Iterator
+from datetime import datetime, timezone
+from typing import Any
+
+from sqlalchemy import create_engine, select
+from sqlalchemy.engine import Engine, Result, Row
+
+from xagent.core.goal_engine import Goal, GoalEngine, GoalMode, GoalStatus
+from xagent.database import models
+from xagent.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Completion criteria and dependencies have no column of their own; they
+# travel in metadata
+CRITERIA_KEY = "_completion_criteria"
+DEPENDS_ON_KEY = "_depends_on"
+
+_MODE_TO_DB = {
+    GoalMode.GOAL_ORIENTED: models.GoalMode.ONE_TIME,
+    GoalMode.CONTINUOUS: models.GoalMode.CONTINUOUS,
+}
+_MODE_FROM_DB = {db_mode: mode for mode, db_mode in _MODE_TO_DB.items()}
+
+_STATUS_FROM_DB = {
+    models.GoalStatus.PENDING: GoalStatus.PENDING,
+    models.GoalStatus.IN_PROGRESS: GoalStatus.IN_PROGRESS,
+    models.GoalStatus.COMPLETED: GoalStatus.COMPLETED,
+    models.GoalStatus.FAILED: GoalStatus.FAILED,
+    models.GoalStatus.PAUSED: GoalStatus.PAUSED,
+    models.GoalStatus.BLOCKED: GoalStatus.PAUSED,
+}
+
+
+def _to_db_time(value: datetime | None) -> datetime | None:
+    """Convert an aware datetime to the naive UTC the table stores."""
+    if value is None:
+        return None
+    return value.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def goal_to_row(goal: Goal, parent_known: bool = True) -> dict[str, Any]:
+    """
+    Convert a goal to a ``goals`` table row.
+
+    Args:
+        goal: Goal to convert
+        parent_known: Whether the parent goal exists; unknown parents are
+            stored as NULL to satisfy the foreign key
+
+    Returns:
+        Column values keyed by column name
+    """
+    metadata = dict(goal.metadata)
+    if goal.completion_criteria:
+        metadata[CRITERIA_KEY] = list(goal.completion_criteria)
+    if goal.depends_on:
+        metadata[DEPENDS_ON_KEY] = list(goal.depends_on)
+
+    return {
+        "id": goal.id,
+        "description": goal.description,
+        "status": models.GoalStatus[goal.status.name],
+        "mode": _MODE_TO_DB[goal.mode],
+        "priority": int(goal.priority),
+        "parent_id": goal.parent_id if parent_known else None,
+        "created_at": _to_db_time(goal.created_at),
+        "updated_at": _to_db_time(goal.updated_at),
+        "completed_at": _to_db_time(goal.completed_at),
+        "metadata": metadata or None,
+    }
+
+
+def row_to_goal_dict(row: Row[Any] | dict[str, Any]) -> dict[str, Any]:
+    """
+    Convert a ``goals`` table row to the :meth:`Goal.to_dict` format.
+
+    Args:
+        row: Row with the table's columns
+
+    Returns:
+        Goal dictionary accepted by :meth:`GoalEngine.restore_goals`
+    """
+    data = row._mapping if isinstance(row, Row) else row
+    metadata = dict(data["metadata"] or {})
+    criteria = metadata.pop(CRITERIA_KEY, [])
+    depends_on = metadata.pop(DEPENDS_ON_KEY, [])
+    completed_at = data["completed_at"]
+
+    return {
+        "id": data["id"],
+        "description": data["description"],
+        "mode": _MODE_FROM_DB[data["mode"]].value,
+        "status": _STATUS_FROM_DB[data["status"]].value,
+        "priority": data["priority"],
+        "parent_id": data["parent_id"],
+        "sub_goals": [],
+        "completion_criteria": criteria,
+        "created_at": data["created_at"].isoformat(),
+        "updated_at": data["updated_at"].isoformat(),
+        "completed_at": completed_at.isoformat() if completed_at else None,
+        "metadata": metadata,
+        "depends_on": depends_on,
+    }
+
+
+def sync_database_url(url: str) -> str:
+    """Select the psycopg driver for a plain ``postgresql://`` URL."""
+    if url.startswith("postgresql://"):
+        return "postgresql+psycopg://" + url[len("postgresql://") :]
+    return url
+
+
+class GoalStore:
+    """
+    Batches goal changes into upserts on the ``goals`` table.
+
+    Typical use::
+
+        store = GoalStore()
+        await store.load_async(goal_engine)   # warm start
+        store.attach(goal_engine)             # track changes
+        await store.start()                   # background flusher
+        ...
+        await store.stop()                    # final flush
+    """
+
+    def __init__(
+        self,
+        database_url: str | None = None,
+        engine: Engine | None = None,
+        batch_size: int = 500,
+        flush_interval: float = 1.0,
+    ) -> None:
+        """
+        Initialize the store.
+
+        Args:
+            database_url: SQLAlchemy URL (defaults to ``settings.postgres_url``)
+            engine: Existing SQLAlchemy engine to use instead of a URL
+            batch_size: Maximum rows per upsert statement; reaching it also
+                triggers an early flush
+            flush_interval: Seconds between background flushes
+        """
+        if engine is None:
+            if database_url is None:
+                from xagent.config import settings
+
+                database_url = settings.postgres_url
+            engine = create_engine(sync_database_url(database_url), pool_pre_ping=True)
+
+        self.engine = engine
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.goal_engine: GoalEngine | None = None
+
+        # Ids of goals changed since the last flush, in change order
+        self._dirty: dict[str, None] = {}
+        self._flush_now = asyncio.Event()
+        self._flush_task: asyncio.Task[None] | None = None
+        self._running = False
+        # Serializes upserts and deletes, which run in worker threads
+        self._write_lock = threading.Lock()
+
+    @property
+    def pending_count(self) -> int:
+        """Number of goals waiting to be written."""
+        return len(self._dirty)
+
+    def attach(self, goal_engine: GoalEngine) -> None:
+        """
+        Start tracking changes of a goal engine.
+
+        Args:
+            goal_engine: Engine whose goals are persisted
+        """
+        self.detach()
+        self.goal_engine = goal_engine
+        goal_engine.add_listener(self._on_goal_change)
+
+    def detach(self) -> None:
+        """Stop tracking the attached goal engine."""
+        if self.goal_engine is not None:
+            self.goal_engine.remove_listener(self._on_goal_change)
+            self.goal_engine = None
+
+    def mark_dirty(self, goal_ids: Iterable[str]) -> None:
+        """
+        Schedule goals for the next flush.
+
+        Args:
+            goal_ids: Ids of changed goals
+        """
+        for goal_id in goal_ids:
+            self._dirty[goal_id] = None
+        if len(self._dirty) >= self.batch_size:
+            self._flush_now.set()
+
+    def _on_goal_change(self, event: str, goal: Goal) -> None:
+        """Goal engine listener: remember the changed goal."""
+        self.mark_dirty((goal.id,))
+
+    def _take_rows(self) -> list[dict[str, Any]]:
+        """Snapshot the current state of all dirty goals as rows."""
+        if self.goal_engine is None or not self._dirty:
+            return []
+
+        goals = self.goal_engine.goals
+        dirty, self._dirty = self._dirty, {}
+        changed = [goals[goal_id] for goal_id in dirty if goal_id in goals]
+        # Parents before children keeps the foreign key satisfied
+        changed.sort(key=lambda goal: goal.created_us)
+        return [goal_to_row(goal, goal.parent_id in goals) for goal in changed]
+
+    def _write_rows(self, rows: list[dict[str, Any]]) -> None:
+        """
+        Upsert rows in batches of ``batch_size`` (blocking).
+
+        Rows of goals that left the engine since they were taken, e.g. by
+        archiving, are skipped, so a flush never re-inserts a goal that
+        :meth:`delete` removed while the flush was waiting.
+        """
+        table = models.Goal.__table__
+        dialect = self.engine.dialect.name
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert
+        elif dialect == "sqlite":
+            from sqlalchemy.dialects.sqlite import insert  # type: ignore[assignment]
+        else:
+            insert = None  # type: ignore[assignment]
+
+        with self._write_lock:
+            if self.goal_engine is not None:
+                goals = self.goal_engine.goals
+                rows = [row for row in rows if row["id"] in goals]
+            if not rows:
+                return
+            with self.engine.begin() as conn:
+                for start in range(0, len(rows), self.batch_size):
+                    batch = rows[start : start + self.batch_size]
+                    if insert is None:
+                        # No native upsert: replace row by row
+                        for row in batch:
+                            conn.execute(table.delete().where(table.c.id == row["id"]))
+                            conn.execute(table.insert().values(**row))
+                        continue
+                    stmt = insert(table).values(batch)
+                    stmt = stmt.on_conflict_do_update(
+                        index_elements=[table.c.id],
+                        set_={
+                            column.name: stmt.excluded[column.name]
+                            for column in table.columns
+                            if column.name != "id"
+                        },
+                    )
+                    conn.execute(stmt)
+
+    def flush(self) -> int:
+        """
+        Write all pending changes now (blocking).
+
+        Returns:
+            Number of goals written
+        """
+        rows = self._take_rows()
+        if not rows:
+            return 0
+        try:
+            self._write_rows(rows)
+        except Exception:
+            self.mark_dirty(row["id"] for row in rows)
+            raise
+        return len(rows)
+
+    async def flush_async(self) -> int:
+        """
+        Write all pending changes without blocking the event loop.
+
+        Returns:
+            Number of goals written
+        """
+        rows = self._take_rows()
+        if not rows:
+            return 0
+        try:
+            await asyncio.to_thread(self._write_rows, rows)
+        except Exception:
+            # Keep the changes for the next attempt
+            self.mark_dirty(row["id"] for row in rows)
+            raise
+        logger.debug(f"Persisted {len(rows)} goals")
+        return len(rows)
+
+    def delete(self, goal_ids: Iterable[str]) -> int:
+        """
+        Delete goals from the table (blocking), e.g. after archiving them.
+
+        Args:
+            goal_ids: Ids of goals to delete, parents before children
+
+        Returns:
+            Number of rows deleted
+        """
+        table = models.Goal.__table__
+        # Ids usually come in creation order; deleting children first keeps
+        # the parent foreign key satisfied between batches
+        ids = list(goal_ids)[::-1]
+        for goal_id in ids:
+            self._dirty.pop(goal_id, None)
+
+        deleted = 0
+        with self._write_lock, self.engine.begin() as conn:
+            for start in range(0, len(ids), self.batch_size):
+                batch = ids[start : start + self.batch_size]
+                deleted += conn.execute(table.delete().where(table.c.id.in_(batch))).rowcount
+        return deleted
+
+    async def delete_async(self, goal_ids: Iterable[str]) -> int:
+        """
+        Delete goals from the table without blocking the event loop.
+
+        Args:
+            goal_ids: Ids of goals to delete
+
+        Returns:
+            Number of rows deleted
+        """
+        return await asyncio.to_thread(self.delete, list(goal_ids))
+
+    def load(
+        self, goal_engine: GoalEngine, goal_ids: Iterable[str] | None = None
+    ) -> int:
+        """
+        Hydrate a goal engine from the table (blocking).
+
+        Rows are streamed in creation order, fetched ``batch_size`` at a
+        time, and restored in a single bulk restore, so the engine's indexes
+        are ordered once at the end. Goals the engine already has are kept.
+
+        Args:
+            goal_engine: Engine to fill
+            goal_ids: Only load these goals (default: all goals)
+
+        Returns:
+            Number of goals restored
+        """
+        table = models.Goal.__table__
+        query = select(table).order_by(table.c.created_at)
+        if goal_ids is not None:
+            query = query.where(table.c.id.in_(list(goal_ids)))
+
+        children: list[tuple[str, str]] = []
+
+        def stream(result: Result[Any]) -> Iterator[dict[str, Any]]:
+            for partition in result.partitions():
+                for row in partition:
+                    goal = row_to_goal_dict(row)
+                    if goal["parent_id"]:
+                        children.append((goal["id"], goal["parent_id"]))
+                    yield goal
+
+        with self.engine.connect() as conn:
+            result = conn.execution_options(yield_per=self.batch_size).execute(query)
+            restored = goal_engine.restore_goals(stream(result))
+
+        # Sub-goal lists are derived from parent_id
+        for child_id, parent_id in children:
+            parent = goal_engine.get_goal(parent_id)
+            if parent is not None and child_id not in parent.sub_goals:
+                parent.sub_goals.append(child_id)
+                parent.touch()
+
+        logger.info(f"Loaded {restored} goals from the database")
+        return restored
+
+    async def load_async(
+        self, goal_engine: GoalEngine, goal_ids: Iterable[str] | None = None
+    ) -> int:
+        """
+        Hydrate a goal engine without blocking the event loop.
+
+        Must run before the engine is in use, since restoring happens in a
+        worker thread.
+
+        Args:
+            goal_engine: Engine to fill
+            goal_ids: Only load these goals (default: all goals)
+
+        Returns:
+            Number of goals restored
+        """
+        return await asyncio.to_thread(self.load, goal_engine, goal_ids)
+
+    def close(self) -> None:
+        """Write remaining changes, detach and release connections (blocking)."""
+        try:
+            self.flush()
+        finally:
+            self.detach()
+            self.engine.dispose()
+
+    async def start(self) -> None:
+        """Start the background flusher."""
+        if self._flush_task is not None:
+            return
+        self._running = True
+        self._flush_task = asyncio.create_task(self._flush_loop())
+
+    async def stop(self) -> None:
+        """Stop the background flusher, write remaining changes and detach."""
+        self._running = False
+        self._flush_now.set()
+        if self._flush_task is not None:
+            await self._flush_task
+            self._flush_task = None
+
+        try:
+            await self.flush_async()
+        except Exception as e:
+            logger.error(f"Failed to persist goals on shutdown: {e}")
+        self.detach()
+        self.engine.dispose()
+
+    async def _flush_loop(self) -> None:
+        """Flush every ``flush_interval`` seconds or when a batch is full."""
+        while self._running:
+            try:
+                await asyncio.wait_for(self._flush_now.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._flush_now.clear()
+
+            try:
+                await self.flush_async()
+            except Exception as e:
+                logger.error(f"Failed to persist goals: {e}")
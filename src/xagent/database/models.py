@@ -38,6 +38,7 @@ class GoalStatus(PyEnum):
     COMPLETED = "completed"
     FAILED = "failed"
     BLOCKED = "blocked"
+    PAUSED = "paused"
 
 
 class GoalMode(PyEnum):
@@ -54,10 +55,12 @@ class Goal(Base):
 
     id: Any = Column(String, primary_key=True, index=True)
     description: Any = Column(Text, nullable=False)
-    status: Any = Column(Enum(GoalStatus), default=GoalStatus.PENDING, nullable=False)
+    status: Any = Column(
+        Enum(GoalStatus), default=GoalStatus.PENDING, nullable=False, index=True
+    )
     mode: Any = Column(Enum(GoalMode), default=GoalMode.ONE_TIME, nullable=False)
     priority: Any = Column(Integer, default=5, nullable=False)
-    parent_id = Column(String, ForeignKey("goals.id"), nullable=True)
+    parent_id = Column(String, ForeignKey("goals.id"), nullable=True, index=True)
     created_at = Column(DateTime, default=utc_now, nullable=False)
     updated_at = Column(DateTime, default=utc_now, onupdate=utc_now, nullable=False)
     completed_at = Column(DateTime, nullable=True)
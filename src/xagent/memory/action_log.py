@@ -0,0 +1,451 @@
+"""Append-only action log for goal histories."""
+
+import asyncio
+import time
+from collections.abc import Iterable
+from typing import Any
+
+from xagent.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Distinct action types tracked individually in a summary
+MAX_SUMMARY_ACTION_TYPES = 20
+
+
+def empty_summary() -> dict[str, Any]:
+    """Summary of an empty action history."""
+    return {
+        "total": 0,
+        "succeeded": 0,
+        "failed": 0,
+        "first_iteration": None,
+        "last_iteration": None,
+        "action_types": {},
+        "last_error": None,
+    }
+
+
+def fold_summary(summary: dict[str, Any], record: dict[str, Any]) -> dict[str, Any]:
+    """
+    Add one action record to a rolling summary (in place).
+
+    The summary has a fixed shape, so its size does not grow with the history.
+
+    Args:
+        summary: Summary to update
+        record: Action record
+
+    Returns:
+        The updated summary
+    """
+    result = record.get("result")
+    if not isinstance(result, dict):
+        result = {}
+    iteration = record.get("iteration")
+
+    summary["total"] += 1
+    if result.get("success"):
+        summary["succeeded"] += 1
+    else:
+        summary["failed"] += 1
+        if result.get("error"):
+            summary["last_error"] = str(result["error"])[:200]
+
+    if iteration is not None:
+        if summary["first_iteration"] is None:
+            summary["first_iteration"] = iteration
+        summary["last_iteration"] = iteration
+
+    plan = result.get("plan")
+    action_type = str(plan.get("type", "unknown")) if isinstance(plan, dict) else "unknown"
+    action_types = summary["action_types"]
+    if action_type not in action_types and len(action_types) >= MAX_SUMMARY_ACTION_TYPES:
+        action_type = "other"
+    action_types[action_type] = action_types.get(action_type, 0) + 1
+    return summary
+
+
+def merge_summaries(base: dict[str, Any], newer: dict[str, Any]) -> dict[str, Any]:
+    """
+    Combine the summaries of two consecutive parts of a history.
+
+    Args:
+        base: Summary of the older records
+        newer: Summary of the records that follow
+
+    Returns:
+        A new summary covering both parts
+    """
+    if not newer["total"]:
+        return {**base, "action_types": dict(base["action_types"])}
+    if not base["total"]:
+        return {**newer, "action_types": dict(newer["action_types"])}
+
+    action_types = dict(base["action_types"])
+    for action_type, count in newer["action_types"].items():
+        if action_type not in action_types and len(action_types) >= MAX_SUMMARY_ACTION_TYPES:
+            action_type = "other"
+        action_types[action_type] = action_types.get(action_type, 0) + count
+
+    return {
+        "total": base["total"] + newer["total"],
+        "succeeded": base["succeeded"] + newer["succeeded"],
+        "failed": base["failed"] + newer["failed"],
+        "first_iteration": (
+            base["first_iteration"]
+            if base["first_iteration"] is not None
+            else newer["first_iteration"]
+        ),
+        "last_iteration": (
+            newer["last_iteration"]
+            if newer["last_iteration"] is not None
+            else base["last_iteration"]
+        ),
+        "action_types": action_types,
+        "last_error": newer["last_error"] or base["last_error"],
+    }
+
+
+class GoalActionLog:
+    """
+    Per-goal action history with write coalescing.
+
+    History is stored in medium-term memory as append-only segments::
+
+        goal:{id}:actions          head: {"count": n, "segments": s, "recent": [...],
+                                          "summary": {...}}
+        goal:{id}:actions:{seq}    one flushed batch of records
+
+    Appended records are buffered in process and written as one segment when
+    ``batch_size`` records are pending, when the oldest pending record is
+    older than ``flush_interval`` seconds, or when :meth:`flush` is called
+    (checkpoints, shutdown). The head only keeps the last ``tail_size``
+    records, so each flush writes a bounded amount of data and readers never
+    load the full history. The head also carries a fixed-size summary of
+    the whole history, updated incrementally as records are appended.
+
+    Heads written as a plain list of records (the previous format) are read
+    as-is and moved into segment 0 on the next flush.
+
+    Tails exported into a checkpoint can be restored as read hints, so a
+    restarted loop can interpret without touching memory. Hints are never
+    used for writes: the first flush of a goal reloads its head from memory.
+
+    Per-goal state is kept until :meth:`evict` is called for the goal, which
+    the loop does once the goal is finished, so a long-running process only
+    holds state for goals that can still receive records.
+    """
+
+    def __init__(
+        self,
+        memory: Any,
+        batch_size: int = 20,
+        flush_interval: float = 5.0,
+        tail_size: int = 50,
+    ) -> None:
+        """
+        Initialize the action log.
+
+        Args:
+            memory: Memory layer used for persistence
+            batch_size: Pending records that trigger a flush
+            flush_interval: Maximum age in seconds of a pending record
+            tail_size: Number of recent records kept in the head
+        """
+        self.memory = memory
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+        self.tail_size = max(1, tail_size)
+
+        self._heads: dict[str, dict[str, Any]] = {}
+        self._legacy: dict[str, list[dict[str, Any]]] = {}
+        self._buffers: dict[str, list[dict[str, Any]]] = {}
+        self._buffered_since: dict[str, float] = {}
+        self._pending_summaries: dict[str, dict[str, Any]] = {}
+        self._hints: dict[str, dict[str, Any]] = {}
+        self._touched: set[str] = set()
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    @staticmethod
+    def head_key(goal_id: str) -> str:
+        """Memory key of a goal's log head."""
+        return f"goal:{goal_id}:actions"
+
+    @staticmethod
+    def segment_key(goal_id: str, seq: int) -> str:
+        """Memory key of one flushed segment."""
+        return f"goal:{goal_id}:actions:{seq}"
+
+    def append(self, goal_id: str, record: dict[str, Any]) -> bool:
+        """
+        Buffer a record for a goal.
+
+        The record is visible to :meth:`tail` immediately.
+
+        Args:
+            goal_id: Goal the record belongs to
+            record: Action record
+
+        Returns:
+            True if the goal's buffer is due for a flush
+        """
+        buffer = self._buffers.setdefault(goal_id, [])
+        if not buffer:
+            self._buffered_since[goal_id] = time.monotonic()
+        buffer.append(record)
+        self._touched.add(goal_id)
+        fold_summary(self._pending_summaries.setdefault(goal_id, empty_summary()), record)
+        return self.is_due(goal_id)
+
+    def is_due(self, goal_id: str) -> bool:
+        """Check whether a goal's pending records should be flushed."""
+        buffer = self._buffers.get(goal_id)
+        if not buffer:
+            return False
+        if len(buffer) >= self.batch_size:
+            return True
+        age = time.monotonic() - self._buffered_since.get(goal_id, time.monotonic())
+        return age >= self.flush_interval
+
+    def pending_count(self, goal_id: str | None = None) -> int:
+        """Number of buffered records for one goal, or for all goals."""
+        if goal_id is not None:
+            return len(self._buffers.get(goal_id, []))
+        return sum(len(buffer) for buffer in self._buffers.values())
+
+    async def tail(self, goal_id: str, limit: int | None = None) -> list[dict[str, Any]]:
+        """
+        Get the most recent records of a goal, including buffered ones.
+
+        Args:
+            goal_id: Goal ID
+            limit: Maximum number of records (defaults to ``tail_size``)
+
+        Returns:
+            Records in append order
+        """
+        limit = self.tail_size if limit is None else limit
+        if limit <= 0:
+            return []
+        head = await self._read_head(goal_id)
+        records = head["recent"] + self._buffers.get(goal_id, [])
+        return records[-limit:]
+
+    async def summary(self, goal_id: str) -> dict[str, Any]:
+        """
+        Get the rolling summary of a goal's whole history.
+
+        Args:
+            goal_id: Goal ID
+
+        Returns:
+            Summary including buffered records
+        """
+        head = await self._read_head(goal_id)
+        pending = self._pending_summaries.get(goal_id)
+        return merge_summaries(head["summary"], pending or empty_summary())
+
+    async def count(self, goal_id: str) -> int:
+        """Total number of records of a goal, including buffered ones."""
+        head = await self._read_head(goal_id)
+        return int(head["count"]) + self.pending_count(goal_id)
+
+    async def read_all(self, goal_id: str) -> list[dict[str, Any]]:
+        """
+        Read the full history of a goal.
+
+        This loads every segment and is meant for export and analysis,
+        not for the per-iteration hot path.
+
+        Args:
+            goal_id: Goal ID
+
+        Returns:
+            All records in append order
+        """
+        head = await self._load_head(goal_id)
+        records: list[dict[str, Any]] = list(self._legacy.get(goal_id, []))
+        for seq in range(head["segments"]):
+            segment = await self.memory.get(self.segment_key(goal_id, seq))
+            if segment:
+                records.extend(segment)
+        records.extend(self._buffers.get(goal_id, []))
+        return records
+
+    async def flush_due(self, goal_id: str | None = None) -> None:
+        """Flush goals whose size or time threshold has been reached."""
+        goal_ids = [goal_id] if goal_id is not None else list(self._buffers)
+        for gid in goal_ids:
+            if self.is_due(gid):
+                await self._flush_goal(gid)
+
+    async def flush(self, goal_id: str | None = None) -> None:
+        """Flush pending records for one goal, or for all goals."""
+        goal_ids = [goal_id] if goal_id is not None else list(self._buffers)
+        for gid in goal_ids:
+            await self._flush_goal(gid)
+
+    async def evict(self, goal_id: str) -> None:
+        """
+        Flush a goal's pending records and drop all of its in-process state.
+
+        Later reads reload the head from memory.
+
+        Args:
+            goal_id: Goal ID
+        """
+        await self._flush_goal(goal_id)
+        # A record appended while flushing keeps the goal in the log
+        if self._buffers.get(goal_id):
+            return
+        self._heads.pop(goal_id, None)
+        self._legacy.pop(goal_id, None)
+        self._buffers.pop(goal_id, None)
+        self._buffered_since.pop(goal_id, None)
+        self._pending_summaries.pop(goal_id, None)
+        self._hints.pop(goal_id, None)
+        self._touched.discard(goal_id)
+        lock = self._locks.get(goal_id)
+        if lock is not None and not lock.locked():
+            del self._locks[goal_id]
+
+    def goal_ids(self) -> set[str]:
+        """IDs of the goals the log holds state for."""
+        return set(self._heads) | set(self._hints) | set(self._buffers)
+
+    async def export_tails(self, goal_ids: Iterable[str] | None = None) -> dict[str, Any]:
+        """
+        Export recent records and summaries for a checkpoint.
+
+        Args:
+            goal_ids: Goals to export (defaults to every goal the log knows)
+
+        Returns:
+            Tail dictionaries keyed by goal ID
+        """
+        if goal_ids is None:
+            goal_ids = self.goal_ids()
+
+        tails: dict[str, Any] = {}
+        for goal_id in goal_ids:
+            tails[goal_id] = {
+                "count": await self.count(goal_id),
+                "recent": await self.tail(goal_id),
+                "summary": await self.summary(goal_id),
+            }
+        return tails
+
+    def restore_tails(self, tails: dict[str, Any]) -> None:
+        """
+        Restore exported tails as read hints.
+
+        Args:
+            tails: Output of :meth:`export_tails`
+        """
+        for goal_id, tail in tails.items():
+            if goal_id in self._heads or goal_id in self._buffers:
+                continue
+            self._hints[goal_id] = {
+                "count": tail.get("count", len(tail.get("recent", []))),
+                "recent": list(tail.get("recent", [])),
+                "summary": tail.get("summary") or empty_summary(),
+            }
+
+    def take_touched(self) -> set[str]:
+        """Return and reset the goals that received records since the last call."""
+        touched, self._touched = self._touched, set()
+        return touched
+
+    async def _read_head(self, goal_id: str) -> dict[str, Any]:
+        """Get a goal's head for reading, preferring a restored hint."""
+        head = self._heads.get(goal_id) or self._hints.get(goal_id)
+        if head is not None:
+            return head
+        return await self._load_head(goal_id)
+
+    async def _load_head(self, goal_id: str) -> dict[str, Any]:
+        """Get a goal's head, reading it from memory on first use."""
+        head = self._heads.get(goal_id)
+        if head is not None:
+            return head
+
+        stored = await self.memory.get(self.head_key(goal_id))
+        if isinstance(stored, dict) and "recent" in stored:
+            summary = stored.get("summary")
+            if summary is None:
+                summary = empty_summary()
+                for record in stored["recent"]:
+                    fold_summary(summary, record)
+            head = {
+                "count": stored.get("count", len(stored["recent"])),
+                "segments": stored.get("segments", 0),
+                "recent": list(stored["recent"]),
+                "summary": summary,
+            }
+        elif isinstance(stored, list):
+            # Previous format: the head holds the whole history
+            self._legacy[goal_id] = stored
+            summary = empty_summary()
+            for record in stored:
+                fold_summary(summary, record)
+            head = {
+                "count": len(stored),
+                "segments": 0,
+                "recent": stored[-self.tail_size :],
+                "summary": summary,
+            }
+        else:
+            head = {"count": 0, "segments": 0, "recent": [], "summary": empty_summary()}
+
+        # Another coroutine may have loaded it while we were waiting
+        return self._heads.setdefault(goal_id, head)
+
+    async def _flush_goal(self, goal_id: str) -> None:
+        """Write a goal's pending records as a new segment and update its head."""
+        lock = self._locks.setdefault(goal_id, asyncio.Lock())
+        async with lock:
+            buffer = self._buffers.get(goal_id)
+            if not buffer:
+                return
+
+            records = buffer[:]
+            head = await self._load_head(goal_id)
+            segments = head["segments"]
+
+            legacy = self._legacy.get(goal_id)
+            if legacy is not None:
+                await self.memory.save_medium_term(self.segment_key(goal_id, segments), legacy)
+                segments += 1
+
+            await self.memory.save_medium_term(self.segment_key(goal_id, segments), records)
+            segments += 1
+
+            flushed_summary = empty_summary()
+            for record in records:
+                fold_summary(flushed_summary, record)
+            new_head = {
+                "count": head["count"] + len(records),
+                "segments": segments,
+                "recent": (head["recent"] + records)[-self.tail_size :],
+                "summary": merge_summaries(head["summary"], flushed_summary),
+            }
+            await self.memory.save_medium_term(self.head_key(goal_id), new_head)
+
+            # Records appended during the writes stay buffered
+            self._heads[goal_id] = new_head
+            self._hints.pop(goal_id, None)
+            self._legacy.pop(goal_id, None)
+            del buffer[: len(records)]
+            if buffer:
+                self._buffered_since[goal_id] = time.monotonic()
+                pending = empty_summary()
+                for record in buffer:
+                    fold_summary(pending, record)
+                self._pending_summaries[goal_id] = pending
+            else:
+                del self._buffers[goal_id]
+                self._buffered_since.pop(goal_id, None)
+                self._pending_summaries.pop(goal_id, None)
+
+            logger.debug(f"Flushed {len(records)} actions for goal {goal_id}")
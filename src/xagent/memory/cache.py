@@ -6,13 +6,14 @@ database queries and improve response times for frequently accessed data.
 """
 
 import hashlib
-import json
 import logging
 from functools import wraps
 from typing import Any
 
 import redis.asyncio as redis
 
+from xagent.memory.codec import MemoryCodec, get_memory_codec
+
 logger = logging.getLogger(__name__)
 
 
@@ -40,31 +41,36 @@ class RedisCache:
 
     Features:
     - Async operations for high performance
-    - Automatic serialization/deserialization
+    - Automatic serialization/deserialization through a pluggable codec
     - Configurable TTL per key type
     - Cache invalidation support
     - Bulk operations
     - Pattern-based deletion
     """
 
-    def __init__(self, redis_url: str, key_prefix: str = "xagent"):
+    def __init__(
+        self, redis_url: str, key_prefix: str = "xagent", codec: MemoryCodec | None = None
+    ):
         """
         Initialize Redis cache.
 
         Args:
             redis_url: Redis connection URL
             key_prefix: Global prefix for all cache keys
+            codec: Value codec (default: the configured memory codec)
         """
         self.redis_url = redis_url
         self.key_prefix = key_prefix
+        self.codec = codec or get_memory_codec()
         self._client: redis.Redis | None = None
         self._connected = False
 
     async def connect(self) -> None:
         """Establish Redis connection."""
         try:
+            # Values may be binary codec frames
             self._client = await redis.from_url(
-                self.redis_url, encoding="utf-8", decode_responses=True, max_connections=50
+                self.redis_url, decode_responses=False, max_connections=50
             )
             # Test connection
             ping_result = self._client.ping()
@@ -91,19 +97,19 @@ class RedisCache:
         """Create a namespaced cache key."""
         return f"{self.key_prefix}:{category}:{key}"
 
-    def _serialize(self, value: Any) -> str | None:
-        """Serialize value to JSON string."""
+    def _serialize(self, value: Any) -> bytes | None:
+        """Serialize value with the codec."""
         try:
-            return json.dumps(value, default=str)
+            return self.codec.encode(value, default=str)
         except (TypeError, ValueError) as e:
             logger.error(f"Failed to serialize value: {e}")
             return None
 
-    def _deserialize(self, value: str) -> Any:
-        """Deserialize JSON string to value."""
+    def _deserialize(self, value: bytes | str) -> Any:
+        """Deserialize a value written by any codec configuration."""
         try:
-            return json.loads(value)
-        except json.JSONDecodeError as e:
+            return self.codec.decode(value)
+        except ValueError as e:
             logger.error(f"Failed to deserialize value: {e}")
             return None
 
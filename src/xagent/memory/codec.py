@@ -0,0 +1,291 @@
+"""Value codecs for the memory tiers.
+
+A :class:`MemoryCodec` turns memory values into bytes for Redis, or text
+for PostgreSQL, using a configurable format (JSON or MessagePack) and,
+above a size threshold, compression (zlib or zstd). Encoded values carry a
+small header with their format and compression, so the codec settings can
+change at any time and every stored value stays readable.
+
+Plain uncompressed JSON is written without a header, byte for byte what
+the tiers stored before codecs existed; values without a header are read
+as such legacy JSON.
+
+Binary frame::
+
+    b"\\x00X" format:u8 compression:u8 payload
+
+Text frame (for ``Text`` columns, which cannot hold binary data)::
+
+    "\\x1fX" base64(binary frame)
+
+The fast optional packages are used when installed: ``orjson`` for JSON,
+``msgpack`` (or ``ormsgpack``) for MessagePack and ``zstandard`` for zstd.
+Without them JSON falls back to the standard library, and MessagePack and
+zstd fall back to JSON and zlib with a warning.
+"""
+
+import base64
+import json
+import zlib
+from collections.abc import Callable
+from typing import Any
+
+from xagent.utils.logging import get_logger
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None  # type: ignore[assignment]
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional format
+    msgpack = None  # type: ignore[assignment]
+
+try:
+    import ormsgpack
+except ImportError:  # pragma: no cover - optional format
+    ormsgpack = None  # type: ignore[assignment]
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional compression
+    zstandard = None  # type: ignore[assignment]
+
+logger = get_logger(__name__)
+
+MAGIC = b"\x00X"
+TEXT_MAGIC = "\x1fX"
+
+# Stable on-disk codes; never reorder
+FORMAT_CODES = {"json": ord("j"), "msgpack": ord("m")}
+COMPRESSION_CODES = {"none": ord("0"), "zlib": ord("z"), "zstd": ord("s")}
+_FORMAT_NAMES = {code: name for name, code in FORMAT_CODES.items()}
+_COMPRESSION_NAMES = {code: name for name, code in COMPRESSION_CODES.items()}
+
+_DEFAULT_LEVELS = {"zlib": 6, "zstd": 3}
+
+
+def json_dumps(value: Any, default: Callable[[Any], Any] | None = None) -> bytes:
+    """
+    Encode a value as compact UTF-8 JSON, with ``orjson`` when available.
+
+    Args:
+        value: Value to encode
+        default: Converter for values JSON cannot represent
+
+    Returns:
+        Encoded JSON
+
+    Raises:
+        TypeError: If the value cannot be encoded
+        ValueError: If the value contains a circular reference
+    """
+    if orjson is not None:
+        try:
+            return orjson.dumps(value, default=default, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            # orjson is stricter (e.g. integers above 64 bits); let json decide
+            pass
+    return json.dumps(value, default=default).encode("utf-8")
+
+
+def json_loads(data: bytes | str) -> Any:
+    """
+    Decode JSON, with ``orjson`` when available.
+
+    Raises:
+        ValueError: If the data is not valid JSON
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # Accept what the standard library accepts, such as NaN
+            pass
+    return json.loads(data)
+
+
+def _msgpack_dumps(value: Any, default: Callable[[Any], Any] | None) -> bytes:
+    """Encode a value as MessagePack."""
+    if msgpack is not None:
+        return bytes(msgpack.packb(value, default=default, use_bin_type=True))
+    return bytes(ormsgpack.packb(value, default=default, option=ormsgpack.OPT_NON_STR_KEYS))
+
+
+def _msgpack_loads(data: bytes) -> Any:
+    """Decode MessagePack."""
+    if msgpack is not None:
+        return msgpack.unpackb(data, raw=False, strict_map_key=False)
+    if ormsgpack is not None:
+        return ormsgpack.unpackb(data)
+    raise ValueError("msgpack value found but no MessagePack package is installed")
+
+
+class MemoryCodec:
+    """Encodes memory values with a format tag and optional compression."""
+
+    def __init__(
+        self,
+        format: str = "json",
+        compression: str = "none",
+        compress_threshold: int = 1024,
+        compression_level: int | None = None,
+    ) -> None:
+        """
+        Initialize the codec.
+
+        Args:
+            format: ``json`` or ``msgpack``
+            compression: ``none``, ``zlib`` or ``zstd``
+            compress_threshold: Only payloads of at least this many bytes
+                are compressed
+            compression_level: Compression level (default: 6 for zlib,
+                3 for zstd)
+
+        Raises:
+            ValueError: If the format or compression is unknown
+        """
+        if format not in FORMAT_CODES:
+            raise ValueError(f"Unknown memory codec format: {format}")
+        if compression not in COMPRESSION_CODES:
+            raise ValueError(f"Unknown memory codec compression: {compression}")
+
+        if format == "msgpack" and msgpack is None and ormsgpack is None:
+            logger.warning("msgpack is not installed; memory values are encoded as JSON")
+            format = "json"
+        if compression == "zstd" and zstandard is None:
+            logger.warning("zstandard is not installed; memory values are compressed with zlib")
+            compression = "zlib"
+
+        self.format = format
+        self.compression = compression
+        self.compress_threshold = max(0, compress_threshold)
+        self.compression_level = (
+            compression_level
+            if compression_level is not None
+            else _DEFAULT_LEVELS.get(compression, 0)
+        )
+
+    def encode(self, value: Any, default: Callable[[Any], Any] | None = None) -> bytes:
+        """
+        Encode a value.
+
+        Args:
+            value: Value to encode
+            default: Converter for values the format cannot represent
+
+        Returns:
+            Plain JSON, or a tagged binary frame
+
+        Raises:
+            TypeError: If the value cannot be encoded
+            ValueError: If the value contains a circular reference
+        """
+        if self.format == "msgpack":
+            payload = _msgpack_dumps(value, default)
+        else:
+            payload = json_dumps(value, default)
+
+        compression = "none"
+        if self.compression != "none" and len(payload) >= self.compress_threshold:
+            compressed = self._compress(payload)
+            if len(compressed) < len(payload):
+                payload = compressed
+                compression = self.compression
+
+        if self.format == "json" and compression == "none":
+            return payload
+        return b"".join(
+            (MAGIC, bytes((FORMAT_CODES[self.format], COMPRESSION_CODES[compression])), payload)
+        )
+
+    def encode_text(self, value: Any, default: Callable[[Any], Any] | None = None) -> str:
+        """
+        Encode a value for a text column.
+
+        Returns:
+            Plain JSON text, or a base64 text frame
+        """
+        data = self.encode(value, default)
+        if not data.startswith(MAGIC):
+            return data.decode("utf-8")
+        return TEXT_MAGIC + base64.b64encode(data).decode("ascii")
+
+    def decode(self, data: bytes | str, text_fallback: bool = False) -> Any:
+        """
+        Decode a value written by any codec configuration.
+
+        Args:
+            data: Stored bytes or text
+            text_fallback: Return data that is neither a frame nor JSON as
+                text instead of raising (for tiers that stored raw strings)
+
+        Returns:
+            Decoded value
+
+        Raises:
+            ValueError: If the data cannot be decoded
+        """
+        if isinstance(data, str):
+            if data.startswith(TEXT_MAGIC):
+                data = base64.b64decode(data[len(TEXT_MAGIC) :])
+            else:
+                return self._decode_legacy(data, text_fallback)
+        elif not data.startswith(MAGIC):
+            return self._decode_legacy(data, text_fallback)
+
+        if len(data) < len(MAGIC) + 2:
+            raise ValueError("Truncated memory value")
+        format = _FORMAT_NAMES.get(data[2])
+        compression = _COMPRESSION_NAMES.get(data[3])
+        if format is None or compression is None:
+            raise ValueError(f"Unknown memory value encoding: {data[2:4]!r}")
+
+        payload = self._decompress(compression, data[4:])
+        if format == "msgpack":
+            return _msgpack_loads(payload)
+        return json_loads(payload)
+
+    def _decode_legacy(self, data: bytes | str, text_fallback: bool) -> Any:
+        """Decode a value stored as plain JSON."""
+        try:
+            return json_loads(data)
+        except ValueError:
+            if not text_fallback:
+                raise
+            return data.decode("utf-8") if isinstance(data, bytes) else data
+
+    def _compress(self, payload: bytes) -> bytes:
+        """Compress a payload with the configured compression."""
+        if self.compression == "zstd":
+            return bytes(zstandard.ZstdCompressor(level=self.compression_level).compress(payload))
+        return zlib.compress(payload, self.compression_level)
+
+    @staticmethod
+    def _decompress(compression: str, payload: bytes) -> bytes:
+        """Decompress a payload."""
+        if compression == "none":
+            return payload
+        if compression == "zlib":
+            return zlib.decompress(payload)
+        if zstandard is None:
+            raise ValueError("zstd value found but zstandard is not installed")
+        return bytes(zstandard.ZstdDecompressor().decompress(payload))
+
+
+_default_codec: MemoryCodec | None = None
+
+
+def get_memory_codec() -> MemoryCodec:
+    """Get the codec configured in the settings."""
+    global _default_codec
+    if _default_codec is None:
+        from xagent.config import settings
+
+        _default_codec = MemoryCodec(
+            format=getattr(settings, "memory_codec_format", "json"),
+            compression=getattr(settings, "memory_codec_compression", "zlib"),
+            compress_threshold=getattr(settings, "memory_codec_compress_threshold", 1024),
+        )
+    return _default_codec
@@ -0,0 +1,207 @@
+"""In-process L0 cache in front of the memory tiers.
+
+:class:`LocalCache` keeps recently read and written memory values in the
+process, so hot keys such as ``goal:{id}:actions`` are served without a
+network hop. It is bounded by entry count and by encoded size, evicts the
+least recently used entries first and expires entries after a TTL, which
+also bounds how stale a value can get if an invalidation from another
+replica is lost.
+
+Values are stored JSON-encoded: every hit returns a fresh copy, so callers
+can mutate results without corrupting the cache, and the encoded length is
+what the byte budget accounts for.
+
+:class:`NegativeCache` is the counterpart for misses: it remembers keys a
+tier did not have, as short-lived tombstones, so repeated lookups of absent
+keys skip that tier.
+"""
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any
+
+from xagent.memory.codec import json_dumps, json_loads
+from xagent.utils.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class LocalCache:
+    """Size-bounded LRU cache with per-entry TTL and byte accounting."""
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the cache.
+
+        Args:
+            max_entries: Maximum number of cached keys
+            max_bytes: Maximum total size of the encoded values
+            ttl: Default seconds an entry stays valid
+            clock: Monotonic time source
+        """
+        self.max_entries = max(1, max_entries)
+        self.max_bytes = max(1, max_bytes)
+        self.ttl = ttl
+        self._clock = clock
+        # key -> (encoded value, expiry time, size)
+        self._entries: OrderedDict[str, tuple[bytes, float, int]] = OrderedDict()
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: object) -> bool:
+        entry = self._entries.get(key)  # type: ignore[call-overload]
+        return entry is not None and entry[1] > self._clock()
+
+    def get(self, key: str) -> Any | None:
+        """
+        Get a cached value.
+
+        Args:
+            key: Memory key
+
+        Returns:
+            A copy of the cached value, or None if it is missing or expired
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if entry[1] <= self._clock():
+            self._remove(key)
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return json_loads(entry[0])
+
+    def put(self, key: str, value: Any, ttl: float | None = None) -> bool:
+        """
+        Cache a value, evicting least recently used entries as needed.
+
+        Args:
+            key: Memory key
+            value: JSON-serializable value
+            ttl: Seconds the entry stays valid; capped at the cache TTL
+
+        Returns:
+            True if the value was cached; values that cannot be encoded or
+            exceed the byte budget on their own are not cached
+        """
+        self._remove(key)
+        try:
+            encoded = json_dumps(value)
+        except (TypeError, ValueError) as e:
+            logger.debug(f"Not caching {key}: {e}")
+            return False
+
+        size = len(encoded)
+        if size > self.max_bytes:
+            return False
+
+        lifetime = self.ttl if ttl is None else min(ttl, self.ttl)
+        self._entries[key] = (encoded, self._clock() + lifetime, size)
+        self.bytes += size
+        while len(self._entries) > self.max_entries or self.bytes > self.max_bytes:
+            _, (_, _, oldest_size) = self._entries.popitem(last=False)
+            self.bytes -= oldest_size
+            self.evictions += 1
+        return True
+
+    def invalidate(self, key: str) -> None:
+        """Drop a key from the cache."""
+        self._remove(key)
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self._entries.clear()
+        self.bytes = 0
+
+    def _remove(self, key: str) -> None:
+        """Remove an entry and release its bytes."""
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.bytes -= entry[2]
+
+    def get_stats(self) -> dict[str, Any]:
+        """
+        Get cache statistics.
+
+        Returns:
+            Entry count, byte usage, hits, misses, evictions and hit rate
+        """
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.bytes,
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups * 100, 2) if lookups else 0.0,
+        }
+
+
+class NegativeCache:
+    """Size-bounded set of short-lived tombstones for keys known to be absent."""
+
+    def __init__(
+        self,
+        max_entries: int = 10000,
+        ttl: float = 5.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        """
+        Initialize the tombstone set.
+
+        Args:
+            max_entries: Maximum number of tombstones; the oldest are dropped
+            ttl: Seconds a tombstone stays valid
+            clock: Monotonic time source
+        """
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self._clock = clock
+        # key -> expiry time, oldest first
+        self._tombstones: OrderedDict[str, float] = OrderedDict()
+        self.hits = 0
+
+    def __len__(self) -> int:
+        return len(self._tombstones)
+
+    def __contains__(self, key: object) -> bool:
+        expires_at = self._tombstones.get(key)  # type: ignore[call-overload]
+        if expires_at is None:
+            return False
+        if expires_at <= self._clock():
+            del self._tombstones[key]  # type: ignore[arg-type]
+            return False
+        self.hits += 1
+        return True
+
+    def add(self, key: str) -> None:
+        """Record that a key is absent."""
+        self._tombstones.pop(key, None)
+        self._tombstones[key] = self._clock() + self.ttl
+        while len(self._tombstones) > self.max_entries:
+            self._tombstones.popitem(last=False)
+
+    def discard(self, key: str) -> None:
+        """Forget a tombstone because the key may exist now."""
+        self._tombstones.pop(key, None)
+
+    def clear(self) -> None:
+        """Drop all tombstones."""
+        self._tombstones.clear()
@@ -1,20 +1,25 @@
 """Memory Layer - Multi-tier memory system for X-Agent."""
 
+import asyncio
 import json
+import uuid
 from abc import ABC, abstractmethod
+from collections.abc import Awaitable, Callable
 from datetime import datetime, timedelta, timezone
 from typing import Any
 
 import chromadb
 import redis.asyncio as aioredis
 from chromadb.config import Settings as ChromaSettings
-from sqlalchemy import Column, DateTime, String, Text
+from sqlalchemy import Column, DateTime, Index, String, Text, select
 from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase
 
 from xagent.config import settings
 from xagent.core.internal_rate_limiting import get_internal_rate_limiter
+from xagent.memory.codec import MemoryCodec, get_memory_codec, json_dumps, json_loads
+from xagent.memory.local_cache import LocalCache, NegativeCache
 from xagent.utils.logging import get_logger
 
 logger = get_logger(__name__)
@@ -41,13 +46,89 @@ class MemoryEntry(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
     expires_at = Column(DateTime, nullable=True)
 
+    # Purges scan expiring entries only; most entries never expire
+    __table_args__ = (
+        Index(
+            "ix_memory_entries_expires_at",
+            "expires_at",
+            postgresql_where=expires_at.isnot(None),
+            sqlite_where=expires_at.isnot(None),
+        ),
+    )
+
+
+def _utcnow() -> datetime:
+    """Current UTC time as the naive datetime stored in ``memory_entries``."""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
+def memory_entry_row(
+    key: str, value: Any, ttl: int | None = None, codec: MemoryCodec | None = None
+) -> dict[str, Any]:
+    """
+    Build a ``memory_entries`` row for a medium-term save.
+
+    Args:
+        key: Memory key
+        value: Value to store
+        ttl: Time to live in seconds (optional)
+        codec: Codec for the content (default: the configured codec)
+
+    Returns:
+        Column values keyed by column name
+    """
+    now = _utcnow()
+    return {
+        "id": key,
+        "content": (codec or get_memory_codec()).encode_text(value),
+        "memory_type": "medium",
+        "entry_metadata": {},
+        "created_at": now,
+        "updated_at": now,
+        "expires_at": now + timedelta(seconds=ttl) if ttl else None,
+    }
+
+
+def memory_entry_upsert(rows: list[dict[str, Any]], dialect: str) -> Any:
+    """
+    Build one multi-row upsert of ``memory_entries`` rows.
+
+    Args:
+        rows: Rows from :func:`memory_entry_row`, at most one per key
+        dialect: SQLAlchemy dialect name of the target database
+
+    Returns:
+        ``INSERT ... ON CONFLICT (id) DO UPDATE`` statement that keeps the
+        original ``created_at``
+
+    Raises:
+        ValueError: If the dialect has no native upsert
+    """
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert  # type: ignore[assignment]
+    else:
+        raise ValueError(f"Upsert is not supported for dialect {dialect}")
+
+    table = MemoryEntry.__table__
+    stmt = insert(table).values(rows)
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.id],
+        set_={
+            column.name: stmt.excluded[column.name]
+            for column in table.columns
+            if column.name not in ("id", "created_at")
+        },
+    )
+
 
 class MemoryStore(ABC):
     """Abstract base class for memory stores."""
 
     @abstractmethod
-    async def save(self, key: str, value: Any, ttl: int | None = None) -> None:
-        """Save a value to memory."""
+    async def save(self, key: str, value: Any, ttl: int | None = None) -> bool | None:
+        """Save a value to memory; False means nothing was stored."""
         pass
 
     @abstractmethod
@@ -72,18 +153,24 @@ class ShortTermMemory(MemoryStore):
     Fast access, TTL-based, for current context and active tasks.
     """
 
-    def __init__(self) -> None:
-        """Initialize short-term memory."""
+    def __init__(self, codec: MemoryCodec | None = None) -> None:
+        """
+        Initialize short-term memory.
+
+        Args:
+            codec: Value codec (default: the configured codec)
+        """
         self.redis: aioredis.Redis | None = None
         self.rate_limiter = get_internal_rate_limiter()
+        self.codec = codec or get_memory_codec()
 
     async def connect(self) -> None:
         """Connect to Redis."""
         try:
+            # Values may be binary codec frames
             self.redis = await aioredis.from_url(
                 settings.redis_url,
-                encoding="utf-8",
-                decode_responses=True,
+                decode_responses=False,
             )
             ping_result = self.redis.ping()
             if hasattr(ping_result, "__await__"):
@@ -96,7 +183,7 @@ class ShortTermMemory(MemoryStore):
             logger.error(f"Failed to connect to Redis: {e}")
             raise
 
-    async def save(self, key: str, value: Any, ttl: int | None = None) -> None:
+    async def save(self, key: str, value: Any, ttl: int | None = None) -> bool:
         """
         Save to short-term memory.
 
@@ -104,28 +191,34 @@ class ShortTermMemory(MemoryStore):
             key: Memory key
             value: Value to store
             ttl: Time to live in seconds (default: 3600 = 1 hour)
+
+        Returns:
+            True if the value was stored, False if it was rate limited or
+            the write failed
         """
         # Check rate limit for memory operations
         if not await self.rate_limiter.check_memory_operation_limit():
             logger.warning(f"Memory save operation rate limited: {key}")
-            return
+            return False
 
         if not self.redis:
             await self.connect()
 
         if not self.redis:
             logger.error("Redis connection not available")
-            return
+            return False
 
         try:
-            serialized = json.dumps(value)
+            serialized = self.codec.encode(value)
             if ttl:
                 await self.redis.setex(f"stm:{key}", ttl, serialized)
             else:
                 await self.redis.setex(f"stm:{key}", 3600, serialized)
             logger.debug(f"Saved to short-term memory: {key}")
+            return True
         except Exception as e:
             logger.error(f"Failed to save to short-term memory: {e}")
+            return False
 
     async def get(self, key: str) -> Any | None:
         """Get from short-term memory."""
@@ -144,8 +237,43 @@ class ShortTermMemory(MemoryStore):
         try:
             value = await self.redis.get(f"stm:{key}")
             if value:
-                return json.loads(value)
+                return self.codec.decode(value)
+            return None
+        except Exception as e:
+            logger.error(f"Failed to get from short-term memory: {e}")
+            return None
+
+    async def get_with_ttl(self, key: str) -> tuple[Any, float | None] | None:
+        """
+        Get from short-term memory together with the key's remaining lifetime.
+
+        Args:
+            key: Memory key
+
+        Returns:
+            Tuple of (value, seconds until Redis expires the key, or None if
+            it does not expire), or None if the key is missing
+        """
+        # Check rate limit for memory operations
+        if not await self.rate_limiter.check_memory_operation_limit():
+            logger.warning(f"Memory get operation rate limited: {key}")
+            return None
+
+        if not self.redis:
+            await self.connect()
+
+        if not self.redis:
+            logger.error("Redis connection not available")
             return None
+
+        try:
+            async with self.redis.pipeline(transaction=False) as pipe:
+                pipe.get(f"stm:{key}")
+                pipe.pttl(f"stm:{key}")
+                value, pttl = await pipe.execute()
+            if not value:
+                return None
+            return self.codec.decode(value), (pttl / 1000 if pttl >= 0 else None)
         except Exception as e:
             logger.error(f"Failed to get from short-term memory: {e}")
             return None
@@ -174,12 +302,51 @@ class MediumTermMemory(MemoryStore):
     """
     Medium-term memory using PostgreSQL.
     Persistent storage for project history and intermediate states.
+
+    Saves are upserts. With a flush interval they are write-behind: saves
+    within the interval are coalesced per key and written as one multi-row
+    ``INSERT ... ON CONFLICT DO UPDATE``, and reads see pending saves.
     """
 
-    def __init__(self) -> None:
-        """Initialize medium-term memory."""
+    def __init__(
+        self,
+        batch_size: int | None = None,
+        flush_interval: float | None = None,
+        codec: MemoryCodec | None = None,
+    ) -> None:
+        """
+        Initialize medium-term memory.
+
+        Args:
+            batch_size: Maximum rows per upsert statement; reaching it also
+                triggers an early flush (default: settings)
+            flush_interval: Seconds saves are collected before they are
+                written; 0 writes every save immediately (default: settings)
+            codec: Value codec (default: the configured codec)
+        """
         self.engine: Any = None
         self.session_maker: Any = None
+        self.codec = codec or get_memory_codec()
+        if batch_size is None:
+            batch_size = getattr(settings, "memory_write_batch_size", 500)
+        if flush_interval is None:
+            flush_interval = getattr(settings, "memory_write_flush_seconds", 0.05)
+        self.batch_size = max(1, batch_size)
+        self.flush_interval = flush_interval
+
+        # Rows waiting to be written, and rows being written, by key
+        self._pending: dict[str, dict[str, Any]] = {}
+        self._inflight: dict[str, dict[str, Any]] = {}
+        self._has_pending = asyncio.Event()
+        self._batch_full = asyncio.Event()
+        self._write_lock = asyncio.Lock()
+        self._closing = asyncio.Event()
+        self._flush_task: asyncio.Task[None] | None = None
+
+    @property
+    def pending_count(self) -> int:
+        """Number of saves waiting to be written."""
+        return len(self._pending)
 
     async def connect(self) -> None:
         """Connect to PostgreSQL."""
@@ -205,9 +372,11 @@ class MediumTermMemory(MemoryStore):
                 self.engine, class_=AsyncSession, expire_on_commit=False
             )
 
-            # Create tables
+            # Create tables, and indexes added since an existing table was created
             async with self.engine.begin() as conn:
                 await conn.run_sync(Base.metadata.create_all)
+                for index in MemoryEntry.__table__.indexes:
+                    await conn.run_sync(index.create, checkfirst=True)
 
             logger.info("Connected to PostgreSQL for medium-term memory")
         except Exception as e:
@@ -230,28 +399,100 @@ class MediumTermMemory(MemoryStore):
             logger.error("PostgreSQL connection not available")
             return
 
-        try:
-            async with self.session_maker() as session:
-                expires_at = None
-                if ttl:
-                    expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl)
-
-                entry = MemoryEntry(
-                    id=key,
-                    content=json.dumps(value) if not isinstance(value, str) else value,
-                    memory_type="medium",
-                    expires_at=expires_at,
-                )
+        row = memory_entry_row(key, value, ttl, self.codec)
+        if self.flush_interval <= 0:
+            try:
+                async with self._write_lock:
+                    await self._write_rows([row])
+                logger.debug(f"Saved to medium-term memory: {key}")
+            except Exception as e:
+                logger.error(f"Failed to save to medium-term memory: {e}")
+            return
 
-                session.add(entry)
-                await session.commit()
+        # A newer save of the same key replaces the pending one
+        self._pending.pop(key, None)
+        self._pending[key] = row
+        self._has_pending.set()
+        if len(self._pending) >= self.batch_size:
+            self._batch_full.set()
+        if self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_loop())
 
-            logger.debug(f"Saved to medium-term memory: {key}")
-        except Exception as e:
-            logger.error(f"Failed to save to medium-term memory: {e}")
+    async def flush(self) -> int:
+        """
+        Write all pending saves now.
+
+        Returns:
+            Number of rows written
+        """
+        async with self._write_lock:
+            if not self._pending:
+                return 0
+            self._inflight, self._pending = self._pending, {}
+            rows = list(self._inflight.values())
+            try:
+                await self._write_rows(rows)
+            except BaseException:
+                # Keep the rows for the next attempt unless saved again since,
+                # also when the write is cancelled
+                self._pending = {**self._inflight, **self._pending}
+                raise
+            finally:
+                self._inflight = {}
+        logger.debug(f"Saved {len(rows)} entries to medium-term memory")
+        return len(rows)
+
+    async def _flush_loop(self) -> None:
+        """
+        Write pending saves once the batch window closes or a batch is full.
+
+        Runs until :meth:`close` sets the closing event; the final flush is
+        left to ``close``.
+        """
+        while not self._closing.is_set():
+            await self._has_pending.wait()
+            if len(self._pending) < self.batch_size and not self._closing.is_set():
+                try:
+                    await asyncio.wait_for(self._batch_full.wait(), self.flush_interval)
+                except asyncio.TimeoutError:
+                    pass
+            if self._closing.is_set():
+                break
+            self._has_pending.clear()
+            self._batch_full.clear()
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Failed to save to medium-term memory: {e}")
+                self._has_pending.set()
+                try:
+                    await asyncio.wait_for(self._closing.wait(), 1.0)
+                except asyncio.TimeoutError:
+                    pass
+
+    async def _write_rows(self, rows: list[dict[str, Any]]) -> None:
+        """Upsert rows in statements of at most ``batch_size`` rows."""
+        dialect = self.engine.dialect.name
+        async with self.engine.begin() as conn:
+            for start in range(0, len(rows), self.batch_size):
+                await conn.execute(
+                    memory_entry_upsert(rows[start : start + self.batch_size], dialect)
+                )
+
+    def _pending_row(self, key: str) -> dict[str, Any] | None:
+        """Get a save of a key that has not been written yet."""
+        row = self._pending.get(key)
+        return row if row is not None else self._inflight.get(key)
 
     async def get(self, key: str) -> Any | None:
         """Get from medium-term memory."""
+        row = self._pending_row(key)
+        if row is not None:
+            expires_at = row["expires_at"]
+            if expires_at and expires_at <= _utcnow():
+                return None
+            return self.codec.decode(row["content"], text_fallback=True)
+
         if not self.session_maker:
             await self.connect()
 
@@ -262,13 +503,8 @@ class MediumTermMemory(MemoryStore):
         try:
             async with self.session_maker() as session:
                 result = await session.get(MemoryEntry, key)
-                if result and (
-                    not result.expires_at or result.expires_at > datetime.now(timezone.utc)
-                ):
-                    try:
-                        return json.loads(result.content)
-                    except json.JSONDecodeError:
-                        return result.content
+                if result and (not result.expires_at or result.expires_at > _utcnow()):
+                    return self.codec.decode(result.content, text_fallback=True)
                 return None
         except Exception as e:
             logger.error(f"Failed to get from medium-term memory: {e}")
@@ -276,6 +512,8 @@ class MediumTermMemory(MemoryStore):
 
     async def delete(self, key: str) -> None:
         """Delete from medium-term memory."""
+        self._pending.pop(key, None)
+
         if not self.session_maker:
             await self.connect()
 
@@ -284,17 +522,76 @@ class MediumTermMemory(MemoryStore):
             return
 
         try:
-            async with self.session_maker() as session:
-                entry = await session.get(MemoryEntry, key)
-                if entry:
-                    await session.delete(entry)
-                    await session.commit()
+            # Wait for an in-flight write of the key so it cannot land afterwards
+            async with self._write_lock, self.session_maker() as session:
+                await session.execute(
+                    MemoryEntry.__table__.delete().where(MemoryEntry.__table__.c.id == key)
+                )
+                await session.commit()
         except Exception as e:
             logger.error(f"Failed to delete from medium-term memory: {e}")
 
+    async def purge_expired(self, batch_size: int = 1000, max_batches: int | None = None) -> int:
+        """
+        Delete expired entries in small batches.
+
+        Each batch deletes at most ``batch_size`` expired rows, found through
+        the expiry index, in its own short transaction, so a large backlog
+        never holds locks for long. On PostgreSQL rows locked by concurrent
+        writers are skipped and picked up by a later run.
+
+        Args:
+            batch_size: Maximum rows deleted per batch
+            max_batches: Stop after this many batches (default: until done)
+
+        Returns:
+            Number of entries deleted
+        """
+        if not self.session_maker:
+            await self.connect()
+
+        table = MemoryEntry.__table__
+        batch_size = max(1, batch_size)
+        deleted = 0
+        batches = 0
+        while max_batches is None or batches < max_batches:
+            expired = (
+                select(table.c.id)
+                .where(table.c.expires_at.isnot(None), table.c.expires_at <= _utcnow())
+                .limit(batch_size)
+            )
+            if self.engine.dialect.name == "postgresql":
+                expired = expired.with_for_update(skip_locked=True)
+            async with self.engine.begin() as conn:
+                result = await conn.execute(table.delete().where(table.c.id.in_(expired)))
+            deleted += result.rowcount
+            batches += 1
+            if result.rowcount < batch_size:
+                break
+
+        if deleted:
+            logger.info(f"Purged {deleted} expired medium-term memory entries")
+        return deleted
+
     async def close(self) -> None:
-        """Close PostgreSQL connection."""
+        """Write pending saves and close the PostgreSQL connection."""
+        if self._flush_task is not None:
+            # Let a write in progress finish instead of cancelling it
+            self._closing.set()
+            self._has_pending.set()
+            self._batch_full.set()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                # Cancelled from outside; flush() put its rows back
+                pass
+            self._flush_task = None
+            self._closing.clear()
         if self.engine:
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Failed to save to medium-term memory on close: {e}")
             await self.engine.dispose()
 
 
@@ -350,7 +647,8 @@ class LongTermMemory(MemoryStore):
             return
 
         try:
-            content = json.dumps(value) if not isinstance(value, str) else value
+            # Documents are embedded, so they stay readable text
+            content = value if isinstance(value, str) else json_dumps(value).decode("utf-8")
 
             # Add to collection
             self.collection.add(
@@ -378,8 +676,8 @@ class LongTermMemory(MemoryStore):
             if result and result["documents"]:
                 content = result["documents"][0]
                 try:
-                    return json.loads(content)
-                except json.JSONDecodeError:
+                    return json_loads(content)
+                except ValueError:
                     return content
             return None
         except Exception as e:
@@ -414,8 +712,8 @@ class LongTermMemory(MemoryStore):
             if results and results["documents"]:
                 for i, doc in enumerate(results["documents"][0]):
                     try:
-                        content = json.loads(doc)
-                    except json.JSONDecodeError:
+                        content = json_loads(doc)
+                    except ValueError:
                         content = doc
 
                     memories.append(
@@ -457,6 +755,14 @@ class LongTermMemory(MemoryStore):
 class MemoryLayer:
     """
     Multi-tier memory system combining short, medium, and long-term memory.
+
+    An in-process L0 cache sits in front of the tiers: reads are served from
+    it without a network hop and every ``save_*`` writes through to it.
+    Misses leave a short-lived tombstone per tier, so lookups of keys that
+    do not exist yet skip the tiers that were just asked. Writes and
+    deletes are announced on a Redis pub/sub channel so other replicas drop
+    their cached copy and tombstones; the TTLs bound staleness if an
+    announcement is missed.
     """
 
     def __init__(self) -> None:
@@ -465,30 +771,65 @@ class MemoryLayer:
         self.medium_term = MediumTermMemory()
         self.long_term = LongTermMemory()
 
+        self.local_cache: LocalCache | None = None
+        if getattr(settings, "memory_cache_enabled", True):
+            self.local_cache = LocalCache(
+                max_entries=getattr(settings, "memory_cache_max_entries", 10000),
+                max_bytes=getattr(settings, "memory_cache_max_bytes", 64 * 1024 * 1024),
+                ttl=getattr(settings, "memory_cache_ttl_seconds", 60.0),
+            )
+        # Tier name -> tombstones of keys the tier did not have
+        self.negative_cache: dict[str, NegativeCache] | None = None
+        if getattr(settings, "memory_negative_cache_enabled", True):
+            self.negative_cache = {
+                tier: NegativeCache(
+                    max_entries=getattr(settings, "memory_negative_cache_max_entries", 10000),
+                    ttl=getattr(settings, "memory_negative_cache_ttl_seconds", 5.0),
+                )
+                for tier in ("short", "medium", "long")
+            }
+        self.invalidation_channel: str | None = getattr(
+            settings, "memory_cache_invalidation_channel", "xagent:memory:invalidate"
+        )
+        self.instance_id = uuid.uuid4().hex
+        self._invalidation_task: asyncio.Task[None] | None = None
+
     async def initialize(self) -> None:
         """Initialize all memory stores."""
         await self.short_term.connect()
         await self.medium_term.connect()
         await self.long_term.connect()
+        if self._caching and self.invalidation_channel and self.short_term.redis:
+            self._invalidation_task = asyncio.create_task(self._listen_for_invalidations())
         logger.info("Memory layer initialized")
 
+    @property
+    def _caching(self) -> bool:
+        """Whether values or tombstones are cached in this process."""
+        return self.local_cache is not None or self.negative_cache is not None
+
     async def save_short_term(self, key: str, value: Any, ttl: int = 3600) -> None:
         """Save to short-term memory (RAM)."""
-        await self.short_term.save(key, value, ttl)
+        if not await self.short_term.save(key, value, ttl):
+            # Nothing was stored, so this process must not read it back
+            return
+        await self._write_through("short", key, value, ttl)
 
     async def save_medium_term(self, key: str, value: Any, ttl: int | None = None) -> None:
         """Save to medium-term memory (Buffer)."""
         await self.medium_term.save(key, value, ttl)
+        await self._write_through("medium", key, value, ttl)
 
     async def save_long_term(
         self, key: str, value: Any, embedding: list[float] | None = None
     ) -> None:
         """Save to long-term memory (Knowledge Store)."""
         await self.long_term.save(key, value, embedding=embedding)
+        await self._write_through("long", key, value)
 
     async def get(self, key: str) -> Any | None:
         """
-        Get value from memory (checks all tiers).
+        Get value from memory (checks the L0 cache, then all tiers).
 
         Args:
             key: Memory key
@@ -496,33 +837,156 @@ class MemoryLayer:
         Returns:
             Value if found, None otherwise
         """
-        # Try short-term first (fastest)
-        value = await self.short_term.get(key)
-        if value is not None:
-            return value
+        if self.local_cache is not None:
+            value = self.local_cache.get(key)
+            if value is not None:
+                return value
+
+        # Try short-term first (fastest); the L0 copy must not outlive Redis's
+        if self.local_cache is not None:
+            entry = await self._get_from("short", self.short_term.get_with_ttl, key)
+            if entry is not None:
+                value, remaining = entry
+                self._fill(key, value, ttl=remaining)
+                return value
+        else:
+            value = await self._get_from("short", self.short_term.get, key)
+            if value is not None:
+                return value
 
         # Try medium-term
-        value = await self.medium_term.get(key)
+        value = await self._get_from("medium", self.medium_term.get, key)
         if value is not None:
             # Cache in short-term for future access
-            await self.short_term.save(key, value, ttl=300)
+            await self._promote(key, value)
             return value
 
         # Try long-term
-        value = await self.long_term.get(key)
+        value = await self._get_from("long", self.long_term.get, key)
         if value is not None:
             # Cache in short-term for future access
-            await self.short_term.save(key, value, ttl=300)
+            await self._promote(key, value)
             return value
 
         return None
 
+    async def _get_from(
+        self, tier: str, fetch: Callable[[str], Awaitable[Any]], key: str
+    ) -> Any | None:
+        """Read a key from one tier unless it is known to be absent there."""
+        if self.negative_cache is None:
+            return await fetch(key)
+        tombstones = self.negative_cache[tier]
+        if key in tombstones:
+            return None
+        value = await fetch(key)
+        if value is None:
+            tombstones.add(key)
+        return value
+
+    async def _promote(self, key: str, value: Any) -> None:
+        """Copy a value found in a slower tier to short-term memory."""
+        await self.short_term.save(key, value, ttl=300)
+        if self.negative_cache is not None:
+            self.negative_cache["short"].discard(key)
+        self._fill(key, value, ttl=300)
+
+    async def delete(self, key: str) -> None:
+        """
+        Delete a value from all tiers and from every replica's L0 cache.
+
+        Args:
+            key: Memory key
+        """
+        if self.local_cache is not None:
+            self.local_cache.invalidate(key)
+        await self.short_term.delete(key)
+        await self.medium_term.delete(key)
+        await self.long_term.delete(key)
+        if self.negative_cache is not None:
+            for tombstones in self.negative_cache.values():
+                tombstones.add(key)
+        await self._announce(key)
+
+    def _fill(self, key: str, value: Any, ttl: float | None = None) -> None:
+        """Cache a value read from a tier."""
+        if self.local_cache is not None:
+            self.local_cache.put(key, value, ttl)
+
+    async def _write_through(
+        self, tier: str, key: str, value: Any, ttl: float | None = None
+    ) -> None:
+        """Cache a saved value and tell other replicas to drop their copies."""
+        if self.negative_cache is not None:
+            self.negative_cache[tier].discard(key)
+        if self.local_cache is not None:
+            self.local_cache.put(key, value, ttl)
+        await self._announce(key)
+
+    async def _announce(self, key: str) -> None:
+        """Publish a key invalidation to other replicas."""
+        if not self._caching or not self.invalidation_channel or not self.short_term.redis:
+            return
+        try:
+            await self.short_term.redis.publish(
+                self.invalidation_channel,
+                json.dumps({"origin": self.instance_id, "key": key}),
+            )
+        except Exception as e:
+            logger.warning(f"Failed to publish memory invalidation for {key}: {e}")
+
+    def _handle_invalidation(self, message: dict[str, Any]) -> None:
+        """Apply an invalidation published by another replica."""
+        if message.get("type") != "message":
+            return
+        try:
+            data = json.loads(message["data"])
+        except (TypeError, ValueError):
+            return
+        key = data.get("key")
+        if data.get("origin") == self.instance_id or not key:
+            return
+        if self.local_cache is not None:
+            self.local_cache.invalidate(key)
+        if self.negative_cache is not None:
+            for tombstones in self.negative_cache.values():
+                tombstones.discard(key)
+
+    async def _listen_for_invalidations(self) -> None:
+        """Drop cache entries and tombstones of keys changed by other replicas."""
+        while True:
+            try:
+                pubsub = self.short_term.redis.pubsub()  # type: ignore[union-attr]
+                await pubsub.subscribe(self.invalidation_channel)
+                try:
+                    async for message in pubsub.listen():
+                        self._handle_invalidation(message)
+                finally:
+                    await pubsub.aclose()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Memory invalidation listener failed: {e}")
+                # Updates may have been missed while disconnected
+                if self.local_cache is not None:
+                    self.local_cache.clear()
+                for tombstones in (self.negative_cache or {}).values():
+                    tombstones.clear()
+                await asyncio.sleep(1.0)
+
     async def search_knowledge(self, query: str, n_results: int = 5) -> list[dict[str, Any]]:
         """Search long-term knowledge base."""
         return await self.long_term.search(query, n_results)
 
     async def close(self) -> None:
         """Close all memory stores."""
+        if self._invalidation_task is not None:
+            self._invalidation_task.cancel()
+            try:
+                await self._invalidation_task
+            except asyncio.CancelledError:
+                pass
+            self._invalidation_task = None
         await self.short_term.close()
         await self.medium_term.close()
         await self.long_term.close()
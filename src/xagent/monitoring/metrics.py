@@ -43,6 +43,14 @@ agent_cognitive_loop_total = Counter(
     registry=registry,
 )
 
+agent_cognitive_loop_phase_duration = Histogram(
+    "agent_cognitive_loop_phase_duration_seconds",
+    "Time spent in each cognitive loop phase",
+    ["phase"],  # perception, interpretation, planning, execution, reflection, checkpoint
+    buckets=[0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 2.0, 5.0, 10.0, 30.0],
+    registry=registry,
+)
+
 agent_goal_completion_time = Histogram(
     "agent_goal_completion_seconds",
     "Time taken to complete goals",
@@ -328,6 +336,10 @@ class MetricsCollector:
         agent_cognitive_loop_duration.observe(duration)
         agent_cognitive_loop_total.labels(status=status).inc()
 
+    def record_loop_phase(self, phase: str, duration: float) -> None:
+        """Record the duration of one cognitive loop phase."""
+        agent_cognitive_loop_phase_duration.labels(phase=phase).observe(duration)
+
     def record_goal_completion(self, duration: float, mode: str = "goal_oriented") -> None:
         """Record goal completion time."""
         agent_goal_completion_time.labels(mode=mode).observe(duration)
@@ -80,6 +80,18 @@ class PerformanceProfiler:
         self._record_timing(name, duration)
         return duration
 
+    def record_timing(self, name: str, duration: float) -> None:
+        """
+        Record a duration measured elsewhere.
+
+        Args:
+            name: Measurement name
+            duration: Duration in seconds
+        """
+        if not self._enabled:
+            return
+        self._record_timing(name, duration)
+
     def _record_timing(self, name: str, duration: float) -> None:
         """
         Record a timing measurement.
@@ -490,6 +490,8 @@ class LangGraphPlanner:
             "quality_score": state["quality_score"],
             "remaining_actions": len(state["prioritized_actions"]) - 1,
             "sub_goals": [sg["id"] for sg in state["sub_goals"]],
+            "sub_goal_specs": state["sub_goals"],
+            "dependencies": state["dependencies"],
         }
 
         state["plan"] = plan
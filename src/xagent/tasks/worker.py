@@ -10,6 +10,7 @@ This module defines the core tasks that can be executed by Celery workers:
 
 # mypy: disable-error-code="call-arg,attr-defined,operator,index"
 
+import asyncio
 import logging
 from typing import Any
 
@@ -245,6 +246,7 @@ def process_goal(
         )
 
         # Import here to avoid circular dependencies
+        from xagent.config import settings
         from xagent.core.goal_engine import GoalEngine
         from xagent.core.planner import Planner
 
@@ -252,31 +254,49 @@ def process_goal(
         goal_engine = GoalEngine()
         planner = Planner()
 
-        # Get the goal
-        goal = goal_engine.get_goal(goal_id)
-        if not goal:
-            raise ValueError(f"Goal not found: {goal_id}")
+        # Share goal state with other workers through the goals table
+        goal_store = None
+        if getattr(settings, "goal_persistence_enabled", False):
+            from xagent.database.goal_store import GoalStore
 
-        # Create a plan for the goal
-        plan = planner.create_plan(goal)
+            goal_store = GoalStore(
+                batch_size=getattr(settings, "goal_persistence_batch_size", 500)
+            )
 
-        # Process the plan
-        result = {
-            "status": "success",
-            "goal_status": goal.status,
-            "sub_goals_created": 0,
-            "error": None,
-        }
-
-        # Create sub-goals if the plan suggests decomposition
-        if plan and plan.get("sub_goals"):
-            for sub_goal_desc in plan["sub_goals"]:
-                goal_engine.create_goal(
-                    description=sub_goal_desc,
-                    parent_id=goal_id,
-                    priority=goal.priority,
-                )
-                result["sub_goals_created"] += 1
+        try:
+            if goal_store:
+                goal_store.load(goal_engine, goal_ids=[goal_id])
+                goal_store.attach(goal_engine)
+
+            # Get the goal
+            goal = goal_engine.get_goal(goal_id)
+            if not goal:
+                raise ValueError(f"Goal not found: {goal_id}")
+
+            # Create a plan for the goal
+            plan = planner.create_plan(goal)
+
+            # Process the plan
+            result = {
+                "status": "success",
+                "goal_status": goal.status,
+                "sub_goals_created": 0,
+                "error": None,
+            }
+
+            # Create sub-goals if the plan suggests decomposition
+            if plan and plan.get("sub_goals"):
+                for sub_goal_desc in plan["sub_goals"]:
+                    goal_engine.create_goal(
+                        description=sub_goal_desc,
+                        parent_id=goal_id,
+                        priority=goal.priority,
+                    )
+                    result["sub_goals_created"] += 1
+        finally:
+            # Release connections on failure too; retries open a fresh store
+            if goal_store:
+                goal_store.close()
 
         logger.info(
             f"Goal {goal_id} processed successfully",
@@ -294,6 +314,14 @@ def process_goal(
         raise self.retry(exc=exc)
 
 
+async def _purge_expired_memory(medium_term: Any, batch_size: int) -> int:
+    """Purge expired medium-term memory entries and close the connection."""
+    try:
+        return int(await medium_term.purge_expired(batch_size=batch_size))
+    finally:
+        await medium_term.close()
+
+
 @celery_app.task(
     bind=True,
     name="xagent.tasks.worker.cleanup_memory",
@@ -307,14 +335,13 @@ def cleanup_memory(
     """
     Clean up old memory entries.
 
-    This task runs periodically to:
-    1. Remove old/expired memory entries
-    2. Optimize vector store
-    3. Archive completed goals
+    This task runs periodically to remove expired memory entries. Finished
+    goals are archived by the agent process, which owns the goal archive,
+    so ``goals_archived`` is always 0.
 
     Args:
-        max_age_hours: Maximum age of memory entries to keep
-        batch_size: Number of entries to process per batch
+        max_age_hours: Unused; kept for compatibility with scheduled calls
+        batch_size: Number of expired entries deleted per batch
 
     Returns:
         Dict with cleanup results:
@@ -332,9 +359,6 @@ def cleanup_memory(
         )
 
         # Import here to avoid circular dependencies
-        from datetime import datetime, timedelta
-
-        from xagent.core.goal_engine import GoalEngine
         from xagent.memory.memory_layer import MemoryLayer
 
         result = {
@@ -344,25 +368,20 @@ def cleanup_memory(
             "error": None,
         }
 
-        # Clean up old memory entries
+        # Purge expired medium-term memory entries
         try:
-            MemoryLayer()
-            datetime.now() - timedelta(hours=max_age_hours)
-
-            # This is a placeholder - implement based on your memory layer API
-            # result["entries_removed"] = memory.cleanup(cutoff_time, batch_size)
-            logger.info("Memory cleanup completed (placeholder)")
+            memory = MemoryLayer()
+            result["entries_removed"] = asyncio.run(
+                _purge_expired_memory(memory.medium_term, batch_size)
+            )
+            logger.info(f"Memory cleanup completed: {result['entries_removed']} entries purged")
         except Exception as e:
             logger.warning(f"Memory cleanup skipped: {str(e)}")
 
-        # Archive completed goals
-        try:
-            GoalEngine()
-            # This is a placeholder - implement based on your goal engine API
-            # result["goals_archived"] = goal_engine.archive_completed_goals()
-            logger.info("Goal archival completed (placeholder)")
-        except Exception as e:
-            logger.warning(f"Goal archival skipped: {str(e)}")
+        # Goal archival is not done here: the running agent owns the goal
+        # archive and its in-memory goals, and archives them itself (see
+        # XAgent.archive_goals). A second writer would race its appends and
+        # its write-behind flushes would re-insert the deleted rows.
 
         logger.info(
             "Memory cleanup completed",
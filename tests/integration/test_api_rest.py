@@ -315,3 +315,160 @@ def test_api_consistency(client):
         assert "name" in data
         assert "version" in data
         assert "status" in data
+
+
+def test_goals_list_cursor_pagination(client, auth_headers):
+    """Test following next_cursor walks through all goals."""
+    from unittest.mock import MagicMock, patch
+
+    from xagent.core.goal_engine import GoalEngine
+
+    engine = GoalEngine()
+    for i in range(5):
+        engine.create_goal(f"Goal {i}", priority=i)
+    mock_agent = MagicMock()
+    mock_agent.goal_engine = engine
+
+    with patch("xagent.api.rest.agent", mock_agent):
+        first = client.get("/goals?page_size=2&sort_by=priority", headers=auth_headers).json()
+        second = client.get(
+            f"/goals?page_size=2&sort_by=priority&cursor={first['next_cursor']}",
+            headers=auth_headers,
+        ).json()
+        bad = client.get("/goals?cursor=garbage", headers=auth_headers)
+
+    assert first["total"] == 5
+    assert first["total_pages"] == 3
+    assert [g["priority"] for g in first["goals"]] == [4, 3]
+    assert [g["priority"] for g in second["goals"]] == [2, 1]
+    assert bad.status_code == 400
+
+
+def test_goal_hierarchy_stream(client, auth_headers):
+    """Test the hierarchy endpoint streams one JSON line per goal."""
+    import json
+    from unittest.mock import MagicMock, patch
+
+    from xagent.core.goal_engine import GoalEngine
+
+    engine = GoalEngine()
+    root = engine.create_goal("Root")
+    child = engine.create_goal("Child", parent_id=root.id)
+    engine.create_goal("Grandchild", parent_id=child.id)
+    mock_agent = MagicMock()
+    mock_agent.goal_engine = engine
+
+    # Yield to the event loop after every goal to exercise the batching path
+    with (
+        patch("xagent.api.rest.agent", mock_agent),
+        patch("xagent.api.rest.GOAL_HIERARCHY_YIELD_EVERY", 1),
+    ):
+        response = client.get(f"/goals/{root.id}/hierarchy?depth=1", headers=auth_headers)
+        detail = client.get(f"/goals/{root.id}?depth=0", headers=auth_headers).json()
+
+    assert response.status_code == 200
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [(line["depth"], line["goal"]["description"]) for line in lines] == [
+        (0, "Root"),
+        (1, "Child"),
+    ]
+    assert detail["hierarchy"]["omitted_sub_goals"] == 1
+    assert detail["progress"]["total_descendants"] == 2
+
+
+def test_goals_bulk_create(client, auth_headers):
+    """Test bulk creation builds trees and reports errors per item."""
+    from unittest.mock import MagicMock, patch
+
+    from xagent.core.goal_engine import GoalEngine
+
+    engine = GoalEngine()
+    mock_agent = MagicMock()
+    mock_agent.goal_engine = engine
+    payload = {
+        "goals": [
+            {"description": "Root", "ref": "root", "priority": 8},
+            {"description": "Child", "parent_ref": "root"},
+            {"description": "Too important", "priority": 11, "ref": "bad"},
+            {"description": "Orphan", "parent_ref": "bad"},
+        ]
+    }
+
+    with patch("xagent.api.rest.agent", mock_agent):
+        response = client.post("/goals/bulk", json=payload, headers=auth_headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 2
+    assert data["failed"] == 2
+    assert [r["index"] for r in data["results"]] == [0, 1, 2, 3]
+    assert "priority" in data["results"][2]["error"]
+    assert "unknown parent_ref" in data["results"][3]["error"]
+
+    root = engine.get_goal(data["results"][0]["id"])
+    assert root.sub_goals == [data["results"][1]["id"]]
+
+
+def test_goals_bulk_create_rejects_malformed_items_individually(client, auth_headers):
+    """Test malformed items are reported per item while valid ones are created."""
+    from unittest.mock import MagicMock, patch
+
+    from xagent.core.goal_engine import GoalEngine
+
+    engine = GoalEngine()
+    mock_agent = MagicMock()
+    mock_agent.goal_engine = engine
+    payload = {
+        "goals": [
+            {"description": "Valid", "ref": "ok"},
+            {"ref": "missing", "priority": 3},
+            {"description": "Wrong type", "priority": "high", "ref": "typed"},
+            "not an object",
+            {"description": "Also valid", "parent_ref": "ok"},
+        ]
+    }
+
+    with patch("xagent.api.rest.agent", mock_agent):
+        response = client.post("/goals/bulk", json=payload, headers=auth_headers)
+
+    assert response.status_code == 200
+    data = response.json()
+    assert data["created"] == 2
+    assert data["failed"] == 3
+    results = data["results"]
+    assert [r["index"] for r in results] == [0, 1, 2, 3, 4]
+    assert results[1]["ref"] == "missing"
+    assert "description" in results[1]["error"]
+    assert results[2]["ref"] == "typed"
+    assert "priority" in results[2]["error"]
+    assert results[3]["ref"] is None and results[3]["error"]
+    assert engine.get_goal(results[4]["id"]).parent_id == results[0]["id"]
+
+
+def test_goal_changes_stream(client, auth_headers):
+    """Test goal changes are streamed as server-sent events."""
+    import json
+    from unittest.mock import MagicMock, patch
+
+    from xagent.core.goal_engine import GoalEngine, GoalStatus
+    from xagent.core.goal_feed import GoalFeed
+
+    engine = GoalEngine()
+    feed = GoalFeed()
+    feed.attach(engine)
+    goal = engine.create_goal("Goal")
+    engine.update_goal_status(goal.id, GoalStatus.COMPLETED)
+    mock_agent = MagicMock()
+    mock_agent.goal_feed = feed
+
+    with patch("xagent.api.rest.agent", mock_agent):
+        response = client.get(
+            "/goals/changes?limit=1", headers={**auth_headers, "Last-Event-ID": "1"}
+        )
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/event-stream")
+    lines = response.text.strip().split("\n")
+    assert lines[:2] == ["id: 2", "event: status"]
+    assert json.loads(lines[2][len("data: ") :])["data"]["status"] == "completed"
+    assert feed.subscriber_count == 0
@@ -287,3 +287,34 @@ def test_websocket_timestamp_format(client):
         timestamp = data["timestamp"]
         assert "T" in timestamp  # ISO format includes T between date and time
         assert isinstance(timestamp, str)
+
+
+@pytest.mark.asyncio
+async def test_connection_manager_forwards_goal_changes():
+    """Test goal change deltas are broadcast to connected clients."""
+    import asyncio
+    from unittest.mock import AsyncMock, MagicMock
+
+    from xagent.api.websocket import ConnectionManager
+    from xagent.core.goal_engine import GoalEngine
+    from xagent.core.goal_feed import GoalFeed
+
+    engine = GoalEngine()
+    feed = GoalFeed()
+    feed.attach(engine)
+    connection = MagicMock()
+    connection.send_json = AsyncMock()
+    manager = ConnectionManager()
+    manager.active_connections.add(connection)
+
+    task = asyncio.create_task(manager.forward_goal_changes(feed))
+    await asyncio.sleep(0)
+    goal = engine.create_goal("Goal")
+    await asyncio.sleep(0.01)
+    feed.close()
+    await asyncio.wait_for(task, timeout=1)
+
+    message = connection.send_json.await_args.args[0]
+    assert message["type"] == "goal_change"
+    assert message["event"] == "created"
+    assert message["goal_id"] == goal.id
@@ -216,13 +216,10 @@ async def test_recovery_from_missing_goal(cognitive_loop, goal_engine):
     await asyncio.sleep(0.8)
     await cognitive_loop.stop()
 
-    try:
-        await asyncio.wait_for(loop_task, timeout=2.0)
-    except asyncio.TimeoutError:
-        pass
-
-    # Loop should handle missing goal gracefully
-    assert cognitive_loop.iteration_count > 0
+    # A dangling active goal with nothing else to do counts as idle: the loop
+    # parks on the idle fast path without iterating and stops cleanly
+    await asyncio.wait_for(loop_task, timeout=2.0)
+    assert cognitive_loop.iteration_count == 0
     assert cognitive_loop.state == CognitiveState.STOPPED
 
 
@@ -0,0 +1,176 @@
+"""Tests for the goal action log."""
+
+import pytest
+from unittest.mock import AsyncMock, MagicMock
+
+from xagent.memory.action_log import GoalActionLog
+
+
+@pytest.fixture
+def store():
+    """In-memory stand-in for medium-term memory."""
+    return {}
+
+
+@pytest.fixture
+def mock_memory(store):
+    """Memory layer backed by a dict."""
+    memory = MagicMock()
+
+    async def get(key):
+        return store.get(key)
+
+    async def save_medium_term(key, value, ttl=None):
+        store[key] = value
+
+    memory.get = AsyncMock(side_effect=get)
+    memory.save_medium_term = AsyncMock(side_effect=save_medium_term)
+    return memory
+
+
+@pytest.fixture
+def action_log(mock_memory):
+    """Action log with small thresholds."""
+    return GoalActionLog(mock_memory, batch_size=3, flush_interval=60.0, tail_size=4)
+
+
+def record(i):
+    """Build an action record."""
+    return {"iteration": i, "result": {"success": True}}
+
+
+@pytest.mark.asyncio
+async def test_append_is_buffered(action_log, mock_memory):
+    """Test records are not written until a threshold is reached."""
+    assert action_log.append("g1", record(1)) is False
+    assert action_log.append("g1", record(2)) is False
+    await action_log.flush_due()
+
+    mock_memory.save_medium_term.assert_not_called()
+    assert action_log.pending_count("g1") == 2
+
+
+@pytest.mark.asyncio
+async def test_batch_size_triggers_flush(action_log, store):
+    """Test a full batch is written as one segment plus the head."""
+    for i in range(1, 4):
+        due = action_log.append("g1", record(i))
+    assert due is True
+
+    await action_log.flush_due("g1")
+
+    assert [r["iteration"] for r in store["goal:g1:actions:0"]] == [1, 2, 3]
+    assert store["goal:g1:actions"]["count"] == 3
+    assert store["goal:g1:actions"]["segments"] == 1
+    assert action_log.pending_count() == 0
+
+
+@pytest.mark.asyncio
+async def test_flush_interval_triggers_flush(mock_memory, store):
+    """Test old buffered records are flushed even if the batch is not full."""
+    log = GoalActionLog(mock_memory, batch_size=100, flush_interval=0.0)
+    log.append("g1", record(1))
+
+    await log.flush_due()
+
+    assert "goal:g1:actions:0" in store
+
+
+@pytest.mark.asyncio
+async def test_head_is_bounded(action_log, store):
+    """Test the head keeps only the recent tail while segments keep everything."""
+    for i in range(1, 10):
+        action_log.append("g1", record(i))
+        await action_log.flush_due()
+    await action_log.flush()
+
+    head = store["goal:g1:actions"]
+    assert head["count"] == 9
+    assert [r["iteration"] for r in head["recent"]] == [6, 7, 8, 9]
+    assert [r["iteration"] for r in await action_log.read_all("g1")] == list(range(1, 10))
+
+
+@pytest.mark.asyncio
+async def test_tail_includes_buffered_records(action_log, mock_memory, store):
+    """Test tail reads the head once and merges buffered records."""
+    store["goal:g1:actions"] = {"count": 2, "segments": 1, "recent": [record(1), record(2)]}
+    action_log.append("g1", record(3))
+
+    tail = await action_log.tail("g1")
+    tail_again = await action_log.tail("g1", limit=2)
+
+    assert [r["iteration"] for r in tail] == [1, 2, 3]
+    assert [r["iteration"] for r in tail_again] == [2, 3]
+    mock_memory.get.assert_called_once_with("goal:g1:actions")
+
+
+@pytest.mark.asyncio
+async def test_legacy_list_head_is_migrated(action_log, store):
+    """Test a history stored as a plain list is read and moved to a segment."""
+    store["goal:g1:actions"] = [record(1), record(2)]
+
+    assert [r["iteration"] for r in await action_log.tail("g1")] == [1, 2]
+
+    action_log.append("g1", record(3))
+    await action_log.flush()
+
+    assert [r["iteration"] for r in store["goal:g1:actions:0"]] == [1, 2]
+    assert [r["iteration"] for r in store["goal:g1:actions:1"]] == [3]
+    assert store["goal:g1:actions"]["count"] == 3
+    assert await action_log.count("g1") == 3
+    assert [r["iteration"] for r in await action_log.read_all("g1")] == [1, 2, 3]
+
+
+@pytest.mark.asyncio
+async def test_summary_covers_whole_history(action_log, store):
+    """Test the summary spans flushed, buffered and trimmed records."""
+    for i in range(1, 8):
+        result = {"success": i % 2 == 0, "plan": {"type": "think"}}
+        if i == 7:
+            result["error"] = "boom"
+        action_log.append("g1", {"iteration": i, "result": result})
+        await action_log.flush_due()
+
+    summary = await action_log.summary("g1")
+
+    assert summary["total"] == 7
+    assert summary["succeeded"] == 3
+    assert summary["failed"] == 4
+    assert summary["first_iteration"] == 1
+    assert summary["last_iteration"] == 7
+    assert summary["action_types"] == {"think": 7}
+    assert summary["last_error"] == "boom"
+    # Six records were flushed in two batches; the head summary matches them
+    assert store["goal:g1:actions"]["summary"]["total"] == 6
+
+
+@pytest.mark.asyncio
+async def test_summary_action_types_are_bounded(mock_memory):
+    """Test the summary does not grow with the number of distinct action types."""
+    log = GoalActionLog(mock_memory, batch_size=1000)
+    for i in range(50):
+        log.append("g1", {"iteration": i, "result": {"plan": {"type": f"type_{i}"}}})
+
+    summary = await log.summary("g1")
+
+    assert len(summary["action_types"]) <= 21
+    assert sum(summary["action_types"].values()) == 50
+
+
+@pytest.mark.asyncio
+async def test_evict_flushes_and_drops_goal_state(action_log, store):
+    """Test eviction persists pending records and forgets the goal."""
+    action_log.append("g1", record(1))
+    action_log.append("g2", record(1))
+    action_log.restore_tails({"g3": {"count": 1, "recent": [record(1)]}})
+
+    await action_log.evict("g1")
+    await action_log.evict("g3")
+
+    assert store["goal:g1:actions"]["count"] == 1
+    assert action_log.goal_ids() == {"g2"}
+    assert "g1" not in action_log._locks
+    assert "g1" not in action_log.take_touched()
+    assert set(await action_log.export_tails()) == {"g2"}
+    # Evicted goals are still readable from memory
+    assert [r["iteration"] for r in await action_log.tail("g1")] == [1]
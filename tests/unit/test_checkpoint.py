@@ -2,15 +2,24 @@
 
 import asyncio
 import json
-import pickle
+from datetime import timedelta
 from pathlib import Path
 from unittest.mock import AsyncMock, Mock
 
 import pytest
 
+from xagent.core.checkpoint import (
+    CheckpointError,
+    CheckpointStore,
+    FrameKind,
+    apply_delta,
+    decode_frame,
+    encode_frame,
+)
 from xagent.core.cognitive_loop import CognitiveLoop, CognitiveState, LoopPhase
 from xagent.core.executor import Executor
-from xagent.core.goal_engine import GoalEngine
+from xagent.core.goal_archive import GoalArchive
+from xagent.core.goal_engine import GoalEngine, GoalStatus
 from xagent.core.planner import Planner
 from xagent.memory.memory_layer import MemoryLayer
 
@@ -31,6 +40,7 @@ def mock_goal_engine():
     engine = Mock(spec=GoalEngine)
     engine.get_active_goal = Mock(return_value=None)
     engine.get_next_goal = Mock(return_value=None)
+    engine.get_all_goals = Mock(return_value=[])
     engine.active_goal_id = None
     engine.set_active_goal = Mock()
     return engine
@@ -114,17 +124,15 @@ class TestCheckpointFunctionality:
         # Save checkpoint
         await cognitive_loop.save_checkpoint()
 
-        # Verify files were created
-        json_path = cognitive_loop.checkpoint_dir / "checkpoint.json"
-        pickle_path = cognitive_loop.checkpoint_dir / "checkpoint.pkl"
+        # Verify the snapshot was written atomically
+        snapshot_path = cognitive_loop.checkpoint_dir / "checkpoint.bin"
+        assert snapshot_path.exists()
+        assert not list(cognitive_loop.checkpoint_dir.glob("*.tmp"))
 
-        assert json_path.exists()
-        assert pickle_path.exists()
+        # Verify snapshot content
+        kind, _, data, _ = decode_frame(snapshot_path.read_bytes())
 
-        # Verify JSON content
-        with open(json_path, "r") as f:
-            data = json.load(f)
-        
+        assert kind == FrameKind.FULL
         assert data["iteration_count"] == 10
         assert data["state"] == "acting"
         assert data["task_results"] == [True, True, False]
@@ -167,13 +175,8 @@ class TestCheckpointFunctionality:
     async def test_load_checkpoint_no_file(self, cognitive_loop):
         """Test loading checkpoint when no file exists."""
         # Ensure no checkpoint file exists
-        json_path = cognitive_loop.checkpoint_dir / "checkpoint.json"
-        pickle_path = cognitive_loop.checkpoint_dir / "checkpoint.pkl"
-        
-        if json_path.exists():
-            json_path.unlink()
-        if pickle_path.exists():
-            pickle_path.unlink()
+        for name in ("checkpoint.bin", "checkpoint.delta", "checkpoint.json"):
+            (cognitive_loop.checkpoint_dir / name).unlink(missing_ok=True)
 
         # Try to load checkpoint
         loaded = await cognitive_loop.load_checkpoint()
@@ -217,11 +220,7 @@ class TestCheckpointFunctionality:
         await cognitive_loop.save_checkpoint()
 
         # Verify no files were created
-        json_path = cognitive_loop.checkpoint_dir / "checkpoint.json"
-        pickle_path = cognitive_loop.checkpoint_dir / "checkpoint.pkl"
-
-        assert not json_path.exists()
-        assert not pickle_path.exists()
+        assert not list(cognitive_loop.checkpoint_dir.iterdir())
 
     @pytest.mark.asyncio
     async def test_checkpoint_with_active_goal(self, cognitive_loop, mock_goal_engine):
@@ -278,8 +277,8 @@ class TestCheckpointFunctionality:
             pass
 
         # Verify checkpoint was created
-        pickle_path = cognitive_loop.checkpoint_dir / "checkpoint.pkl"
-        assert pickle_path.exists()
+        snapshot_path = cognitive_loop.checkpoint_dir / "checkpoint.bin"
+        assert snapshot_path.exists()
 
         # Verify last checkpoint was updated
         assert cognitive_loop.last_checkpoint_iteration > 0
@@ -346,11 +345,11 @@ class TestCheckpointErrorHandling:
     @pytest.mark.asyncio
     async def test_save_checkpoint_with_error(self, cognitive_loop, monkeypatch):
         """Test checkpoint save handles errors gracefully."""
-        # Make pickle.dump raise an error
-        def mock_dump(*args, **kwargs):
-            raise Exception("Simulated pickle error")
+        # Make the snapshot write raise an error
+        def mock_write_full(*args, **kwargs):
+            raise Exception("Simulated write error")
 
-        monkeypatch.setattr(pickle, "dump", mock_dump)
+        monkeypatch.setattr(CheckpointStore, "write_full", mock_write_full)
 
         # Should not raise exception
         await cognitive_loop.save_checkpoint()
@@ -362,8 +361,8 @@ class TestCheckpointErrorHandling:
     async def test_load_checkpoint_with_corrupted_file(self, cognitive_loop):
         """Test loading from corrupted checkpoint file."""
         # Create a corrupted checkpoint file
-        pickle_path = cognitive_loop.checkpoint_dir / "checkpoint.pkl"
-        with open(pickle_path, "wb") as f:
+        snapshot_path = cognitive_loop.checkpoint_dir / "checkpoint.bin"
+        with open(snapshot_path, "wb") as f:
             f.write(b"corrupted data")
 
         # Should handle error gracefully
@@ -376,6 +375,7 @@ class TestCheckpointErrorHandling:
         # Create loop with non-existent checkpoint dir
         mock_goal_engine = Mock(spec=GoalEngine)
         mock_goal_engine.get_active_goal = Mock(return_value=None)
+        mock_goal_engine.get_all_goals = Mock(return_value=[])
         mock_memory = Mock(spec=MemoryLayer)
         mock_planner = Mock(spec=Planner)
         mock_executor = Mock(spec=Executor)
@@ -395,3 +395,254 @@ class TestCheckpointErrorHandling:
 
         # Verify directory was created
         assert loop.checkpoint_dir.exists()
+
+
+class TestIncrementalCheckpoints:
+    """Test the compact frame format and delta checkpoints."""
+
+    def test_frame_roundtrip(self):
+        """Test frames decode to what was encoded."""
+        frame = encode_frame(FrameKind.DELTA, 7, {"state": {"iteration_count": 3}})
+
+        kind, base_id, data, end = decode_frame(frame)
+
+        assert kind == FrameKind.DELTA
+        assert base_id == 7
+        assert data == {"state": {"iteration_count": 3}}
+        assert end == len(frame)
+
+    def test_corrupted_frame_is_rejected(self):
+        """Test checksum mismatches are detected."""
+        frame = bytearray(encode_frame(FrameKind.FULL, 1, {"a": 1}))
+        frame[-1] ^= 0xFF
+
+        with pytest.raises(CheckpointError):
+            decode_frame(bytes(frame))
+
+    @pytest.mark.asyncio
+    async def test_deltas_between_full_snapshots(self, cognitive_loop):
+        """Test later checkpoints append deltas until the next full snapshot."""
+        cognitive_loop.checkpoint_full_interval = 2
+        store = CheckpointStore(cognitive_loop.checkpoint_dir)
+
+        cognitive_loop.iteration_count = 10
+        await cognitive_loop.save_checkpoint()
+        snapshot = store.full_path.read_bytes()
+
+        cognitive_loop.iteration_count = 20
+        await cognitive_loop.save_checkpoint()
+        cognitive_loop.iteration_count = 30
+        await cognitive_loop.save_checkpoint()
+
+        # Two deltas appended, snapshot untouched
+        assert store.full_path.read_bytes() == snapshot
+        assert store.delta_path.exists()
+        _, state = store.load()
+        assert state["iteration_count"] == 30
+
+        # Third checkpoint after the full one is a new snapshot
+        cognitive_loop.iteration_count = 40
+        await cognitive_loop.save_checkpoint()
+        assert not store.delta_path.exists()
+        _, state = store.load()
+        assert state["iteration_count"] == 40
+
+    @pytest.mark.asyncio
+    async def test_delta_contains_only_changes(self, cognitive_loop):
+        """Test deltas carry changed keys and changed goals only."""
+        store = CheckpointStore(cognitive_loop.checkpoint_dir)
+        cognitive_loop.task_results = [True]
+        cognitive_loop.iteration_count = 10
+        await cognitive_loop.save_checkpoint()
+
+        goal = Mock()
+        goal.id = "goal-1"
+        goal.to_dict = Mock(return_value={"id": "goal-1", "status": "completed"})
+        cognitive_loop.goal_engine.get_goal = Mock(return_value=goal)
+        cognitive_loop._on_goal_change("status", goal)
+
+        cognitive_loop.iteration_count = 20
+        await cognitive_loop.save_checkpoint()
+
+        _, _, delta, _ = decode_frame(store.delta_path.read_bytes())
+        assert delta["state"]["iteration_count"] == 20
+        assert "task_results" not in delta["state"]
+        assert delta["goals"] == {"goal-1": {"id": "goal-1", "status": "completed"}}
+
+        _, state = store.load()
+        assert state["goals"]["goal-1"]["status"] == "completed"
+
+    def test_apply_delta_removes_goals(self):
+        """Test removed goals and their tails are dropped from the state."""
+        state = {
+            "goals": {"a": {"id": "a"}, "b": {"id": "b"}},
+            "action_tails": {"a": {"count": 1}},
+        }
+
+        apply_delta(state, {"goals": {"c": {"id": "c"}}, "removed": ["a"]})
+
+        assert set(state["goals"]) == {"b", "c"}
+        assert state["action_tails"] == {}
+
+    @pytest.mark.asyncio
+    async def test_archived_goals_stay_gone_after_restore(
+        self, mock_memory, mock_planner, mock_executor, tmp_path
+    ):
+        """Test goals archived after the snapshot are not restored from it."""
+        engine = GoalEngine(archive=GoalArchive(tmp_path / "archive" / "goals.bin"))
+        finished = engine.create_goal("Finished")
+        kept = engine.create_goal("Kept")
+        engine.update_goal_status(finished.id, GoalStatus.COMPLETED)
+        loop = CognitiveLoop(engine, mock_memory, mock_planner, mock_executor)
+        loop.checkpoint_dir = tmp_path / "checkpoints"
+        await loop.save_checkpoint()
+
+        assert engine.archive_completed_goals(timedelta(0)) == [finished.id]
+        await loop.save_checkpoint()
+
+        _, _, delta, _ = decode_frame(CheckpointStore(loop.checkpoint_dir).delta_path.read_bytes())
+        assert delta["removed"] == [finished.id]
+
+        new_engine = GoalEngine()
+        new_loop = CognitiveLoop(new_engine, mock_memory, mock_planner, mock_executor)
+        new_loop.checkpoint_dir = loop.checkpoint_dir
+        await new_loop.load_checkpoint()
+
+        assert set(new_engine.goals) == {kept.id}
+
+    @pytest.mark.asyncio
+    async def test_torn_delta_is_ignored(self, cognitive_loop):
+        """Test a partially written trailing delta does not break loading."""
+        store = CheckpointStore(cognitive_loop.checkpoint_dir)
+        cognitive_loop.iteration_count = 10
+        await cognitive_loop.save_checkpoint()
+        cognitive_loop.iteration_count = 20
+        await cognitive_loop.save_checkpoint()
+
+        with open(store.delta_path, "ab") as f:
+            f.write(encode_frame(FrameKind.DELTA, 0, {"state": {}})[:10])
+
+        loaded = await cognitive_loop.load_checkpoint()
+
+        assert loaded is True
+        assert cognitive_loop.iteration_count == 20
+
+    @pytest.mark.asyncio
+    async def test_load_legacy_json_checkpoint(self, cognitive_loop):
+        """Test checkpoints in the previous JSON format can still be loaded."""
+        legacy_path = cognitive_loop.checkpoint_dir / "checkpoint.json"
+        with open(legacy_path, "w") as f:
+            json.dump({"iteration_count": 33, "state": "thinking"}, f)
+
+        loaded = await cognitive_loop.load_checkpoint()
+
+        assert loaded is True
+        assert cognitive_loop.iteration_count == 33
+
+    @pytest.mark.asyncio
+    async def test_failed_write_forces_full_snapshot(self, cognitive_loop, monkeypatch):
+        """Test a failed delta write is followed by a full snapshot."""
+        store = CheckpointStore(cognitive_loop.checkpoint_dir)
+        cognitive_loop.iteration_count = 10
+        await cognitive_loop.save_checkpoint()
+
+        def failing_append(*args, **kwargs):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(CheckpointStore, "append_delta", failing_append)
+        cognitive_loop.iteration_count = 20
+        await cognitive_loop.save_checkpoint()
+        monkeypatch.undo()
+
+        cognitive_loop.iteration_count = 30
+        await cognitive_loop.save_checkpoint()
+
+        kind, _, state, _ = decode_frame(store.full_path.read_bytes())
+        assert kind == FrameKind.FULL
+        assert state["iteration_count"] == 30
+
+
+class TestFullStateRestore:
+    """Test checkpoints capture and restore goals, perceptions and action tails."""
+
+    @pytest.mark.asyncio
+    async def test_restart_restores_full_state(self, mock_memory, mock_planner, mock_executor, tmp_path):
+        """Test a fresh process resumes with the goal graph and backlog intact."""
+        engine = GoalEngine()
+        parent = engine.create_goal("Parent goal", priority=2)
+        child = engine.create_goal("Child goal", parent_id=parent.id)
+        engine.set_active_goal(child.id)
+
+        loop = CognitiveLoop(engine, mock_memory, mock_planner, mock_executor)
+        loop.checkpoint_dir = tmp_path / "checkpoints"
+        loop.iteration_count = 12
+        await loop.add_perception({"type": "command", "content": "queued"})
+        loop.action_log.append(child.id, {"iteration": 12, "result": {"success": True}})
+        await loop.save_checkpoint()
+
+        # Perceptions are still queued after checkpointing
+        assert loop.perception_queue.qsize() == 1
+
+        new_engine = GoalEngine()
+        new_memory = Mock(spec=MemoryLayer)
+        new_memory.get = AsyncMock(side_effect=AssertionError("memory should not be read"))
+        new_loop = CognitiveLoop(new_engine, new_memory, mock_planner, mock_executor)
+        new_loop.checkpoint_dir = loop.checkpoint_dir
+
+        assert await new_loop.load_checkpoint() is True
+
+        assert new_loop.iteration_count == 12
+        assert set(new_engine.goals) == {parent.id, child.id}
+        assert new_engine.get_goal(parent.id).sub_goals == [child.id]
+        assert new_engine.get_active_goal().id == child.id
+        assert new_engine.get_goal(child.id).status == GoalStatus.IN_PROGRESS
+        assert new_loop.perception_queue.get_nowait()["content"] == "queued"
+
+        context = await new_loop._interpret({"inputs": [], "active_goal": {"id": child.id}})
+        assert context["memory_context"]["recent_actions"][0]["iteration"] == 12
+
+    @pytest.mark.asyncio
+    async def test_delta_carries_goal_and_tail_changes(self, mock_memory, mock_planner, mock_executor, tmp_path):
+        """Test goals and actions added after a snapshot are restored from deltas."""
+        engine = GoalEngine()
+        loop = CognitiveLoop(engine, mock_memory, mock_planner, mock_executor)
+        loop.checkpoint_dir = tmp_path / "checkpoints"
+        await loop.save_checkpoint()
+
+        goal = engine.create_goal("Created after the snapshot")
+        loop.action_log.append(goal.id, {"iteration": 1, "result": {"success": False}})
+        await loop.save_checkpoint()
+
+        _, state = CheckpointStore(loop.checkpoint_dir).load()
+        assert goal.id in state["goals"]
+        assert state["action_tails"][goal.id]["count"] == 1
+
+        new_engine = GoalEngine()
+        new_loop = CognitiveLoop(new_engine, mock_memory, mock_planner, mock_executor)
+        new_loop.checkpoint_dir = loop.checkpoint_dir
+        await new_loop.load_checkpoint()
+
+        assert new_engine.get_goal(goal.id).description == "Created after the snapshot"
+
+    @pytest.mark.asyncio
+    async def test_finished_goals_leave_action_log(self, mock_memory, mock_planner, mock_executor, tmp_path):
+        """Test finished goals are evicted from the action log and full snapshots."""
+        engine = GoalEngine()
+        loop = CognitiveLoop(engine, mock_memory, mock_planner, mock_executor)
+        loop.checkpoint_dir = tmp_path / "checkpoints"
+        done = engine.create_goal("Finishes")
+        live = engine.create_goal("Keeps running")
+        for goal in (done, live):
+            loop.action_log.append(goal.id, {"iteration": 1, "result": {"success": True}})
+
+        engine.update_goal_status(done.id, GoalStatus.COMPLETED)
+        await loop._checkpoint_if_due()
+
+        assert loop.action_log.goal_ids() == {live.id}
+        # The finished goal's records were written before it was dropped
+        head_keys = {call.args[0] for call in mock_memory.save_medium_term.call_args_list}
+        assert f"goal:{done.id}:actions" in head_keys
+
+        await loop.save_checkpoint(full=True)
+        _, state = CheckpointStore(loop.checkpoint_dir).load()
+        assert set(state["action_tails"]) == {live.id}
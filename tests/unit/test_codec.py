@@ -0,0 +1,99 @@
+"""Tests for memory value codecs."""
+
+import json
+import zlib
+
+import pytest
+
+from xagent.memory import codec as codec_module
+from xagent.memory.codec import MAGIC, TEXT_MAGIC, MemoryCodec
+
+VALUE = {"recent": [{"iteration": i, "result": {"success": True}} for i in range(100)]}
+
+
+def test_plain_json_stays_untagged():
+    """Test small uncompressed JSON is stored as before codecs existed."""
+    codec = MemoryCodec(compression="zlib", compress_threshold=1024)
+
+    data = codec.encode({"a": 1})
+
+    assert json.loads(data) == {"a": 1}
+    assert codec.encode_text("text") == '"text"'
+
+
+@pytest.mark.parametrize("compression", ["none", "zlib", "zstd"])
+@pytest.mark.parametrize("format", ["json", "msgpack"])
+def test_roundtrip(format, compression):
+    """Test every format and compression reads back what was written."""
+    codec = MemoryCodec(format=format, compression=compression, compress_threshold=64)
+
+    data = codec.encode(VALUE)
+    text = codec.encode_text(VALUE)
+
+    assert codec.decode(data) == VALUE
+    assert codec.decode(text) == VALUE
+    if compression != "none":
+        assert len(data) < len(json.dumps(VALUE))
+
+
+def test_values_stay_readable_across_settings():
+    """Test a codec decodes values written with other settings and legacy JSON."""
+    reader = MemoryCodec()
+    written = [
+        MemoryCodec(format="msgpack").encode(VALUE),
+        MemoryCodec(compression="zlib", compress_threshold=0).encode_text(VALUE),
+        json.dumps(VALUE),
+        json.dumps(VALUE).encode("utf-8"),
+    ]
+
+    assert all(reader.decode(data) == VALUE for data in written)
+    assert reader.decode("plain text", text_fallback=True) == "plain text"
+    with pytest.raises(ValueError):
+        reader.decode(b"not json")
+
+
+def test_frame_header():
+    """Test tagged frames carry their format and compression."""
+    codec = MemoryCodec(compression="zlib", compress_threshold=0)
+
+    data = codec.encode(VALUE)
+    text = codec.encode_text(VALUE)
+
+    assert data[:4] == MAGIC + b"jz"
+    assert json.loads(zlib.decompress(data[4:])) == VALUE
+    assert text.startswith(TEXT_MAGIC)
+    with pytest.raises(ValueError):
+        codec.decode(MAGIC + b"?z")
+
+
+def test_incompressible_values_are_not_compressed():
+    """Test compression is skipped when it does not shrink the value."""
+    codec = MemoryCodec(compression="zlib", compress_threshold=0)
+
+    assert codec.encode("x") == b'"x"'
+
+
+def test_missing_packages_fall_back(monkeypatch):
+    """Test unavailable formats and compressions degrade to built-in ones."""
+    monkeypatch.setattr(codec_module, "msgpack", None)
+    monkeypatch.setattr(codec_module, "ormsgpack", None)
+    monkeypatch.setattr(codec_module, "zstandard", None)
+
+    codec = MemoryCodec(format="msgpack", compression="zstd")
+
+    assert codec.format == "json"
+    assert codec.compression == "zlib"
+    with pytest.raises(ValueError):
+        MemoryCodec(format="pickle")
+
+
+def test_default_converter():
+    """Test values the format cannot represent use the default converter."""
+    codec = MemoryCodec()
+
+    with pytest.raises(TypeError):
+        codec.encode({"obj": object()})
+    assert codec.decode(codec.encode({"n": 1.5, "s": {1}}, default=list)) == {
+        "n": 1.5,
+        "s": [1],
+    }
@@ -9,8 +9,9 @@ from xagent.core.cognitive_loop import (
     CognitiveLoop,
     CognitiveState,
     LoopPhase,
+    SchedulerMode,
 )
-from xagent.core.goal_engine import GoalEngine, Goal, GoalStatus, GoalMode
+from xagent.core.goal_engine import GoalEngine, Goal, GoalStatus, GoalMode, Priority
 
 
 @pytest.fixture
@@ -216,6 +217,21 @@ class TestCognitiveLoopInterpretation:
         # Memory should be queried
         mock_memory.get.assert_called_once()
 
+    @pytest.mark.asyncio
+    async def test_interpret_bounds_recent_actions(self, cognitive_loop, mock_memory):
+        """Test only the action window is passed on, with a summary of the rest."""
+        cognitive_loop.recent_actions_window = 3
+        mock_memory.get.return_value = [
+            {"iteration": i, "result": {"success": True}} for i in range(1, 31)
+        ]
+        perception = {"inputs": [], "active_goal": {"id": "test-goal"}}
+
+        context = await cognitive_loop._interpret(perception)
+
+        recent = context["memory_context"]["recent_actions"]
+        assert [a["iteration"] for a in recent] == [28, 29, 30]
+        assert context["memory_context"]["actions_summary"]["total"] == 30
+
     @pytest.mark.asyncio
     async def test_interpret_command_input(self, cognitive_loop):
         """Test interpretation with command input."""
@@ -523,3 +539,513 @@ class TestCognitiveLoopPhases:
 
         # Executor should not be called
         mock_executor.execute.assert_not_called()
+
+
+class TestEventDrivenScheduler:
+    """Tests for the event-driven scheduler mode."""
+
+    @pytest.mark.asyncio
+    async def test_default_mode_is_polling(self, cognitive_loop):
+        """Test polling remains the default scheduler."""
+        assert cognitive_loop.scheduler_mode == SchedulerMode.POLLING
+
+    @pytest.mark.asyncio
+    async def test_registers_goal_listener(self, mock_goal_engine, cognitive_loop):
+        """Test the loop subscribes to goal engine changes."""
+        mock_goal_engine.add_listener.assert_called_once_with(cognitive_loop._on_goal_change)
+
+    @pytest.mark.asyncio
+    async def test_idle_loop_parks(self, cognitive_loop):
+        """Test an idle loop does not spin in event mode."""
+        cognitive_loop.scheduler_mode = SchedulerMode.EVENT
+        cognitive_loop.idle_wakeup_interval = 60.0
+        cognitive_loop.max_iterations = 100
+        cognitive_loop.running = True
+
+        task = asyncio.create_task(cognitive_loop._loop())
+        await asyncio.sleep(0.3)
+
+        assert cognitive_loop.iteration_count == 1
+
+        await cognitive_loop.stop()
+        await asyncio.wait_for(task, timeout=1.0)
+
+    @pytest.mark.asyncio
+    async def test_perception_wakes_loop(self, cognitive_loop):
+        """Test a new perception triggers an iteration immediately."""
+        cognitive_loop.scheduler_mode = SchedulerMode.EVENT
+        cognitive_loop.idle_wakeup_interval = 60.0
+        cognitive_loop.max_iterations = 100
+        cognitive_loop.running = True
+
+        task = asyncio.create_task(cognitive_loop._loop())
+        await asyncio.sleep(0.05)
+        assert cognitive_loop.iteration_count == 1
+
+        await cognitive_loop.add_perception({"type": "event", "content": "ping"})
+        await asyncio.sleep(0.05)
+
+        assert cognitive_loop.iteration_count == 2
+        assert cognitive_loop.perception_queue.empty()
+
+        await cognitive_loop.stop()
+        await asyncio.wait_for(task, timeout=1.0)
+
+    @pytest.mark.asyncio
+    async def test_goal_change_wakes_loop(self, cognitive_loop):
+        """Test goal engine notifications trigger an iteration."""
+        cognitive_loop.scheduler_mode = SchedulerMode.EVENT
+        cognitive_loop.idle_wakeup_interval = 60.0
+        cognitive_loop.max_iterations = 100
+        cognitive_loop.running = True
+
+        task = asyncio.create_task(cognitive_loop._loop())
+        await asyncio.sleep(0.05)
+
+        cognitive_loop._on_goal_change("created", MagicMock())
+        await asyncio.sleep(0.05)
+
+        assert cognitive_loop.iteration_count == 2
+
+        await cognitive_loop.stop()
+        await asyncio.wait_for(task, timeout=1.0)
+
+    @pytest.mark.asyncio
+    async def test_timer_wakes_idle_loop(self, cognitive_loop):
+        """Test the idle timer still wakes a parked loop."""
+        cognitive_loop.scheduler_mode = SchedulerMode.EVENT
+        cognitive_loop.idle_wakeup_interval = 0.05
+        cognitive_loop.max_iterations = 3
+        cognitive_loop.running = True
+
+        await asyncio.wait_for(cognitive_loop._loop(), timeout=1.0)
+
+        assert cognitive_loop.iteration_count == 3
+
+
+class TestIdleFastPath:
+    """Tests for the idle fast path."""
+
+    @pytest.mark.asyncio
+    async def test_idle_iterations_are_skipped(self, mock_goal_engine, cognitive_loop):
+        """Test an idle loop builds no context and records no metrics."""
+        mock_goal_engine.has_pending_goals = MagicMock(return_value=False)
+        cognitive_loop.metrics = MagicMock()
+        cognitive_loop.rate_limiter = MagicMock()
+        cognitive_loop.rate_limiter.check_iteration_limit = AsyncMock(return_value=True)
+        cognitive_loop.running = True
+
+        task = asyncio.create_task(cognitive_loop._loop())
+        await asyncio.sleep(0.25)
+
+        assert cognitive_loop.iteration_count == 0
+        mock_goal_engine.get_next_goal.assert_not_called()
+        cognitive_loop.rate_limiter.check_iteration_limit.assert_not_called()
+        cognitive_loop.metrics.record_cognitive_loop.assert_not_called()
+
+        # A perception ends the idle phase
+        await cognitive_loop.add_perception({"type": "event", "content": "ping"})
+        await asyncio.sleep(0.15)
+        assert cognitive_loop.iteration_count >= 1
+
+        await cognitive_loop.stop()
+        await asyncio.wait_for(task, timeout=1.0)
+
+    def test_is_idle(self, mock_goal_engine, cognitive_loop):
+        """Test idle detection uses the pending goals signal."""
+        mock_goal_engine.has_pending_goals = MagicMock(return_value=False)
+        assert cognitive_loop._is_idle() is True
+
+        mock_goal_engine.has_pending_goals.return_value = True
+        assert cognitive_loop._is_idle() is False
+
+        mock_goal_engine.has_pending_goals.return_value = False
+        mock_goal_engine.get_active_goal.return_value = MagicMock()
+        assert cognitive_loop._is_idle() is False
+
+
+class TestPipelinedReflection:
+    """Tests for pipelined reflection persistence."""
+
+    @pytest.fixture
+    def pipelined_loop(self, cognitive_loop, mock_goal_engine):
+        """Cognitive loop with pipelining enabled and an active goal."""
+        cognitive_loop.pipeline_enabled = True
+        cognitive_loop.pipeline_depth = 2
+        cognitive_loop._pipeline_slots = asyncio.Semaphore(2)
+        cognitive_loop.action_log.batch_size = 1
+        mock_goal_engine.get_active_goal.return_value = Goal(
+            id="test-goal", description="Test", status=GoalStatus.IN_PROGRESS
+        )
+        return cognitive_loop
+
+    @pytest.mark.asyncio
+    async def test_reflect_returns_before_persistence(self, pipelined_loop, mock_memory):
+        """Test reflection does not wait for slow memory writes."""
+        release = asyncio.Event()
+
+        async def slow_save(*args, **kwargs):
+            await release.wait()
+
+        mock_memory.save_short_term = AsyncMock(side_effect=slow_save)
+
+        await asyncio.wait_for(pipelined_loop._reflect({"success": True}), timeout=0.5)
+        assert len(pipelined_loop._inflight_reflections) == 1
+
+        release.set()
+        await pipelined_loop.drain_reflections()
+        assert not pipelined_loop._inflight_reflections
+        # One segment plus the log head
+        assert mock_memory.save_medium_term.call_count == 2
+
+    @pytest.mark.asyncio
+    async def test_writes_are_ordered_per_goal(self, pipelined_loop, mock_memory):
+        """Test goal history writes land in iteration order."""
+        store: dict = {}
+
+        async def save_medium_term(key, value, ttl=None):
+            await asyncio.sleep(0.01)
+            store[key] = value
+
+        async def get(key):
+            return store.get(key)
+
+        mock_memory.get = AsyncMock(side_effect=get)
+        mock_memory.save_medium_term = AsyncMock(side_effect=save_medium_term)
+
+        for i in range(1, 4):
+            pipelined_loop.iteration_count = i
+            await pipelined_loop._reflect({"success": False})
+
+        await pipelined_loop.drain_reflections()
+
+        history = await pipelined_loop.action_log.read_all("test-goal")
+        assert [record["iteration"] for record in history] == [1, 2, 3]
+        assert [r["iteration"] for r in store["goal:test-goal:actions"]["recent"]] == [1, 2, 3]
+        assert pipelined_loop.action_log.pending_count() == 0
+
+    @pytest.mark.asyncio
+    async def test_in_flight_depth_is_bounded(self, pipelined_loop, mock_memory):
+        """Test reflection blocks once the pipeline is full."""
+        release = asyncio.Event()
+
+        async def slow_save(*args, **kwargs):
+            await release.wait()
+
+        mock_memory.save_short_term = AsyncMock(side_effect=slow_save)
+
+        await pipelined_loop._reflect({"success": False})
+        await pipelined_loop._reflect({"success": False})
+
+        third = asyncio.create_task(pipelined_loop._reflect({"success": False}))
+        await asyncio.sleep(0.05)
+        assert not third.done()
+
+        release.set()
+        await asyncio.wait_for(third, timeout=0.5)
+        await pipelined_loop.drain_reflections()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_submit_creates_no_coroutine(self, pipelined_loop, mock_memory):
+        """Test a submit cancelled while waiting for a slot leaves nothing behind."""
+        pipelined_loop._pipeline_slots = asyncio.Semaphore(0)
+        pipelined_loop._persist_reflection = MagicMock()
+
+        submit = asyncio.create_task(pipelined_loop._submit_reflection(1, {}, "test-goal"))
+        await asyncio.sleep(0.01)
+        submit.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await submit
+
+        pipelined_loop._persist_reflection.assert_not_called()
+        assert not pipelined_loop._inflight_reflections
+
+    @pytest.mark.asyncio
+    async def test_interpret_sees_unpersisted_actions(self, pipelined_loop, mock_memory):
+        """Test interpretation merges records that are not written yet."""
+        mock_memory.get.return_value = [{"iteration": 1, "result": {}}]
+        pipelined_loop.action_log.batch_size = 10
+        pipelined_loop.action_log.append("test-goal", {"iteration": 2, "result": {}})
+
+        context = await pipelined_loop._interpret(
+            {"inputs": [], "active_goal": {"id": "test-goal"}}
+        )
+
+        iterations = [a["iteration"] for a in context["memory_context"]["recent_actions"]]
+        assert iterations == [1, 2]
+
+
+class TestConcurrentGoals:
+    """Tests for multi-goal concurrent execution."""
+
+    @pytest.fixture
+    def goal_engine(self):
+        """Real goal engine with three independent goals."""
+        engine = GoalEngine()
+        for i in range(3):
+            engine.create_goal(description=f"Goal {i}", priority=i)
+        return engine
+
+    @pytest.fixture
+    def concurrent_loop(self, goal_engine, mock_memory, mock_planner, mock_executor):
+        """Cognitive loop driving up to two goals at once."""
+        loop = CognitiveLoop(
+            goal_engine=goal_engine,
+            memory=mock_memory,
+            planner=mock_planner,
+            executor=mock_executor,
+        )
+        loop.max_concurrent_goals = 2
+        loop.scheduler_mode = SchedulerMode.EVENT
+        loop.idle_wakeup_interval = 0.05
+        loop.checkpoint_enabled = False
+        loop.rate_limiter = MagicMock()
+        loop.rate_limiter.check_iteration_limit = AsyncMock(return_value=True)
+        mock_planner.create_plan.return_value = {"type": "think"}
+        return loop
+
+    @pytest.mark.asyncio
+    async def test_goals_run_concurrently(self, concurrent_loop, mock_executor, goal_engine):
+        """Test up to max_concurrent_goals goals execute at the same time."""
+        running = 0
+        peak = 0
+
+        async def execute(plan):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.02)
+            running -= 1
+            return {"done": True}
+
+        mock_executor.execute.side_effect = execute
+        concurrent_loop.running = True
+
+        task = asyncio.create_task(concurrent_loop._loop())
+        await asyncio.sleep(0.2)
+
+        assert peak == 2
+        in_progress = goal_engine.list_goals(status=GoalStatus.IN_PROGRESS)
+        assert len(in_progress) == 2
+        # Highest priority goals are picked first
+        assert {g.priority for g in in_progress} == {1, 2}
+
+        await concurrent_loop.stop()
+        await asyncio.wait_for(task, timeout=2.0)
+        assert not concurrent_loop._goal_workers
+
+    @pytest.mark.asyncio
+    async def test_finished_goal_frees_slot(self, concurrent_loop, mock_executor, goal_engine):
+        """Test a completed goal's slot is handed to the next pending goal."""
+        first = goal_engine.get_next_goal()
+
+        async def execute(plan):
+            goal_engine.update_goal_status(first.id, GoalStatus.COMPLETED)
+            await asyncio.sleep(0.01)
+            return {"done": True}
+
+        mock_executor.execute.side_effect = execute
+        concurrent_loop.running = True
+
+        task = asyncio.create_task(concurrent_loop._loop())
+        await asyncio.sleep(0.2)
+
+        assert not goal_engine.list_goals(status=GoalStatus.PENDING)
+
+        await concurrent_loop.stop()
+        await asyncio.wait_for(task, timeout=2.0)
+
+    @pytest.mark.asyncio
+    async def test_reflection_uses_worker_goal(self, concurrent_loop, mock_memory):
+        """Test each worker records actions under its own goal."""
+        concurrent_loop.running = True
+
+        task = asyncio.create_task(concurrent_loop._loop())
+        await asyncio.sleep(0.2)
+        await concurrent_loop.stop()
+        await asyncio.wait_for(task, timeout=2.0)
+
+        keys = {call.args[0] for call in mock_memory.save_medium_term.call_args_list}
+        heads = {key for key in keys if key.endswith(":actions")}
+        assert len(heads) == 2
+        assert all(key.startswith("goal:") for key in keys)
+
+    @pytest.mark.asyncio
+    async def test_idle_worker_wakes_on_goal_change(
+        self, concurrent_loop, mock_planner, goal_engine
+    ):
+        """Test a worker without a plan waits for its goal instead of sleeping."""
+        concurrent_loop.idle_wakeup_interval = 60.0
+        mock_planner.create_plan.return_value = None
+        goal = goal_engine.get_next_goal()
+        goal_engine.update_goal_status(goal.id, GoalStatus.IN_PROGRESS)
+        concurrent_loop.running = True
+
+        concurrent_loop._start_goal_worker(goal.id)
+        await asyncio.sleep(0.05)
+        assert mock_planner.create_plan.call_count == 1
+
+        goal_engine.update_goal_status(goal.id, GoalStatus.IN_PROGRESS)
+        await asyncio.sleep(0.05)
+        assert mock_planner.create_plan.call_count == 2
+
+        await concurrent_loop.stop()
+        await asyncio.wait_for(asyncio.gather(*concurrent_loop._goal_workers.values()), 1.0)
+
+    @pytest.mark.asyncio
+    async def test_supervisor_executes_commands(self, concurrent_loop, mock_executor):
+        """Test commands are handled by the supervisor, not the goal workers."""
+        concurrent_loop.max_concurrent_goals = 2
+        concurrent_loop.goal_engine.goals.clear()
+        concurrent_loop.running = True
+
+        task = asyncio.create_task(concurrent_loop._loop())
+        await concurrent_loop.add_perception({"type": "command", "content": "Do something"})
+        await asyncio.sleep(0.1)
+
+        mock_executor.execute.assert_any_call({"type": "create_goal", "content": "Do something"})
+
+        await concurrent_loop.stop()
+        await asyncio.wait_for(task, timeout=2.0)
+
+    def test_plan_sub_goals_are_created_once(self, concurrent_loop, goal_engine):
+        """Test a decomposing plan creates its sub-goals with their dependencies."""
+        parent = goal_engine.get_next_goal()
+        plan = {
+            "type": "sub_goal",
+            "sub_goal_specs": [
+                {"id": "a", "description": "First"},
+                {"id": "b", "description": "Second"},
+            ],
+            "dependencies": [{"from": "a", "to": "b"}],
+        }
+
+        concurrent_loop._materialize_sub_goals(parent.id, plan)
+        concurrent_loop._materialize_sub_goals(parent.id, plan)
+
+        first, second = goal_engine.get_goal(parent.id).sub_goals
+        assert goal_engine.get_goal(second).depends_on == [first]
+        assert goal_engine.is_blocked(second)
+
+
+class TestPhaseInstrumentation:
+    """Tests for per-phase latency instrumentation."""
+
+    @pytest.mark.asyncio
+    async def test_phases_are_recorded(self, cognitive_loop, mock_planner, mock_goal_engine):
+        """Test every phase of an iteration is timed."""
+        mock_goal_engine.get_active_goal.return_value = Goal(
+            id="test-goal", description="Test", status=GoalStatus.IN_PROGRESS
+        )
+        mock_planner.create_plan.return_value = {"type": "think"}
+        cognitive_loop.metrics = MagicMock()
+        cognitive_loop.checkpoint_interval = 1
+        cognitive_loop.save_checkpoint = AsyncMock()
+        cognitive_loop.max_iterations = 1
+        cognitive_loop.running = True
+
+        await cognitive_loop._loop()
+
+        phases = [c.args[0] for c in cognitive_loop.metrics.record_loop_phase.call_args_list]
+        assert phases == [
+            "perception",
+            "interpretation",
+            "planning",
+            "execution",
+            "reflection",
+            "checkpoint",
+        ]
+        assert all(c.args[1] >= 0 for c in cognitive_loop.metrics.record_loop_phase.call_args_list)
+
+    def test_disabled_instrumentation_is_shared_noop(self, cognitive_loop):
+        """Test the disabled path allocates no per-phase objects."""
+        cognitive_loop.phase_metrics_enabled = False
+        cognitive_loop.metrics = MagicMock()
+
+        first = cognitive_loop._phase(LoopPhase.PLANNING)
+        second = cognitive_loop._phase(LoopPhase.EXECUTION)
+        with first:
+            pass
+
+        assert first is second
+        cognitive_loop.metrics.record_loop_phase.assert_not_called()
+
+    def test_tracing_and_profiler(self, cognitive_loop):
+        """Test spans and profiler samples are produced when enabled."""
+        cognitive_loop.phase_metrics_enabled = False
+        cognitive_loop.phase_tracing_enabled = True
+        cognitive_loop.profiler = MagicMock()
+
+        with patch("xagent.core.cognitive_loop.trace_operation") as trace_operation:
+            with cognitive_loop._phase(LoopPhase.EXECUTION, "goal-1"):
+                pass
+
+        trace_operation.assert_called_once_with(
+            "cognitive_loop.execution", {"goal.id": "goal-1"}
+        )
+        cognitive_loop.profiler.record_timing.assert_called_once()
+        assert cognitive_loop.profiler.record_timing.call_args.args[0] == "cognitive_loop.execution"
+
+
+class TestIterationPacing:
+    """Test rate limiter pacing in the loop."""
+
+    def test_pacing_disabled_by_default(self, cognitive_loop):
+        """Test the loop uses the limiter's cooldown unless pacing is enabled."""
+        assert cognitive_loop.pacer is None
+
+    @pytest.mark.asyncio
+    async def test_acquire_without_pacer(self, cognitive_loop):
+        """Test the limiter check is used when pacing is off."""
+        cognitive_loop.rate_limiter = MagicMock()
+        cognitive_loop.rate_limiter.check_iteration_limit = AsyncMock(return_value=False)
+
+        assert await cognitive_loop._acquire_iteration() is False
+        cognitive_loop.rate_limiter.check_iteration_limit.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_acquire_with_pacer(self, cognitive_loop):
+        """Test the paced delay is slept before taking a token."""
+        cognitive_loop.running = True
+        cognitive_loop.rate_limiter = MagicMock()
+        cognitive_loop.rate_limiter.try_consume_iteration.return_value = True
+        cognitive_loop.pacer = MagicMock()
+        cognitive_loop.pacer.yield_delay.return_value = 0.0
+        cognitive_loop.pacer.delay.return_value = 0.01
+
+        with patch("xagent.core.cognitive_loop.asyncio.sleep", new=AsyncMock()) as sleep:
+            assert await cognitive_loop._acquire_iteration(8) is True
+
+        cognitive_loop.pacer.yield_delay.assert_called_once_with(8)
+        sleep.assert_awaited_once_with(0.01)
+        cognitive_loop.rate_limiter.try_consume_iteration.assert_called_once()
+        cognitive_loop.rate_limiter.check_iteration_limit.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_low_priority_goal_gives_way(self, cognitive_loop):
+        """Test a goal that is not admitted waits without taking a token."""
+        cognitive_loop.running = True
+        cognitive_loop.rate_limiter = MagicMock()
+        cognitive_loop.pacer = MagicMock()
+        cognitive_loop.pacer.yield_delay.return_value = 1.0
+
+        with patch("xagent.core.cognitive_loop.asyncio.sleep", new=AsyncMock()) as sleep:
+            assert await cognitive_loop._acquire_iteration(2) is False
+
+        sleep.assert_awaited_once_with(1.0)
+        cognitive_loop.rate_limiter.try_consume_iteration.assert_not_called()
+
+    def test_single_goal_mode_uses_goal_priority(self, cognitive_loop, mock_goal_engine):
+        """Test single-goal iterations are paced by the goal they will work on."""
+        mock_goal_engine.get_active_goal.return_value = None
+        mock_goal_engine.get_next_goal.return_value = Goal(id="g", description="Next", priority=7)
+        assert cognitive_loop._current_priority() == 7
+
+        mock_goal_engine.get_active_goal.return_value = Goal(
+            id="a", description="Active", priority=3
+        )
+        assert cognitive_loop._current_priority() == 3
+
+        mock_goal_engine.get_active_goal.return_value = None
+        mock_goal_engine.get_next_goal.return_value = None
+        assert cognitive_loop._current_priority() is None
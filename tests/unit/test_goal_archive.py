@@ -0,0 +1,171 @@
+"""Tests for goal archival."""
+
+from datetime import timedelta
+
+import pytest
+
+from xagent.core.goal_archive import GoalArchive
+from xagent.core.goal_engine import GoalEngine, GoalMode, GoalStatus
+
+
+@pytest.fixture
+def archive(tmp_path):
+    """Empty archive in a temporary directory."""
+    return GoalArchive(tmp_path / "archive" / "goals.bin")
+
+
+def build_engine(archive):
+    """Engine with a continuous root, finished and live children."""
+    engine = GoalEngine(archive=archive)
+    root = engine.create_goal("Root", mode=GoalMode.CONTINUOUS)
+    done = engine.create_goal("Done", parent_id=root.id)
+    leaf = engine.create_goal("Done leaf", parent_id=done.id)
+    failed = engine.create_goal("Failed", parent_id=root.id)
+    blocked = engine.create_goal("Done with live child", parent_id=root.id)
+    live = engine.create_goal("Live", parent_id=blocked.id)
+    for goal in (done, leaf, blocked):
+        engine.update_goal_status(goal.id, GoalStatus.COMPLETED)
+    engine.update_goal_status(failed.id, GoalStatus.FAILED)
+    return engine, root, done, leaf, failed, blocked, live
+
+
+def test_archive_roundtrip(archive):
+    """Test archived goals are read back unchanged and survive reopening."""
+    engine = GoalEngine()
+    goal = engine.create_goal("Archived", priority=3, completion_criteria=["x"])
+
+    assert archive.append([goal]) == 1
+    assert goal.id in archive
+    assert archive.get(goal.id) == goal
+    assert archive.get("missing") is None
+
+    reopened = GoalArchive(archive.path)
+    assert len(reopened) == 1
+    assert reopened.get(goal.id) == goal
+
+
+def test_archive_ignores_torn_record(archive):
+    """Test an incomplete trailing record is skipped and overwritten."""
+    engine = GoalEngine()
+    first = engine.create_goal("First")
+    second = engine.create_goal("Second")
+    archive.append([first])
+    with open(archive.path, "ab") as f:
+        f.write(b"\x02\x00\xff")
+
+    reopened = GoalArchive(archive.path)
+    assert len(reopened) == 1
+    reopened.append([second])
+    assert GoalArchive(archive.path).get(second.id) == second
+
+
+def test_archive_picks_up_other_writers(archive):
+    """Test records appended through another handle are found on a miss."""
+    goal = GoalEngine().create_goal("Elsewhere")
+    GoalArchive(archive.path).append([goal])
+
+    assert archive.get(goal.id) == goal
+
+
+def test_archive_completed_goals(archive):
+    """Test only finished subtrees are archived and aggregates are kept."""
+    engine, root, done, leaf, failed, blocked, live = build_engine(archive)
+    progress = engine.get_goal_progress(root.id)
+    completed = engine.count_goals(status=GoalStatus.COMPLETED)
+
+    archived = engine.archive_completed_goals(max_age=timedelta(0))
+
+    assert set(archived) == {done.id, leaf.id, failed.id}
+    assert set(engine.goals) == {root.id, blocked.id, live.id}
+    assert engine.get_goal(done.id) is None
+    assert engine.get_goal(done.id, include_archived=True) == done
+    assert engine.is_archived(leaf.id)
+    assert engine.get_goal_progress(root.id) == progress
+    assert engine.count_goals(status=GoalStatus.COMPLETED) == completed - 2
+    assert engine.count_goals(status=GoalStatus.COMPLETED, include_archived=True) == completed
+    assert engine.count_goals(include_archived=True) == 6
+    assert [g.id for g in engine.list_goals(status=GoalStatus.COMPLETED)] == [blocked.id]
+    assert engine.query_goals(limit=10).total == 3
+
+    # Nothing left that may be archived
+    assert engine.archive_completed_goals(max_age=timedelta(0)) == []
+
+
+def test_archive_respects_age_and_active_goal(archive):
+    """Test recent goals and the active goal stay in memory."""
+    engine = GoalEngine(archive=archive)
+    recent = engine.create_goal("Recent")
+    active = engine.create_goal("Active")
+    engine.update_goal_status(recent.id, GoalStatus.COMPLETED)
+    engine.set_active_goal(active.id)
+    engine.update_goal_status(active.id, GoalStatus.COMPLETED)
+
+    assert engine.archive_completed_goals(max_age=timedelta(hours=1)) == []
+    assert engine.archive_completed_goals(max_age=timedelta(0)) == [recent.id]
+
+
+def test_archive_keeps_prerequisites_of_live_goals(archive):
+    """Test a finished goal stays in memory while a live goal depends on it."""
+    engine = GoalEngine(archive=archive)
+    done = engine.create_goal("Done")
+    waiting = engine.create_goal("Waiting", depends_on=[done.id])
+    engine.update_goal_status(done.id, GoalStatus.COMPLETED)
+
+    assert engine.archive_completed_goals(max_age=timedelta(0)) == []
+
+    engine.update_goal_status(waiting.id, GoalStatus.COMPLETED)
+    assert set(engine.archive_completed_goals(max_age=timedelta(0))) == {done.id, waiting.id}
+
+
+async def test_archive_completed_goals_async(archive):
+    """Test the threaded archive write evicts the same goals."""
+    engine, root, done, leaf, failed, blocked, live = build_engine(archive)
+
+    archived = await engine.archive_completed_goals_async(max_age=timedelta(0))
+
+    assert set(archived) == {done.id, leaf.id, failed.id}
+    assert set(engine.goals) == {root.id, blocked.id, live.id}
+    assert engine.get_goal(leaf.id, include_archived=True) == leaf
+
+
+async def test_archive_async_keeps_goals_changed_during_write(archive, monkeypatch):
+    """Test a goal retried while its record is written stays live and is released."""
+    engine, root, done, leaf, failed, blocked, live = build_engine(archive)
+    append_async = archive.append_async
+
+    async def append_then_retry(goals):
+        written = await append_async(goals)
+        engine.update_goal_status(failed.id, GoalStatus.PENDING)
+        return written
+
+    monkeypatch.setattr(archive, "append_async", append_then_retry)
+    archived = await engine.archive_completed_goals_async(max_age=timedelta(0))
+
+    assert set(archived) == {done.id, leaf.id}
+    assert engine.goals[failed.id].status == GoalStatus.PENDING
+    assert failed.id not in archive
+    reopened = GoalArchive(archive.path)
+    assert failed.id not in reopened
+    assert sum(reopened.summarize().counts.values()) == 2
+
+
+def test_archive_requires_configuration():
+    """Test archiving without an archive is an error."""
+    with pytest.raises(RuntimeError):
+        GoalEngine().archive_completed_goals()
+
+
+def test_counters_rebuilt_from_archive(archive):
+    """Test a restarted engine sees archived goals in its aggregates."""
+    engine, root, *_ = build_engine(archive)
+    engine.archive_completed_goals(max_age=timedelta(0))
+    progress = engine.get_goal_progress(root.id)
+    snapshot = [goal.to_dict() for goal in engine.get_all_goals()]
+
+    restarted = GoalEngine(archive=GoalArchive(archive.path))
+    # Archived goals in the snapshot source are not restored twice
+    restarted.restore_goals(snapshot + [g.to_dict() for g in archive.iter_goals()])
+
+    assert len(restarted.goals) == 3
+    assert restarted.get_goal_progress(root.id) == progress
+    assert restarted.count_goals(include_archived=True) == 6
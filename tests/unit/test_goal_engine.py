@@ -1,7 +1,7 @@
 """Tests for goal engine."""
 
 import pytest
-from xagent.core.goal_engine import GoalEngine, GoalMode, GoalStatus
+from xagent.core.goal_engine import Goal, GoalEngine, GoalMode, GoalStatus
 
 
 def test_create_goal():
@@ -251,3 +251,520 @@ def test_goal_to_dict():
     assert goal_dict["metadata"]["key"] == "value"
     assert "created_at" in goal_dict
     assert "updated_at" in goal_dict
+
+
+def test_change_listener_receives_events():
+    """Test that listeners are notified on creation and status changes."""
+    engine = GoalEngine()
+    events = []
+    engine.add_listener(lambda event, goal: events.append((event, goal.id)))
+
+    goal = engine.create_goal(description="Watched goal")
+    engine.update_goal_status(goal.id, GoalStatus.COMPLETED)
+
+    assert events == [("created", goal.id), ("status", goal.id)]
+
+
+def test_change_listener_errors_are_isolated():
+    """Test that a failing listener does not break goal updates."""
+    engine = GoalEngine()
+    received = []
+
+    def broken(event, goal):
+        raise RuntimeError("listener failure")
+
+    engine.add_listener(broken)
+    engine.add_listener(lambda event, goal: received.append(event))
+
+    goal = engine.create_goal(description="Goal")
+    assert goal.id in engine.goals
+    assert received == ["created"]
+
+    engine.remove_listener(broken)
+    engine.update_goal_status(goal.id, GoalStatus.IN_PROGRESS)
+    assert received == ["created", "status"]
+
+
+def test_goal_dict_roundtrip():
+    """Test goals survive a to_dict/from_dict roundtrip."""
+    from xagent.core.goal_engine import Goal
+
+    engine = GoalEngine()
+    goal = engine.create_goal(
+        "Roundtrip",
+        mode=GoalMode.CONTINUOUS,
+        priority=3,
+        completion_criteria=["done"],
+        metadata={"source": "test"},
+    )
+    engine.update_goal_status(goal.id, GoalStatus.COMPLETED)
+
+    restored = Goal.from_dict(goal.to_dict())
+
+    assert restored == goal
+
+
+def test_restore_goals():
+    """Test restoring goals keeps hierarchy and active goal without events."""
+    source = GoalEngine()
+    parent = source.create_goal("Parent")
+    child = source.create_goal("Child", parent_id=parent.id)
+    source.set_active_goal(parent.id)
+
+    events = []
+    engine = GoalEngine()
+    engine.add_listener(lambda event, goal: events.append(event))
+    restored = engine.restore_goals(
+        (goal.to_dict() for goal in source.get_all_goals()), source.active_goal_id
+    )
+
+    assert restored == 2
+    assert engine.get_goal(parent.id).sub_goals == [child.id]
+    assert engine.get_active_goal().id == parent.id
+    assert events == []
+
+    # Goals already present are kept
+    assert engine.restore_goals([parent.to_dict()]) == 0
+
+
+def test_create_goals_bulk_tree():
+    """Test bulk creation links refs, keeps indexes ordered and emits events."""
+    engine = GoalEngine()
+    existing = engine.create_goal("Existing", priority=5)
+    events = []
+    engine.add_listener(lambda event, goal: events.append(event))
+
+    results = engine.create_goals_bulk(
+        [
+            {"description": "Root", "ref": "root", "priority": 3},
+            {"description": "Child", "parent_ref": "root", "priority": 9},
+            {"description": "Nested", "parent_id": existing.id, "mode": "continuous"},
+        ]
+    )
+
+    assert [r["index"] for r in results] == [0, 1, 2]
+    root, child, nested = (engine.get_goal(r["id"]) for r in results)
+    assert root.sub_goals == [child.id]
+    assert child.parent_id == root.id
+    assert nested.mode == GoalMode.CONTINUOUS
+    assert engine.get_goal(existing.id).sub_goals == [nested.id]
+    assert events == ["created"] * 3
+
+    page = engine.query_goals(sort_by="priority", descending=True)
+    assert [g.priority for g in page.goals] == [9, 5, 3, 0]
+    assert engine.get_next_goal().id == child.id
+    assert engine.get_goal_progress(root.id)["total_sub_goals"] == 1
+
+
+def test_create_goals_bulk_reports_errors_per_item():
+    """Test invalid specs are rejected without affecting the others."""
+    engine = GoalEngine()
+
+    results = engine.create_goals_bulk(
+        [
+            {"description": ""},
+            {"description": "Bad mode", "mode": "sometimes", "ref": "bad"},
+            {"description": "Orphan", "parent_ref": "bad"},
+            {"description": "Unknown parent", "parent_id": "missing"},
+            {"description": "Bad priority", "priority": "high"},
+            {"description": "Ok", "ref": "ok"},
+            {"description": "Duplicate", "ref": "ok"},
+        ]
+    )
+
+    errors = [r.get("error") for r in results]
+    assert errors[0] == "description is required"
+    assert "sometimes" in errors[1]
+    assert errors[2] == "unknown parent_ref: bad"
+    assert errors[3] == "unknown parent_id: missing"
+    assert errors[4] == "priority must be an integer"
+    assert errors[5] is None
+    assert errors[6] == "duplicate ref: ok"
+    assert len(engine.goals) == 1
+
+
+def test_update_goal_priority_requeues():
+    """Test a priority change reorders pending goals and notifies listeners."""
+    engine = GoalEngine()
+    low = engine.create_goal("Low", priority=1)
+    engine.create_goal("High", priority=5)
+    events = []
+    engine.add_listener(lambda event, goal: events.append(event))
+
+    engine.update_goal_priority(low.id, 9)
+    engine.update_goal_priority(low.id, 9)
+
+    assert events == ["priority"]
+    assert engine.get_next_goal().id == low.id
+    assert [g.id for g in engine.list_goals(min_priority=9)] == [low.id]
+
+
+def test_has_pending_goals():
+    """Test the pending signal follows goal status changes."""
+    engine = GoalEngine()
+    assert engine.has_pending_goals() is False
+    assert engine.get_next_goal() is None
+
+    goal = engine.create_goal("Task")
+    assert engine.has_pending_goals() is True
+
+    engine.set_active_goal(goal.id)
+    assert engine.has_pending_goals() is False
+    assert engine.get_next_goal() is None
+
+    engine.update_goal_status(goal.id, GoalStatus.PENDING)
+    assert engine.has_pending_goals() is True
+    assert engine.get_next_goal() is goal
+
+    restored = GoalEngine()
+    restored.restore_goals([goal.to_dict()])
+    assert restored.has_pending_goals() is True
+
+
+def test_next_goal_orders_by_priority_then_creation():
+    """Test the pending heap returns goals by priority, oldest first on ties."""
+    engine = GoalEngine()
+    low = engine.create_goal("Low", priority=0)
+    first_high = engine.create_goal("High 1", priority=2)
+    second_high = engine.create_goal("High 2", priority=2)
+
+    assert engine.get_next_goal() is first_high
+    engine.update_goal_status(first_high.id, GoalStatus.IN_PROGRESS)
+    assert engine.get_next_goal() is second_high
+    engine.update_goal_status(second_high.id, GoalStatus.COMPLETED)
+    assert engine.get_next_goal() is low
+
+    # A goal returning to pending is requeued
+    engine.update_goal_status(first_high.id, GoalStatus.PENDING)
+    assert engine.get_next_goal() is first_high
+
+
+def test_next_goal_handles_in_place_changes():
+    """Test goals changed without the engine are not returned stale."""
+    engine = GoalEngine()
+    a = engine.create_goal("A", priority=1)
+    b = engine.create_goal("B", priority=2)
+
+    b.status = GoalStatus.COMPLETED
+    assert engine.get_next_goal() is a
+
+    a.priority = 0
+    c = engine.create_goal("C", priority=1)
+    assert engine.get_next_goal() is c
+
+
+def test_pending_heap_is_compacted():
+    """Test stale heap entries do not accumulate."""
+    engine = GoalEngine()
+    goal = engine.create_goal("Toggle")
+    for _ in range(500):
+        engine.update_goal_status(goal.id, GoalStatus.PAUSED)
+        engine.update_goal_status(goal.id, GoalStatus.PENDING)
+
+    assert len(engine._pending_heap) <= 2 * len(engine._pending_ids) + 65
+    assert engine.get_next_goal() is goal
+
+
+def test_secondary_indexes_follow_changes():
+    """Test filtered listings and counts come from up-to-date indexes."""
+    engine = GoalEngine()
+    parent = engine.create_goal("Parent", priority=3)
+    child_a = engine.create_goal("A", parent_id=parent.id, priority=1)
+    child_b = engine.create_goal("B", parent_id=parent.id, mode=GoalMode.CONTINUOUS, priority=2)
+
+    assert engine.count_goals() == 3
+    assert engine.count_goals(status=GoalStatus.PENDING) == 3
+    assert engine.count_goals(mode=GoalMode.CONTINUOUS) == 1
+    assert engine.list_goals(parent_id=parent.id) == [child_a, child_b]
+    assert engine.list_goals(min_priority=2) == [parent, child_b]
+    assert engine.list_goals(min_priority=1, max_priority=1) == [child_a]
+
+    engine.update_goal_status(child_a.id, GoalStatus.COMPLETED)
+
+    assert engine.count_goals(status=GoalStatus.PENDING) == 2
+    assert engine.list_goals(status=GoalStatus.COMPLETED) == [child_a]
+    assert engine.list_goals(status=GoalStatus.COMPLETED, parent_id=parent.id) == [child_a]
+    assert engine.count_goals(status=GoalStatus.COMPLETED, mode=GoalMode.CONTINUOUS) == 0
+    assert engine.count_goals(status=GoalStatus.FAILED) == 0
+
+
+def test_add_goal_replaces_index_entries():
+    """Test re-adding a goal with the same id moves it between indexes."""
+    engine = GoalEngine()
+    goal = engine.create_goal("Task")
+    replacement = Goal(id=goal.id, description="Task", status=GoalStatus.PAUSED)
+
+    engine.add_goal(replacement)
+
+    assert engine.list_goals(status=GoalStatus.PENDING) == []
+    assert engine.list_goals(status=GoalStatus.PAUSED) == [replacement]
+    assert engine.get_next_goal() is None
+
+
+def test_query_goals_keyset_pagination():
+    """Test cursor pages cover every goal exactly once in order."""
+    engine = GoalEngine()
+    goals = [engine.create_goal(f"Goal {i}", priority=i % 3) for i in range(25)]
+
+    seen = []
+    cursor = None
+    while True:
+        page = engine.query_goals(sort_by="priority", descending=True, limit=10, cursor=cursor)
+        assert page.total == 25
+        seen.extend(page.goals)
+        cursor = page.next_cursor
+        if cursor is None:
+            break
+
+    assert len(seen) == 25
+    assert {g.id for g in seen} == {g.id for g in goals}
+    assert [g.priority for g in seen] == sorted((g.priority for g in goals), reverse=True)
+
+
+def test_query_goals_filters_and_offset():
+    """Test filtered queries, offsets and invalid cursors."""
+    engine = GoalEngine()
+    goals = [engine.create_goal(f"Goal {i}") for i in range(10)]
+    for goal in goals[:4]:
+        engine.update_goal_status(goal.id, GoalStatus.COMPLETED)
+
+    page = engine.query_goals(status=GoalStatus.COMPLETED, descending=False, limit=3)
+    assert page.total == 4
+    assert page.goals == goals[:3]
+
+    rest = engine.query_goals(
+        status=GoalStatus.COMPLETED, descending=False, limit=3, cursor=page.next_cursor
+    )
+    assert rest.goals == [goals[3]]
+    assert rest.next_cursor is None
+
+    assert engine.query_goals(descending=False, limit=2, offset=8).goals == goals[8:]
+
+    with pytest.raises(ValueError):
+        engine.query_goals(sort_by="priority", cursor=page.next_cursor)
+    with pytest.raises(ValueError):
+        engine.query_goals(cursor="not-a-cursor")
+
+
+def test_query_goals_sorted_by_updated_at():
+    """Test the updated_at index follows status changes."""
+    engine = GoalEngine()
+    first = engine.create_goal("First")
+    second = engine.create_goal("Second")
+
+    engine.update_goal_status(first.id, GoalStatus.IN_PROGRESS)
+
+    page = engine.query_goals(sort_by="updated_at", descending=True, limit=1)
+    assert page.goals == [first]
+    assert engine.query_goals(
+        sort_by="updated_at", descending=True, limit=1, cursor=page.next_cursor
+    ).goals == [second]
+
+
+def test_goal_is_slotted_with_epoch_timestamps():
+    """Test the compact goal representation keeps the datetime interface."""
+    from datetime import datetime, timezone
+
+    created = datetime(2024, 1, 2, 3, 4, 5, 678901, tzinfo=timezone.utc)
+    goal = Goal(description="Task", created_at=created, updated_at=created)
+
+    assert not hasattr(goal, "__dict__")
+    assert goal.created_at == created
+    assert goal.created_us == 1704164645678901
+    assert goal.to_dict()["created_at"] == created.isoformat()
+
+    with pytest.raises(AttributeError):
+        goal.unknown = 1
+
+
+def test_goal_serialization_cache_invalidation():
+    """Test cached serializations are rebuilt after changes."""
+    goal = Goal(description="Task", metadata={"a": 1})
+
+    cached = goal.to_json()
+    assert goal.to_json() is cached
+
+    goal.status = GoalStatus.COMPLETED
+    assert '"status":"completed"' in goal.to_json()
+
+    goal.metadata["b"] = 2
+    goal.touch()
+    assert '"b":2' in goal.to_json()
+
+
+def test_parent_serialization_includes_new_sub_goal():
+    """Test adding a sub-goal through the engine refreshes the parent's JSON."""
+    engine = GoalEngine()
+    parent = engine.create_goal("Parent")
+    parent.to_json()
+
+    child = engine.create_goal("Child", parent_id=parent.id)
+
+    assert child.id in parent.to_json()
+
+
+def test_completion_counters_propagate_up_the_tree():
+    """Test sub-goal and descendant counters follow status changes."""
+    engine = GoalEngine()
+    root = engine.create_goal("Root")
+    child = engine.create_goal("Child", parent_id=root.id)
+    leaf_a = engine.create_goal("Leaf A", parent_id=child.id)
+    leaf_b = engine.create_goal("Leaf B", parent_id=child.id)
+
+    assert engine.get_goal_progress(root.id) == {
+        "completed_sub_goals": 0,
+        "total_sub_goals": 1,
+        "completed_descendants": 0,
+        "total_descendants": 3,
+    }
+
+    engine.update_goal_status(leaf_a.id, GoalStatus.COMPLETED)
+    assert not engine.check_goal_completion(child.id)
+    assert engine.get_goal_progress(root.id)["completed_descendants"] == 1
+
+    engine.update_goal_status(leaf_b.id, GoalStatus.COMPLETED)
+    assert engine.check_goal_completion(child.id)
+    assert not engine.check_goal_completion(root.id)
+
+    engine.update_goal_status(child.id, GoalStatus.COMPLETED)
+    assert engine.check_goal_completion(root.id)
+    assert engine.get_goal_progress(root.id)["completed_descendants"] == 3
+
+    # Reopening a leaf is reflected all the way up
+    engine.update_goal_status(leaf_b.id, GoalStatus.IN_PROGRESS)
+    assert not engine.check_goal_completion(child.id)
+    assert engine.get_goal_progress(root.id)["completed_descendants"] == 2
+
+
+def test_restored_counters_do_not_depend_on_order():
+    """Test counters are right when children are restored before parents."""
+    source = GoalEngine()
+    root = source.create_goal("Root")
+    child = source.create_goal("Child", parent_id=root.id)
+    leaf = source.create_goal("Leaf", parent_id=child.id)
+    source.update_goal_status(leaf.id, GoalStatus.COMPLETED)
+
+    engine = GoalEngine()
+    engine.restore_goals(goal.to_dict() for goal in reversed(source.get_all_goals()))
+
+    assert engine.get_goal_progress(root.id) == source.get_goal_progress(root.id)
+    assert engine.check_goal_completion(child.id)
+
+
+def test_depth_limited_hierarchy():
+    """Test hierarchies can be walked lazily and cut at a depth."""
+    engine = GoalEngine()
+    root = engine.create_goal("Root")
+    parent = root
+    for i in range(5):
+        parent = engine.create_goal(f"Level {i + 1}", parent_id=parent.id)
+
+    walked = [depth for depth, _ in engine.iter_goal_hierarchy(root.id)]
+    assert walked == [0, 1, 2, 3, 4, 5]
+
+    hierarchy = engine.get_goal_hierarchy(root.id, max_depth=1)
+    child = hierarchy["sub_goals"][0]
+    assert child["sub_goals"] == []
+    assert child["omitted_sub_goals"] == 1
+
+    full = engine.get_goal_hierarchy(root.id)
+    node = full
+    for _ in range(5):
+        node = node["sub_goals"][0]
+    assert node["goal"]["description"] == "Level 5"
+
+
+def test_dependencies_release_parallel_ready_goals():
+    """Test independent sub-goals become ready together once unblocked."""
+    engine = GoalEngine()
+    root = engine.create_goal("Root")
+    engine.update_goal_status(root.id, GoalStatus.IN_PROGRESS)
+
+    results = engine.create_sub_goals(
+        root.id,
+        [
+            {"id": "a", "description": "Fetch"},
+            {"id": "b", "description": "Parse"},
+            {"id": "c", "description": "Index"},
+            {"id": "d", "description": "Report"},
+        ],
+        [
+            {"from": "a", "to": "b"},
+            {"from": "a", "to": "c"},
+            {"from": "b", "to": "d"},
+            {"from": "c", "to": "d"},
+        ],
+    )
+    a, b, c, d = (r["id"] for r in results)
+
+    assert [g.id for g in engine.get_ready_goals()] == [a]
+    assert engine.is_blocked(d)
+    assert sorted(engine.get_dependents(a)) == sorted([b, c])
+
+    engine.update_goal_status(a, GoalStatus.COMPLETED)
+    assert [g.id for g in engine.get_ready_goals()] == [b, c]
+
+    engine.update_goal_status(b, GoalStatus.COMPLETED)
+    assert engine.is_blocked(d)
+    engine.update_goal_status(c, GoalStatus.COMPLETED)
+    assert engine.get_next_goal().id == d
+
+    # Reopening a prerequisite blocks its dependents again
+    engine.update_goal_status(c, GoalStatus.PENDING)
+    assert engine.is_blocked(d)
+    assert engine.get_next_goal().id == c
+
+
+def test_add_and_remove_dependency():
+    """Test dependencies can be edited and cycles are rejected."""
+    engine = GoalEngine()
+    first = engine.create_goal("First")
+    second = engine.create_goal("Second", priority=5, depends_on=[first.id])
+    events = []
+    engine.add_listener(lambda event, goal: events.append(event))
+
+    assert engine.get_next_goal().id == first.id
+    with pytest.raises(ValueError):
+        engine.add_dependency(first.id, second.id)
+    with pytest.raises(ValueError):
+        engine.add_dependency(first.id, first.id)
+    with pytest.raises(ValueError):
+        engine.create_goal("Orphan", depends_on=["missing"])
+
+    engine.remove_dependency(second.id, first.id)
+    assert engine.get_next_goal().id == second.id
+
+    engine.add_dependency(second.id, first.id)
+    assert engine.get_next_goal().id == first.id
+    assert events == ["dependencies", "dependencies"]
+
+
+def test_restore_goals_keeps_dependencies():
+    """Test restored goals stay blocked regardless of restore order."""
+    source = GoalEngine()
+    first = source.create_goal("First")
+    second = source.create_goal("Second", depends_on=[first.id])
+
+    engine = GoalEngine()
+    engine.restore_goals(goal.to_dict() for goal in reversed(source.get_all_goals()))
+
+    assert engine.is_blocked(second.id)
+    engine.update_goal_status(first.id, GoalStatus.COMPLETED)
+    assert engine.get_next_goal().id == second.id
+
+
+def test_create_goals_bulk_dependency_refs():
+    """Test bulk specs can depend on earlier specs by ref."""
+    engine = GoalEngine()
+
+    results = engine.create_goals_bulk(
+        [
+            {"description": "Build", "ref": "build"},
+            {"description": "Deploy", "depends_on_refs": ["build"]},
+            {"description": "Broken", "depends_on_refs": ["nope"]},
+        ]
+    )
+
+    assert results[2]["error"] == "unknown depends_on_ref: nope"
+    assert engine.get_goal(results[1]["id"]).depends_on == [results[0]["id"]]
+    assert [g.id for g in engine.get_ready_goals()] == [results[0]["id"]]
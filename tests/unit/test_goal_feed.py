@@ -0,0 +1,147 @@
+"""Tests for the goal change feed."""
+
+import asyncio
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from xagent.core.goal_engine import GoalEngine, GoalStatus
+from xagent.core.goal_feed import GoalFeed
+
+
+@pytest.fixture
+def engine():
+    """Goal engine followed by a feed."""
+    return GoalEngine()
+
+
+@pytest.fixture
+def feed(engine):
+    """Feed with a small buffer."""
+    feed = GoalFeed(buffer_size=3)
+    feed.attach(engine)
+    return feed
+
+
+@pytest.mark.asyncio
+async def test_changes_are_deltas(engine, feed):
+    """Test subscribers receive numbered deltas per event type."""
+    subscription = feed.subscribe()
+    goal = engine.create_goal("Goal", priority=1)
+    engine.update_goal_status(goal.id, GoalStatus.COMPLETED)
+    engine.update_goal_priority(goal.id, 7)
+
+    created = await subscription.get()
+    status = await subscription.get()
+    priority = await subscription.get()
+
+    assert [c.seq for c in (created, status, priority)] == [1, 2, 3]
+    assert created.event == "created"
+    assert created.data["description"] == "Goal"
+    assert status.data.keys() == {"status", "updated_at", "completed_at"}
+    assert status.data["status"] == "completed"
+    assert priority.data["priority"] == 7
+    assert feed.last_seq == 3
+
+
+@pytest.mark.asyncio
+async def test_slow_subscriber_gets_gap(engine, feed):
+    """Test a full buffer drops the oldest changes and reports a gap."""
+    subscription = feed.subscribe()
+    for i in range(5):
+        engine.create_goal(f"Goal {i}")
+
+    gap = await subscription.get()
+    assert gap.event == "gap"
+    assert gap.data == {"dropped": 2}
+    assert [(await subscription.get()).seq for _ in range(3)] == [3, 4, 5]
+
+
+@pytest.mark.asyncio
+async def test_subscribe_since_replays(engine, feed):
+    """Test reconnecting subscribers replay retained changes."""
+    for i in range(5):
+        engine.create_goal(f"Goal {i}")
+
+    recent = feed.subscribe(since=3)
+    assert [(await recent.get()).seq for _ in range(2)] == [4, 5]
+
+    stale = feed.subscribe(since=0)
+    gap = await stale.get()
+    assert (gap.event, gap.data["dropped"]) == ("gap", 2)
+    assert (await stale.get()).seq == 3
+
+
+@pytest.mark.asyncio
+async def test_close_ends_iteration(engine, feed):
+    """Test closing a subscription ends async iteration."""
+    received = []
+
+    async def consume():
+        async with feed.subscribe() as changes:
+            async for change in changes:
+                received.append(change.seq)
+
+    task = asyncio.create_task(consume())
+    await asyncio.sleep(0)
+    engine.create_goal("Goal")
+    await asyncio.sleep(0)
+    feed.close()
+    await asyncio.wait_for(task, timeout=1)
+
+    assert received == [1]
+    assert feed.subscriber_count == 0
+    assert feed.goal_engine is None
+
+
+@pytest.mark.asyncio
+async def test_redis_forwarding(engine):
+    """Test changes are mirrored to the Redis stream in a pipeline."""
+    pipe = MagicMock()
+    pipe.execute = AsyncMock()
+    client = MagicMock()
+    client.pipeline.return_value = pipe
+    client.aclose = AsyncMock()
+    feed = GoalFeed(redis_url="redis://localhost:6379/0", stream_key="changes")
+    feed.attach(engine)
+
+    with patch("redis.asyncio.from_url", return_value=client):
+        await feed.start()
+        engine.create_goal("Goal")
+        engine.create_goal("Other")
+        await feed.stop()
+
+    assert pipe.xadd.call_count == 2
+    assert pipe.xadd.call_args_list[0].args[0] == "changes"
+    client.aclose.assert_awaited_once()
+
+
+@pytest.mark.asyncio
+async def test_stop_waits_for_in_flight_batch(engine):
+    """Test stopping during a Redis write keeps the batch being written."""
+    started = asyncio.Event()
+    written = []
+
+    async def execute():
+        started.set()
+        await asyncio.sleep(0.05)
+        written.append(pipe.xadd.call_count)
+
+    pipe = MagicMock()
+    pipe.execute = AsyncMock(side_effect=execute)
+    client = MagicMock()
+    client.pipeline.return_value = pipe
+    client.aclose = AsyncMock()
+    feed = GoalFeed(redis_url="redis://localhost:6379/0")
+    feed.attach(engine)
+
+    with patch("redis.asyncio.from_url", return_value=client):
+        await feed.start()
+        engine.create_goal("Goal")
+        await asyncio.wait_for(started.wait(), timeout=1)
+        engine.create_goal("Queued during the write")
+        await feed.stop()
+
+    assert written == [1, 2]
+    assert pipe.xadd.call_count == 2
+
@@ -0,0 +1,196 @@
+"""Tests for write-behind goal persistence."""
+
+import asyncio
+
+import pytest
+from sqlalchemy import create_engine, func, select
+
+from xagent.core.goal_engine import GoalEngine, GoalMode, GoalStatus
+from xagent.database import models
+from xagent.database.goal_store import GoalStore, goal_to_row, row_to_goal_dict
+
+
+@pytest.fixture
+def db_engine(tmp_path):
+    """SQLite database usable from worker threads."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'goals.db'}",
+        connect_args={"check_same_thread": False},
+    )
+    models.Base.metadata.create_all(engine)
+    return engine
+
+
+@pytest.fixture
+def store(db_engine):
+    """Goal store with small batches."""
+    return GoalStore(engine=db_engine, batch_size=2, flush_interval=0.05)
+
+
+def count_rows(engine):
+    """Count rows in the goals table."""
+    with engine.connect() as conn:
+        return conn.execute(select(func.count()).select_from(models.Goal.__table__)).scalar()
+
+
+def test_row_roundtrip():
+    """Test goals survive conversion to a table row and back."""
+    engine = GoalEngine()
+    parent = engine.create_goal("Parent", mode=GoalMode.CONTINUOUS)
+    child = engine.create_goal(
+        "Child",
+        priority=2,
+        parent_id=parent.id,
+        completion_criteria=["done"],
+        metadata={"source": "test"},
+        depends_on=[parent.id],
+    )
+    engine.update_goal_status(child.id, GoalStatus.PAUSED)
+
+    row = goal_to_row(child)
+    data = row_to_goal_dict(row)
+
+    assert row["status"] == models.GoalStatus.PAUSED
+    assert row["mode"] == models.GoalMode.ONE_TIME
+    assert row["created_at"].tzinfo is None
+    assert data["completion_criteria"] == ["done"]
+    assert data["metadata"] == {"source": "test"}
+    assert data["depends_on"] == [parent.id]
+    assert data["status"] == "paused"
+    assert row_to_goal_dict(goal_to_row(parent))["mode"] == "continuous"
+
+
+def test_changes_are_batched_until_flush(store, db_engine):
+    """Test mutations only mark goals dirty until a flush writes them."""
+    engine = GoalEngine()
+    store.attach(engine)
+
+    goal = engine.create_goal("Task")
+    engine.update_goal_status(goal.id, GoalStatus.IN_PROGRESS)
+    engine.create_goal("Other")
+
+    assert store.pending_count == 2
+    assert count_rows(db_engine) == 0
+
+    assert store.flush() == 2
+    assert store.pending_count == 0
+    assert count_rows(db_engine) == 2
+
+    # Upserts update rows in place
+    engine.update_goal_status(goal.id, GoalStatus.COMPLETED)
+    store.flush()
+    with db_engine.connect() as conn:
+        status = conn.execute(
+            select(models.Goal.__table__.c.status).where(models.Goal.__table__.c.id == goal.id)
+        ).scalar()
+    assert status == models.GoalStatus.COMPLETED
+    assert count_rows(db_engine) == 2
+
+
+def test_warm_start_restores_goals_and_indexes(store, db_engine):
+    """Test a fresh engine is hydrated with hierarchy and indexes."""
+    source = GoalEngine()
+    store.attach(source)
+    parent = source.create_goal("Parent", priority=3)
+    children = [source.create_goal(f"Child {i}", parent_id=parent.id) for i in range(3)]
+    source.update_goal_status(children[0].id, GoalStatus.COMPLETED)
+    store.flush()
+    store.detach()
+
+    engine = GoalEngine()
+    restored = GoalStore(engine=db_engine, batch_size=2).load(engine)
+
+    assert restored == 4
+    assert engine.get_goal(parent.id).sub_goals == [c.id for c in children]
+    assert engine.count_goals(status=GoalStatus.COMPLETED) == 1
+    assert engine.get_next_goal().id == parent.id
+    assert engine.get_goal_progress(parent.id)["completed_sub_goals"] == 1
+
+    partial = GoalEngine()
+    assert store.load(partial, goal_ids=[children[1].id]) == 1
+
+
+def test_failed_flush_keeps_changes(store, db_engine):
+    """Test goals stay dirty when writing fails."""
+    engine = GoalEngine()
+    store.attach(engine)
+    engine.create_goal("Task")
+    db_engine.dispose()
+    models.Base.metadata.drop_all(db_engine)
+
+    with pytest.raises(Exception):
+        store.flush()
+
+    assert store.pending_count == 1
+
+
+@pytest.mark.asyncio
+async def test_background_flusher(store, db_engine):
+    """Test the flusher writes changes without an explicit flush."""
+    engine = GoalEngine()
+    store.attach(engine)
+    await store.start()
+
+    engine.create_goal("Task")
+    await asyncio.sleep(0.2)
+    assert count_rows(db_engine) == 1
+
+    engine.create_goal("Late")
+    await store.stop()
+
+    assert count_rows(db_engine) == 2
+    assert store.goal_engine is None
+
+
+def test_delete_removes_rows(store, db_engine):
+    """Test deleting archived goals removes their rows, children first."""
+    engine = GoalEngine()
+    store.attach(engine)
+    parent = engine.create_goal("Parent")
+    child = engine.create_goal("Child", parent_id=parent.id)
+    engine.create_goal("Kept")
+    store.flush()
+
+    assert store.delete([parent.id, child.id]) == 2
+    assert count_rows(db_engine) == 1
+
+
+def test_flush_skips_goals_deleted_while_in_flight(store, db_engine):
+    """Test a flush that loses the race to a delete does not re-insert the goal."""
+    engine = GoalEngine()
+    store.attach(engine)
+    goal = engine.create_goal("Archived")
+    store.flush()
+    engine.update_goal_status(goal.id, GoalStatus.COMPLETED)
+
+    # Rows are taken, then the goal is archived and deleted before they are written
+    rows = store._take_rows()
+    del engine.goals[goal.id]
+    store.delete([goal.id])
+    store._write_rows(rows)
+
+    assert count_rows(db_engine) == 0
+
+
+def test_load_orders_indexes_once(store, db_engine, monkeypatch):
+    """Test a load spanning several fetch batches finishes the indexes once."""
+    source = GoalEngine()
+    store.attach(source)
+    for i in range(7):
+        source.create_goal(f"Goal {i}", priority=i)
+    store.flush()
+    store.detach()
+
+    engine = GoalEngine()
+    finishes = []
+    original = engine._finish_bulk_index
+
+    def finish():
+        finishes.append(len(engine.goals))
+        original()
+
+    monkeypatch.setattr(engine, "_finish_bulk_index", finish)
+
+    assert GoalStore(engine=db_engine, batch_size=2).load(engine) == 7
+    assert finishes == [7]
+    assert engine.get_next_goal().priority == 6
@@ -316,6 +316,35 @@ class TestInternalRateLimiter:
         with pytest.raises(ValueError, match="Unknown bucket"):
             limiter.get_bucket_status("invalid_bucket")
 
+    def test_try_consume_iteration(self):
+        """Test non-blocking iteration consumption."""
+        config = RateLimitConfig(max_iterations_per_minute=2, max_iterations_per_hour=1000)
+        limiter = InternalRateLimiter(config)
+
+        assert limiter.try_consume_iteration() is True
+        assert limiter.try_consume_iteration() is True
+        assert limiter.try_consume_iteration() is False
+
+        stats = limiter.get_stats()
+        assert stats["blocked_requests"] == 1
+        # A refusal does not take a token from the hour bucket
+        assert limiter._buckets["iteration_per_hour"].available_tokens() == 998
+
+    def test_get_iteration_budget(self):
+        """Test iteration bucket fill levels."""
+        config = RateLimitConfig(max_iterations_per_minute=4, max_iterations_per_hour=1000)
+        limiter = InternalRateLimiter(config)
+
+        for _ in range(4):
+            limiter.try_consume_iteration()
+        minute, hour = limiter.get_iteration_budget()
+
+        assert minute["fill"] < 0.1
+        assert minute["wait"] > 0
+        assert minute["refill_rate"] == pytest.approx(4 / 60)
+        assert hour["fill"] > 0.99
+        assert hour["wait"] == 0.0
+
 
 class TestGlobalRateLimiter:
     """Test global rate limiter functions."""
@@ -0,0 +1,453 @@
+"""Tests for the memory layer and its L0 cache."""
+
+import asyncio
+import json
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.schema import CreateIndex
+from unittest.mock import AsyncMock, MagicMock
+
+from xagent.memory.local_cache import LocalCache, NegativeCache
+from xagent.memory.memory_layer import (
+    MediumTermMemory,
+    MemoryEntry,
+    MemoryLayer,
+    memory_entry_row,
+    memory_entry_upsert,
+)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def mock_tier(store):
+    """Memory tier backed by a dict."""
+    tier = MagicMock()
+    ttls = {}
+
+    async def save(key, value, ttl=None, embedding=None):
+        store[key] = value
+        ttls[key] = ttl
+        return True
+
+    async def get(key):
+        return store.get(key)
+
+    async def get_with_ttl(key):
+        if key not in store:
+            return None
+        return store[key], ttls.get(key)
+
+    async def delete(key):
+        store.pop(key, None)
+
+    tier.save = AsyncMock(side_effect=save)
+    tier.get = AsyncMock(side_effect=get)
+    tier.get_with_ttl = AsyncMock(side_effect=get_with_ttl)
+    tier.delete = AsyncMock(side_effect=delete)
+    return tier
+
+
+@pytest.fixture
+def memory():
+    """Memory layer with dict-backed tiers and a connected Redis mock."""
+    layer = MemoryLayer()
+    layer.local_cache = LocalCache(max_entries=10, max_bytes=1000, ttl=60.0)
+    layer.short_term = mock_tier({})
+    layer.short_term.redis = MagicMock()
+    layer.short_term.redis.publish = AsyncMock()
+    layer.medium_term = mock_tier({})
+    layer.long_term = mock_tier({})
+    return layer
+
+
+class TestLocalCache:
+    """Tests for the LRU/TTL cache."""
+
+    def test_entries_expire(self):
+        """Test entries expire after the cache TTL or a shorter one."""
+        clock = FakeClock()
+        cache = LocalCache(ttl=10.0, clock=clock)
+        cache.put("long", 1)
+        cache.put("short", 2, ttl=1.0)
+        cache.put("capped", 3, ttl=100.0)
+
+        clock.now = 5.0
+        assert cache.get("short") is None
+        assert cache.get("long") == 1
+
+        clock.now = 10.0
+        assert cache.get("capped") is None
+        assert cache.get("long") is None
+        assert len(cache) == 0
+        assert cache.bytes == 0
+
+    def test_lru_eviction_by_count_and_bytes(self):
+        """Test the least recently used entries are evicted first."""
+        cache = LocalCache(max_entries=2, max_bytes=20)
+        cache.put("a", "x")
+        cache.put("b", "y")
+        cache.get("a")
+        cache.put("c", "z")
+
+        assert "b" not in cache
+        assert "a" in cache and "c" in cache
+
+        cache.put("big", "0123456789")
+        assert list(cache._entries) == ["c", "big"]
+        assert cache.bytes == len(json.dumps("z")) + len(json.dumps("0123456789"))
+        assert not cache.put("huge", "x" * 50)
+        assert cache.get_stats()["evictions"] == 2
+
+    def test_hits_return_copies(self):
+        """Test callers cannot mutate cached values."""
+        cache = LocalCache()
+        cache.put("k", [1])
+        cache.get("k").append(2)
+
+        assert cache.get("k") == [1]
+        assert not cache.put("bad", object())
+
+
+class TestNegativeCache:
+    """Tests for miss tombstones."""
+
+    def test_tombstones_expire_and_are_bounded(self):
+        """Test tombstones expire after the TTL and the oldest are dropped."""
+        clock = FakeClock()
+        tombstones = NegativeCache(max_entries=2, ttl=5.0, clock=clock)
+        tombstones.add("a")
+        tombstones.add("b")
+        tombstones.add("c")
+
+        assert "a" not in tombstones
+        assert "b" in tombstones
+
+        tombstones.discard("b")
+        assert "b" not in tombstones
+
+        clock.now = 5.0
+        assert "c" not in tombstones
+        assert len(tombstones) == 0
+
+
+class TestMemoryLayerCache:
+    """Tests for the L0 cache in front of the tiers."""
+
+    @pytest.mark.asyncio
+    async def test_writes_are_served_without_tier_reads(self, memory):
+        """Test saved values are read back from the L0 cache."""
+        await memory.save_medium_term("goal:1:actions", {"count": 1})
+
+        assert await memory.get("goal:1:actions") == {"count": 1}
+        memory.short_term.get.assert_not_called()
+        memory.medium_term.get.assert_not_called()
+        memory.short_term.redis.publish.assert_awaited_once()
+
+    @pytest.mark.asyncio
+    async def test_tier_hits_fill_cache(self, memory):
+        """Test a tier hit is cached for the next read."""
+        await memory.medium_term.save("k", "v")
+
+        assert await memory.get("k") == "v"
+        assert await memory.get("k") == "v"
+        assert memory.medium_term.get.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_short_term_hits_expire_with_redis(self, memory):
+        """Test an L0 copy of a short-term value does not outlive the Redis key."""
+        clock = FakeClock()
+        memory.local_cache = LocalCache(ttl=60.0, clock=clock)
+        await memory.short_term.save("k", "v", ttl=2)
+
+        assert await memory.get("k") == "v"
+        clock.now = 1.0
+        assert "k" in memory.local_cache
+        clock.now = 2.0
+        assert "k" not in memory.local_cache
+
+    @pytest.mark.asyncio
+    async def test_failed_short_term_save_is_not_cached(self, memory):
+        """Test a rate limited save is not served from the L0 cache."""
+        memory.short_term.save = AsyncMock(return_value=False)
+
+        await memory.save_short_term("k", "v")
+
+        assert "k" not in memory.local_cache
+        assert await memory.get("k") is None
+        memory.short_term.redis.publish.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_delete_clears_tiers_and_cache(self, memory):
+        """Test delete removes the key everywhere."""
+        await memory.save_short_term("k", "v")
+        await memory.delete("k")
+
+        assert await memory.get("k") is None
+        memory.long_term.delete.assert_awaited_once_with("k")
+        assert memory.short_term.redis.publish.await_count == 2
+
+    def test_invalidations_from_other_replicas(self, memory):
+        """Test only invalidations published by other replicas drop entries."""
+        memory.local_cache.put("k", "v")
+
+        own = {"origin": memory.instance_id, "key": "k"}
+        memory._handle_invalidation({"type": "message", "data": json.dumps(own)})
+        assert "k" in memory.local_cache
+
+        other = {"origin": "other", "key": "k"}
+        memory._handle_invalidation({"type": "subscribe", "data": 1})
+        memory._handle_invalidation({"type": "message", "data": json.dumps(other)})
+        assert "k" not in memory.local_cache
+
+    @pytest.mark.asyncio
+    async def test_cache_can_be_disabled(self, memory):
+        """Test the tiers are used directly without an L0 cache."""
+        memory.local_cache = None
+        memory.negative_cache = None
+        await memory.save_short_term("k", "v")
+
+        assert await memory.get("k") == "v"
+        memory.short_term.get.assert_awaited_once_with("k")
+        memory.short_term.redis.publish.assert_not_called()
+
+
+class TestMemoryLayerNegativeCache:
+    """Tests for skipping tiers that just missed a key."""
+
+    @pytest.fixture
+    def uncached(self, memory):
+        """Memory layer with tombstones but no L0 value cache."""
+        memory.local_cache = None
+        return memory
+
+    @pytest.mark.asyncio
+    async def test_repeated_miss_skips_tiers(self, uncached):
+        """Test a known-absent key does not reach any tier."""
+        assert await uncached.get("goal:new:actions") is None
+        assert await uncached.get("goal:new:actions") is None
+
+        for tier in (uncached.short_term, uncached.medium_term, uncached.long_term):
+            assert tier.get.await_count == 1
+
+    @pytest.mark.asyncio
+    async def test_save_clears_tombstone(self, uncached):
+        """Test a save makes the key visible again right away."""
+        assert await uncached.get("k") is None
+        await uncached.save_medium_term("k", {"v": 1})
+
+        assert await uncached.get("k") == {"v": 1}
+        # Short-term was not written, so its tombstone still holds
+        assert uncached.short_term.get.await_count == 1
+        assert uncached.medium_term.get.await_count == 2
+
+    @pytest.mark.asyncio
+    async def test_delete_leaves_tombstones(self, uncached):
+        """Test a deleted key is known to be absent everywhere."""
+        await uncached.save_long_term("k", "v")
+        await uncached.delete("k")
+
+        assert await uncached.get("k") is None
+        uncached.long_term.get.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_remote_write_clears_tombstones(self, uncached):
+        """Test another replica's write makes the key visible again."""
+        assert await uncached.get("k") is None
+        await uncached.long_term.save("k", "v")
+        message = {"origin": "other", "key": "k"}
+        uncached._handle_invalidation({"type": "message", "data": json.dumps(message)})
+
+        assert await uncached.get("k") == "v"
+
+
+class TestMediumTermWrites:
+    """Tests for medium-term upserts and write batching."""
+
+    @pytest.fixture
+    def medium(self):
+        """Medium-term memory with a recording writer instead of a database."""
+        memory = MediumTermMemory(batch_size=3, flush_interval=0.05)
+        memory.session_maker = MagicMock()
+        memory.batches = []
+
+        async def write_rows(rows):
+            memory.batches.append([row["id"] for row in rows])
+
+        memory._write_rows = AsyncMock(side_effect=write_rows)
+        return memory
+
+    def test_upsert_statement(self):
+        """Test saves compile to one multi-row INSERT ... ON CONFLICT DO UPDATE."""
+        rows = [memory_entry_row("a", {"x": 1}), memory_entry_row("b", "text", ttl=60)]
+        sql = str(memory_entry_upsert(rows, "postgresql").compile(dialect=postgresql.dialect()))
+
+        assert "ON CONFLICT (id) DO UPDATE" in sql
+        assert "content = excluded.content" in sql
+        assert "created_at = excluded" not in sql
+        assert rows[1]["content"] == '"text"'
+        assert rows[1]["expires_at"] > rows[1]["created_at"]
+        with pytest.raises(ValueError):
+            memory_entry_upsert(rows, "mysql")
+
+    @pytest.mark.asyncio
+    async def test_saves_are_coalesced(self, medium):
+        """Test repeated saves of a key within the window write one row."""
+        await medium.save("k", 1)
+        await medium.save("k", 2)
+        await medium.save("other", 3)
+
+        assert await medium.get("k") == 2
+        await asyncio.sleep(0.1)
+
+        assert medium.batches == [["k", "other"]]
+        assert medium.pending_count == 0
+        await medium.close()
+
+    @pytest.mark.asyncio
+    async def test_full_batch_flushes_early(self, medium):
+        """Test reaching the batch size writes without waiting for the window."""
+        medium.flush_interval = 10.0
+        for i in range(3):
+            await medium.save(f"k{i}", i)
+        await asyncio.sleep(0.01)
+
+        assert medium.batches == [["k0", "k1", "k2"]]
+        await medium.close()
+
+    @pytest.mark.asyncio
+    async def test_failed_write_keeps_newer_saves(self, medium):
+        """Test a failed flush requeues rows without overwriting newer saves."""
+        await medium.save("k", 1)
+        medium._write_rows.side_effect = RuntimeError("down")
+        with pytest.raises(RuntimeError):
+            await medium.flush()
+        await medium.save("k", 2)
+
+        medium._write_rows.side_effect = None
+        assert await medium.flush() == 1
+        assert medium._write_rows.await_args.args[0][0]["content"] == "2"
+        await medium.close()
+
+    @pytest.mark.asyncio
+    async def test_close_writes_pending_saves(self, medium):
+        """Test closing flushes saves still inside the batch window."""
+        medium.flush_interval = 10.0
+        medium.engine = MagicMock()
+        medium.engine.dispose = AsyncMock()
+        await medium.save("k", 1)
+
+        await medium.close()
+
+        assert medium.batches == [["k"]]
+
+    @pytest.mark.asyncio
+    async def test_cancelled_write_keeps_rows(self, medium):
+        """Test rows of a write cancelled mid-flight are written on close."""
+        medium.flush_interval = 0.01
+        medium.engine = MagicMock()
+        medium.engine.dispose = AsyncMock()
+        started = asyncio.Event()
+        attempts = []
+
+        async def slow_write(rows):
+            attempts.append([row["id"] for row in rows])
+            if len(attempts) == 1:
+                started.set()
+                await asyncio.sleep(10)
+            medium.batches.append([row["id"] for row in rows])
+
+        medium._write_rows = AsyncMock(side_effect=slow_write)
+        await medium.save("a", 1)
+        await medium.save("b", 2)
+        await asyncio.wait_for(started.wait(), 1.0)
+
+        medium._flush_task.cancel()
+        await asyncio.sleep(0)
+        await medium.close()
+
+        assert medium.batches == [["a", "b"]]
+
+    @pytest.mark.asyncio
+    async def test_close_waits_for_write_in_progress(self, medium):
+        """Test close lets a running write finish and then writes newer saves."""
+        medium.flush_interval = 0.01
+        medium.engine = MagicMock()
+        medium.engine.dispose = AsyncMock()
+        started = asyncio.Event()
+        release = asyncio.Event()
+
+        async def slow_write(rows):
+            if not started.is_set():
+                started.set()
+                await release.wait()
+            medium.batches.append([row["id"] for row in rows])
+
+        medium._write_rows = AsyncMock(side_effect=slow_write)
+        await medium.save("a", 1)
+        await asyncio.wait_for(started.wait(), 1.0)
+        await medium.save("b", 2)
+
+        closing = asyncio.create_task(medium.close())
+        await asyncio.sleep(0.02)
+        assert not closing.done()
+        release.set()
+        await asyncio.wait_for(closing, 1.0)
+
+        assert medium.batches == [["a"], ["b"]]
+
+
+class TestMediumTermPurge:
+    """Tests for purging expired medium-term entries."""
+
+    def test_expiry_index_is_partial(self):
+        """Test the expiry index only covers entries that can expire."""
+        (index,) = MemoryEntry.__table__.indexes
+        sql = str(CreateIndex(index).compile(dialect=postgresql.dialect()))
+
+        assert "(expires_at)" in sql
+        assert "WHERE expires_at IS NOT NULL" in sql
+
+    @pytest.mark.asyncio
+    async def test_purge_deletes_in_batches(self):
+        """Test batches run until one comes back short."""
+        memory = MediumTermMemory()
+        memory.session_maker = MagicMock()
+        memory.engine = MagicMock()
+        memory.engine.dialect.name = "postgresql"
+        conn = MagicMock()
+        conn.execute = AsyncMock(
+            side_effect=[MagicMock(rowcount=2), MagicMock(rowcount=2), MagicMock(rowcount=1)]
+        )
+        memory.engine.begin.return_value.__aenter__ = AsyncMock(return_value=conn)
+        memory.engine.begin.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        assert await memory.purge_expired(batch_size=2) == 5
+        assert conn.execute.await_count == 3
+
+        sql = str(conn.execute.await_args.args[0].compile(dialect=postgresql.dialect()))
+        assert "expires_at <=" in sql
+        assert "LIMIT" in sql
+        assert "FOR UPDATE SKIP LOCKED" in sql
+
+    @pytest.mark.asyncio
+    async def test_purge_stops_after_max_batches(self):
+        """Test a purge can be bounded to a number of batches."""
+        memory = MediumTermMemory()
+        memory.session_maker = MagicMock()
+        memory.engine = MagicMock()
+        memory.engine.dialect.name = "sqlite"
+        conn = MagicMock()
+        conn.execute = AsyncMock(return_value=MagicMock(rowcount=10))
+        memory.engine.begin.return_value.__aenter__ = AsyncMock(return_value=conn)
+        memory.engine.begin.return_value.__aexit__ = AsyncMock(return_value=False)
+
+        assert await memory.purge_expired(batch_size=10, max_batches=2) == 20
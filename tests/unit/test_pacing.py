@@ -0,0 +1,98 @@
+"""Tests for adaptive iteration pacing."""
+
+from unittest.mock import MagicMock
+
+import pytest
+
+from xagent.core.internal_rate_limiting import InternalRateLimiter, RateLimitConfig
+from xagent.core.pacing import IterationPacer
+
+
+def budget(fill, refill_rate=1.0, wait=0.0):
+    """Build a single bucket budget entry."""
+    return {"fill": fill, "refill_rate": refill_rate, "wait": wait}
+
+
+@pytest.fixture
+def rate_limiter():
+    """Rate limiter with a controllable iteration budget."""
+    limiter = MagicMock()
+    limiter.get_iteration_budget.return_value = [budget(1.0)]
+    return limiter
+
+
+class TestIterationPacer:
+    """Test IterationPacer."""
+
+    def test_full_bucket_runs_immediately(self, rate_limiter):
+        """Test no delay while the bucket is above the target fill."""
+        pacer = IterationPacer(rate_limiter, target_fill=0.5)
+
+        assert pacer.delay() == 0.0
+
+    def test_delay_grows_as_bucket_drains(self, rate_limiter):
+        """Test delay scales smoothly towards the refill interval."""
+        pacer = IterationPacer(rate_limiter, target_fill=0.5)
+        delays = []
+        for fill in (0.5, 0.375, 0.25, 0.0):
+            rate_limiter.get_iteration_budget.return_value = [budget(fill, refill_rate=0.5)]
+            delays.append(pacer.delay())
+
+        assert delays == pytest.approx([0.0, 0.5, 1.0, 2.0])
+
+    def test_hard_wait_is_respected(self, rate_limiter):
+        """Test the delay never undercuts the time until a token is available."""
+        rate_limiter.get_iteration_budget.return_value = [
+            budget(0.9),
+            budget(0.0, refill_rate=10.0, wait=3.0),
+        ]
+        pacer = IterationPacer(rate_limiter)
+
+        assert pacer.delay() == 3.0
+
+    def test_scarce_budget_prefers_high_priority(self, rate_limiter):
+        """Test low priority goals give way when the budget is scarce."""
+        rate_limiter.get_iteration_budget.return_value = [budget(0.1, refill_rate=1.0)]
+        pacer = IterationPacer(rate_limiter, target_fill=0.5, scarce_fill=0.2)
+
+        assert pacer.yield_delay(10) == 0.0
+        assert pacer.yield_delay(6) == 0.0
+        assert pacer.yield_delay(4) == pytest.approx(1.0)
+        assert pacer.yield_delay(None) == 0.0
+        # The paced delay itself does not depend on priority
+        assert pacer.delay() == pytest.approx(0.8)
+
+    def test_admits(self, rate_limiter):
+        """Test admission thresholds on the 1-10 priority scale."""
+        pacer = IterationPacer(rate_limiter, scarce_fill=0.3)
+
+        assert pacer.admits(1, 0.3)
+        assert not pacer.admits(1, 0.26)
+        assert pacer.admits(5, 0.15)
+        assert not pacer.admits(5, 0.14)
+        assert not pacer.admits(9, 0.02)
+        assert pacer.admits(10, 0.0)
+        assert pacer.admits(50, 0.0)
+
+    def test_default_priority_is_gated(self, rate_limiter):
+        """Test the default API priority does not count as top priority."""
+        rate_limiter.get_iteration_budget.return_value = [budget(0.05)]
+        pacer = IterationPacer(rate_limiter, scarce_fill=0.2)
+
+        assert pacer.yield_delay(5) > 0.0
+        assert pacer.yield_delay(10) == 0.0
+
+    def test_with_real_limiter(self):
+        """Test pacing kicks in before the limiter is exhausted."""
+        limiter = InternalRateLimiter(
+            RateLimitConfig(max_iterations_per_minute=10, max_iterations_per_hour=1000)
+        )
+        pacer = IterationPacer(limiter, target_fill=0.5)
+
+        delays = []
+        for _ in range(10):
+            delays.append(pacer.delay())
+            assert limiter.try_consume_iteration()
+
+        assert delays[:5] == [0.0] * 5
+        assert 0.0 < delays[6] < delays[9] <= 6.0
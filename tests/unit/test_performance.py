@@ -114,6 +114,19 @@ class TestPerformanceProfiler:
         assert stats["count"] == 3
         assert stats["avg"] >= 0.005
 
+    def test_record_timing(self, profiler):
+        """Test recording externally measured durations."""
+        profiler.record_timing("external_op", 0.25)
+        profiler.record_timing("external_op", 0.75)
+
+        stats = profiler.get_stats("external_op")
+        assert stats["count"] == 2
+        assert stats["avg"] == pytest.approx(0.5)
+
+        profiler.disable()
+        profiler.record_timing("external_op", 1.0)
+        assert profiler.get_stats("external_op")["count"] == 2
+
     def test_increment_counter(self, profiler):
         """Test counter functionality."""
         profiler.increment_counter("test_counter")
@@ -104,6 +104,30 @@ def test_build_planning_prompt():
     assert "Good progress" in prompt
 
 
+def test_build_planning_prompt_with_actions_summary():
+    """Test older actions are represented by their summary."""
+    planner = Planner()
+
+    context = {
+        "active_goal": {"description": "Test goal"},
+        "memory_context": {
+            "recent_actions": ["action1"],
+            "actions_summary": {
+                "total": 120,
+                "succeeded": 100,
+                "failed": 20,
+                "action_types": {"think": 120},
+                "last_error": "timeout",
+            },
+        },
+    }
+
+    prompt = planner._build_planning_prompt(context)
+
+    assert "120 total" in prompt
+    assert "timeout" in prompt
+
+
 def test_decompose_goal():
     """Test goal decomposition."""
     planner = Planner()
@@ -1,7 +1,7 @@
 """Tests for Celery worker tasks."""
 
 import pytest
-from unittest.mock import MagicMock, patch, Mock
+from unittest.mock import AsyncMock, MagicMock, patch, Mock
 
 from xagent.tasks.worker import (
     execute_cognitive_loop,
@@ -218,6 +218,29 @@ class TestProcessGoal:
         with pytest.raises(Exception):  # Either ValueError or Retry exception
             process_goal.apply(args=("nonexistent",)).get()
 
+    @patch("xagent.tasks.worker.logger")
+    @patch("xagent.database.goal_store.GoalStore")
+    @patch("xagent.config.settings")
+    @patch("xagent.core.planner.Planner")
+    @patch("xagent.core.goal_engine.GoalEngine")
+    def test_process_goal_closes_store_on_failure(
+        self,
+        mock_goal_engine_class,
+        mock_planner_class,
+        mock_settings,
+        mock_goal_store_class,
+        mock_logger,
+    ):
+        """Test the goal store is closed when processing fails."""
+        mock_settings.goal_persistence_enabled = True
+        mock_settings.goal_persistence_batch_size = 10
+        mock_goal_engine_class.return_value.get_goal.return_value = None
+
+        with pytest.raises(Exception):
+            process_goal.apply(args=("nonexistent",)).get()
+
+        mock_goal_store_class.return_value.close.assert_called()
+
     @patch("xagent.core.planner.Planner")
     @patch("xagent.core.goal_engine.GoalEngine")
     def test_process_goal_no_sub_goals(self, mock_goal_engine_class, mock_planner_class):
@@ -263,6 +286,31 @@ class TestCleanupMemory:
         # Verify results
         assert result["status"] == "success"
 
+    @patch(
+        "xagent.memory.memory_layer.MediumTermMemory.close",
+        new_callable=AsyncMock,
+    )
+    @patch(
+        "xagent.memory.memory_layer.MediumTermMemory.purge_expired",
+        new_callable=AsyncMock,
+        return_value=7,
+    )
+    def test_cleanup_memory_purges_expired_entries(self, mock_purge, mock_close):
+        """Test memory cleanup purges expired medium-term entries."""
+        result = cleanup_memory(batch_size=50)
+
+        assert result["entries_removed"] == 7
+        mock_purge.assert_awaited_once_with(batch_size=50)
+        mock_close.assert_awaited_once()
+
+    @patch("xagent.database.goal_store.GoalStore")
+    def test_cleanup_memory_leaves_goals_to_the_agent(self, mock_goal_store):
+        """Test the worker never loads or archives goals itself."""
+        result = cleanup_memory()
+
+        assert result["goals_archived"] == 0
+        mock_goal_store.assert_not_called()
+
     @patch("xagent.memory.memory_layer.MemoryLayer")
     def test_cleanup_memory_error_handling(self, mock_memory_layer):
         """Test memory cleanup with error."""